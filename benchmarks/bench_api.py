@@ -0,0 +1,257 @@
+"""
+API Latency Benchmark
+Drives the Flask endpoints through the test client against generated data (local
+SQLite backend) at several table sizes and records p50/p95/p99 latency, throughput
+and peak Python memory per endpoint. Results are written as JSON and compared with
+a stored baseline; the run fails when an endpoint got slower than the tolerance.
+
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --sizes 10000,100000,1000000 --iterations 50
+    python benchmarks/bench_api.py --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+for p in (str(ROOT), str(BENCH_DIR)):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+import generate_data  # noqa: E402
+
+DEFAULT_SIZES = '10000,100000'
+DEFAULT_BASELINE = BENCH_DIR / 'baseline_api.json'
+DEFAULT_RESULTS_DIR = BENCH_DIR / 'results'
+
+# Edits per save_changes batch
+_SAVE_BATCH = 100
+# Rows per bulk_update call
+_BULK_ROWS = 1000
+
+
+class Scenario:
+    """One endpoint call: setup() runs untimed before each request(), which is timed."""
+
+    def __init__(self, name, request, setup=None):
+        self.name = name
+        self.request = request
+        self.setup = setup
+
+
+def _scenarios(client, rows, rng):
+    def check(resp):
+        if resp.status_code != 200:
+            raise RuntimeError(f'{resp.status_code}: {resp.get_data(as_text=True)[:200]}')
+        return resp
+
+    def matches():
+        return check(client.get('/api/matches?draw=1&start=0&length=100&recommendation=NEEDS REVIEW'
+                                '&order[0][column]=0&order[0][dir]=desc&columns[0][data]=name_score'))
+
+    def update():
+        return check(client.post('/api/update', json={
+            'row_id': rng.randrange(rows), 'field': 'memo', 'value': f'bench {rng.random():.6f}'}))
+
+    def bulk_update():
+        start = rng.randrange(max(rows - _BULK_ROWS, 1))
+        return check(client.post('/api/bulk_update', json={
+            'row_ids': list(range(start, min(start + _BULK_ROWS, rows))), 'recommendation': 'APPROVED'}))
+
+    def search_find():
+        return check(client.post('/api/search_replace', json={
+            'search': 'RANCH', 'column': 'all', 'mode': 'find'}))
+
+    # Alternates direction so repeated runs keep the frame stable
+    replace_state = {'forward': True}
+
+    def search_replace():
+        a, b = ('MESA ', 'MESSA ') if replace_state['forward'] else ('MESSA ', 'MESA ')
+        replace_state['forward'] = not replace_state['forward']
+        return check(client.post('/api/search_replace', json={
+            'search': a, 'replace': b, 'column': 'canvas_address', 'mode': 'replace'}))
+
+    def stage_save_batch():
+        for _ in range(_SAVE_BATCH):
+            update()
+
+    return [
+        Scenario('matches', matches),
+        Scenario('matches_all', lambda: check(client.get('/api/matches_all'))),
+        Scenario('stats', lambda: check(client.get('/api/stats'))),
+        Scenario('update', update),
+        Scenario('bulk_update', bulk_update),
+        Scenario('search_find', search_find),
+        Scenario('search_replace', search_replace),
+        Scenario('save_changes', lambda: check(client.post('/api/save_changes')), setup=stage_save_batch),
+    ]
+
+
+def _measure(scenario, iterations, warmup):
+    for _ in range(warmup):
+        if scenario.setup:
+            scenario.setup()
+        scenario.request()
+
+    latencies = []
+    size = 0
+    for _ in range(iterations):
+        if scenario.setup:
+            scenario.setup()
+        t0 = time.perf_counter()
+        resp = scenario.request()
+        latencies.append(time.perf_counter() - t0)
+        size = len(resp.get_data())
+
+    # One extra traced call for peak allocation (tracing slows the call, so it is not timed)
+    if scenario.setup:
+        scenario.setup()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    scenario.request()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = np.array(latencies) * 1000
+    return {
+        'iterations': iterations,
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'mean_ms': round(float(ms.mean()), 3),
+        'throughput_rps': round(float(len(ms) / (ms.sum() / 1000)), 2),
+        'peak_mem_mb': round((peak - base) / 2 ** 20, 2),
+        'response_bytes': size,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(sizes, iterations, warmup, seed, only=None, workdir=None):
+    """Benchmark every scenario at every size; returns the results document."""
+    workdir = workdir or tempfile.mkdtemp(prefix='bench_api_')
+    os.environ['DATA_SOURCE_TYPE'] = 'sqlite'
+    os.environ['SQLITE_PATH'] = os.path.join(workdir, f'matches_{sizes[0]}.db')
+
+    from app import create_app
+    import routes
+
+    app = create_app()
+    client = app.test_client()
+    rng = random.Random(seed)
+    results = {}
+    for rows in sizes:
+        path = os.path.join(workdir, f'matches_{rows}.db')
+        if not os.path.exists(path):
+            print(f'Generating {rows:,} rows...')
+            generate_data.write_sqlite(path, rows, seed)
+        routes.DATA_CONFIG['path'] = path
+        t0 = time.perf_counter()
+        routes.store.ensure_loaded(force=True)
+        print(f'\n{rows:,} rows (loaded in {time.perf_counter() - t0:.1f}s)')
+
+        results[str(rows)] = {}
+        for scenario in _scenarios(client, rows, rng):
+            if only and scenario.name not in only:
+                continue
+            r = _measure(scenario, iterations, warmup)
+            results[str(rows)][scenario.name] = r
+            print(f"  {scenario.name:<16} p50 {r['p50_ms']:9.2f} ms  p95 {r['p95_ms']:9.2f} ms  "
+                  f"p99 {r['p99_ms']:9.2f} ms  {r['throughput_rps']:8.1f} req/s  "
+                  f"peak {r['peak_mem_mb']:8.1f} MB")
+        # Leave nothing pending for the next size
+        client.post('/api/save_changes')
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'iterations': iterations,
+            'warmup': warmup,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance, min_delta_ms):
+    """Regressions as (size, endpoint, metric, baseline_ms, current_ms) for p50/p95 over tolerance."""
+    regressions = []
+    for size, endpoints in current['results'].items():
+        for name, r in endpoints.items():
+            base = baseline.get('results', {}).get(size, {}).get(name)
+            if not base:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                if r[metric] > base[metric] * (1 + tolerance) and r[metric] - base[metric] > min_delta_ms:
+                    regressions.append((size, name, metric, base[metric], r[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Comma-separated row counts')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=generate_data.DEFAULT_SEED)
+    parser.add_argument('--endpoints', help='Comma-separated scenario names to run (default: all)')
+    parser.add_argument('--workdir', help='Keep generated databases here (reused across runs)')
+    parser.add_argument('--out', help='Results JSON (default: benchmarks/results/api-<timestamp>.json)')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help='Ignore slowdowns smaller than this')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    only = set(args.endpoints.split(',')) if args.endpoints else None
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+    current = run(sizes, args.iterations, args.warmup, args.seed, only, args.workdir)
+
+    out = Path(args.out) if args.out else DEFAULT_RESULTS_DIR / f"api-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(current, indent=2))
+    print(f'\nResults: {out}')
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(current, indent=2))
+        print(f'Baseline saved: {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline to compare against (run with --save-baseline)')
+        return 0
+    regressions = compare(current, json.loads(Path(args.baseline).read_text()),
+                          args.tolerance, args.min_delta_ms)
+    if regressions:
+        print('\nREGRESSION:')
+        for size, name, metric, base, now in regressions:
+            print(f'  {name} @ {int(size):,} rows: {metric} {base:.2f} -> {now:.2f} ms')
+        return 1
+    print('\nOK (within tolerance of baseline)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
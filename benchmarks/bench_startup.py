@@ -0,0 +1,94 @@
+"""
+Startup Time Benchmark
+Times `import app` and `create_app()` in fresh interpreters and fails when either
+exceeds its budget, or when importing app pulls in pandas or the Snowflake connector.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --import-budget-ms 100 --factory-budget-ms 3000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must stay out of a bare `import app`
+HEAVY_MODULES = ('pandas', 'numpy', 'snowflake', 'snowflake.connector', 'flask')
+
+_PROBE = '''
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+heavy = [m for m in {heavy!r} if m in sys.modules]
+app.create_app()
+t2 = time.perf_counter()
+print(json.dumps({{"import_s": t1 - t0, "factory_s": t2 - t1, "heavy": heavy}}))
+'''
+
+
+def _run_once():
+    """One fresh interpreter: wall times plus the -X importtime self/cumulative table."""
+    env = dict(os.environ)
+    # Startup must not depend on Snowflake settings being present
+    env.pop('SNOWFLAKE_ACCOUNT', None)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    imports = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, self_us, cumulative_us, name = line.replace('import time:', '|').split('|')
+        # Nested imports are indented two extra spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    result['imports'] = imports
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float, default=100.0,
+                        help='Median budget for `import app`')
+    parser.add_argument('--factory-budget-ms', type=float, default=3000.0,
+                        help='Median budget for create_app() (imports Flask, pandas and the routes)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+    args = parser.parse_args()
+
+    runs = [_run_once() for _ in range(args.runs)]
+    import_ms = statistics.median(r['import_s'] for r in runs) * 1000
+    factory_ms = statistics.median(r['factory_s'] for r in runs) * 1000
+
+    print(f'import app:    {import_ms:8.1f} ms (budget {args.import_budget_ms:.0f} ms)')
+    print(f'create_app():  {factory_ms:8.1f} ms (budget {args.factory_budget_ms:.0f} ms)')
+    print('\nSlowest top-level imports (cumulative, last run):')
+    top_level = sorted(((name, t) for name, t in runs[-1]['imports'].items() if t[2] == 0),
+                       key=lambda kv: -kv[1][1])
+    for name, (_self_us, cumulative_us, _depth) in top_level[:args.top]:
+        print(f'  {cumulative_us / 1000:8.1f} ms  {name}')
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f'import app took {import_ms:.1f} ms')
+    if factory_ms > args.factory_budget_ms:
+        failures.append(f'create_app() took {factory_ms:.1f} ms')
+    heavy = sorted({m for r in runs for m in r['heavy']})
+    if heavy:
+        failures.append(f'import app loaded {", ".join(heavy)}')
+    if failures:
+        print('\nREGRESSION: ' + '; '.join(failures))
+        return 1
+    print('\nOK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""
+Synthetic Match Data Generator
+Produces import_merge_matches-shaped rows (canvas/DEC names and addresses, score
+distributions, recommendations from the BA_CONFIG buckets, match-detail JSON) for
+benchmarks and offline runs. Output is deterministic for a given --rows/--seed/--chunk-rows.
+
+    python benchmarks/generate_data.py --rows 100000 --sqlite data/import_merge_matches.db
+    python benchmarks/generate_data.py --rows 5000000 --parquet data/matches_5m.parquet
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bucket_engine import BUCKET_ORDER, REVIEW_BUCKET, parse_thresholds  # noqa: E402
+
+DEFAULT_SEED = 20240601
+DEFAULT_CHUNK_ROWS = 250_000
+
+# Score ranges seeded into BA_CONFIG; scores between the buckets land in NEEDS REVIEW
+BA_CONFIG_DEFAULTS = {
+    'EXISTING BA AND EXISTING ADDRESS': {'min_name': 90, 'max_name': 100, 'min_addr': 90, 'max_addr': 100},
+    'EXISTING BA ADD NEW ADDRESS': {'min_name': 90, 'max_name': 100, 'min_addr': 0, 'max_addr': 89.9},
+    'NEW BA AND NEW ADDRESS': {'min_name': 0, 'max_name': 69.9, 'min_addr': 0, 'max_addr': 100},
+}
+_BA_CONFIG_PREFIX = {
+    'NEW BA AND NEW ADDRESS': 'NEW_BA_NEW_ADDR',
+    'EXISTING BA ADD NEW ADDRESS': 'EXISTING_BA_NEW_ADDR',
+    'EXISTING BA AND EXISTING ADDRESS': 'EXISTING_BA_EXISTING_ADDR',
+}
+
+_PROCESS_OPTS = np.array(['Add new BA and address', 'Add address to existing BA',
+                          'Merge BA and address', 'Manual Review - DNP'], dtype=object)
+_RUN_IDS = np.array(['RUN_20240515', 'RUN_20240601', 'RUN_20240615'], dtype=object)
+
+_FIRST = np.array(['JAMES', 'MARY', 'ROBERT', 'PATRICIA', 'JOHN', 'LINDA', 'MICHAEL', 'BARBARA',
+                   'WILLIAM', 'ELIZABETH', 'DAVID', 'SUSAN', 'RICHARD', 'JESSICA', 'JOSEPH',
+                   'SARAH', 'THOMAS', 'KAREN', 'CHARLES', 'NANCY', 'DANIEL', 'BETTY', 'MARK',
+                   'SANDRA', 'PAUL', 'ASHLEY', 'DONALD', 'DOROTHY', 'GEORGE', 'DONNA'], dtype=object)
+_LAST = np.array(['SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS',
+                  'RODRIGUEZ', 'MARTINEZ', 'HERNANDEZ', 'LOPEZ', 'WILSON', 'ANDERSON', 'THOMAS',
+                  'TAYLOR', 'MOORE', 'JACKSON', 'MARTIN', 'LEE', 'THOMPSON', 'WHITE', 'HARRIS',
+                  'CLARK', 'LEWIS', 'ROBINSON', 'WALKER', 'YOUNG', 'ALLEN', 'KING', 'WRIGHT',
+                  'SCOTT', 'GREEN', 'BAKER', 'ADAMS', 'NELSON', 'HILL', 'CAMPBELL', 'MITCHELL'],
+                 dtype=object)
+_COMPANY = np.array(['PERMIAN', 'EAGLE FORD', 'RED RIVER', 'LONE STAR', 'BLUE MESA', 'COTTONWOOD',
+                     'PECOS', 'BRAZOS', 'PANHANDLE', 'MIDLAND', 'SABINE', 'CIMARRON', 'BIG SKY',
+                     'HIGH PLAINS', 'SAN JUAN', 'ANADARKO', 'WILDCAT', 'MESQUITE', 'CANYON',
+                     'PRAIRIE'], dtype=object)
+_COMPANY_KIND = np.array(['ROYALTIES', 'MINERALS', 'ENERGY', 'RESOURCES', 'OIL & GAS',
+                          'EXPLORATION', 'HOLDINGS', 'LAND'], dtype=object)
+_SUFFIX = np.array(['LLC', 'INC', 'LP', 'LTD', 'CO'], dtype=object)
+_STREET = np.array(['MAIN', 'OAK', 'PINE', 'MAPLE', 'CEDAR', 'ELM', 'WASHINGTON', 'LAKE', 'HILL',
+                    'PARK', 'RANCH', 'COUNTY ROAD 12', 'HIGHWAY 80', 'BRIDGE', 'MILL', 'RIVER',
+                    'SPRING', 'WILLOW', 'SUNSET', 'MESA'], dtype=object)
+_STREET_TYPE = np.array(['ST', 'AVE', 'RD', 'DR', 'LN', 'BLVD', 'CT', 'TRL'], dtype=object)
+_STREET_TYPE_LONG = np.array(['STREET', 'AVENUE', 'ROAD', 'DRIVE', 'LANE', 'BOULEVARD', 'COURT', 'TRAIL'],
+                             dtype=object)
+# (state, zip prefix, cities), weighted toward the producing states
+_PLACES = [
+    ('TX', '77', ['HOUSTON', 'KATY', 'SUGAR LAND', 'THE WOODLANDS']),
+    ('TX', '79', ['MIDLAND', 'ODESSA', 'LUBBOCK', 'AMARILLO']),
+    ('TX', '75', ['DALLAS', 'PLANO', 'TYLER', 'LONGVIEW']),
+    ('OK', '73', ['OKLAHOMA CITY', 'NORMAN', 'ENID']),
+    ('OK', '74', ['TULSA', 'BARTLESVILLE', 'MUSKOGEE']),
+    ('NM', '88', ['HOBBS', 'CARLSBAD', 'ARTESIA', 'ROSWELL']),
+    ('LA', '70', ['LAFAYETTE', 'BATON ROUGE', 'LAKE CHARLES']),
+    ('CO', '80', ['DENVER', 'GREELEY', 'FORT COLLINS']),
+    ('ND', '58', ['WILLISTON', 'DICKINSON', 'MINOT']),
+    ('WY', '82', ['CASPER', 'GILLETTE', 'CHEYENNE']),
+]
+_PLACE_WEIGHTS = np.array([18, 14, 10, 10, 8, 8, 7, 7, 9, 9], dtype=float)
+_CITY_STATE = np.array([(city, state, prefix) for state, prefix, cities in _PLACES for city in cities],
+                       dtype=object)
+_CITY_WEIGHTS = np.concatenate([np.full(len(cities), w / len(cities))
+                                for (_, _, cities), w in zip(_PLACES, _PLACE_WEIGHTS)])
+_CITY_WEIGHTS /= _CITY_WEIGHTS.sum()
+
+
+def ba_config_rows(config: Optional[Dict[str, Dict[str, float]]] = None):
+    """BA_CONFIG (CATEGORY, CONFIG_KEY, CONFIG_VALUE) rows for the bucket score ranges."""
+    config = config or BA_CONFIG_DEFAULTS
+    rows = []
+    for bucket, prefix in _BA_CONFIG_PREFIX.items():
+        for bound, key in (('min_name', 'MIN_NAME_SCORE'), ('max_name', 'MAX_NAME_SCORE'),
+                           ('min_addr', 'MIN_ADDR_SCORE'), ('max_addr', 'MAX_ADDR_SCORE')):
+            rows.append(('BUCKETS', f'{prefix}_{key}', f"{config[bucket][bound]:g}"))
+    return rows
+
+
+def _hash(values: np.ndarray, salt: int) -> np.ndarray:
+    """Deterministic per-entity pseudo-random uint64 (so an entity looks the same in every chunk)."""
+    x = values.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) + np.uint64(salt)
+    x ^= x >> np.uint64(31)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(29)
+    return x
+
+
+def _pick(pool: np.ndarray, h: np.ndarray) -> np.ndarray:
+    return pool[(h % np.uint64(len(pool))).astype(np.int64)]
+
+
+def _cat(*parts) -> np.ndarray:
+    """Element-wise string concatenation of object arrays / scalars."""
+    out = parts[0] if isinstance(parts[0], str) else pd.Series(parts[0]).astype(str)
+    for part in parts[1:]:
+        out = out + (part if isinstance(part, str) else pd.Series(part).astype(str))
+    return out.to_numpy(dtype=object)
+
+
+def _entity_names(idx: np.ndarray, salt: int):
+    """(name, normalized name) per entity id: a person ('SMITH JOHN A') or a company
+    ('PERMIAN MINERALS LLC', normalized without punctuation and the legal suffix)."""
+    h = _hash(idx, salt)
+    person = (h % np.uint64(100)) < np.uint64(55)
+    trust = (h >> np.uint64(8)) % np.uint64(100) < np.uint64(8)
+    initial = _pick(np.array(list('ABCDEFGHJKLMNPRSTW'), dtype=object), h >> np.uint64(16))
+    people = _cat(_pick(_LAST, h >> np.uint64(20)), ' ', _pick(_FIRST, h >> np.uint64(28)), ' ', initial)
+    company = _cat(_pick(_COMPANY, h >> np.uint64(20)), ' ', _pick(_COMPANY_KIND, h >> np.uint64(28)))
+    names = np.where(person, people, _cat(company, ' ', _pick(_SUFFIX, h >> np.uint64(36))))
+    normal = np.where(person, people, pd.Series(company).str.replace(' &', '', regex=False).to_numpy(dtype=object))
+    return (np.where(trust, _cat(names, ' TRUST'), names),
+            np.where(trust, _cat(normal, ' TRUST'), normal))
+
+
+def _entity_addresses(idx: np.ndarray, salt: int):
+    """(street address, normalized street address, city, state, zip) per entity id."""
+    h = _hash(idx, salt)
+    number = (h % np.uint64(9899) + np.uint64(100)).astype(np.int64)
+    base = _cat(number, ' ', _pick(_STREET, h >> np.uint64(16)), ' ')
+    street_type = ((h >> np.uint64(24)) % np.uint64(len(_STREET_TYPE))).astype(np.int64)
+    street, normal = _cat(base, _STREET_TYPE[street_type]), _cat(base, _STREET_TYPE_LONG[street_type])
+    unit = (h >> np.uint64(32)) % np.uint64(10) == np.uint64(0)
+    suite = _cat(' STE ', ((h >> np.uint64(40)) % np.uint64(400) + np.uint64(100)).astype(np.int64))
+    street = np.where(unit, _cat(street, suite), street)
+    normal = np.where(unit, _cat(normal, suite), normal)
+    u = ((h >> np.uint64(11)) & np.uint64((1 << 53) - 1)).astype(np.float64) / float(1 << 53)
+    place = np.minimum(np.searchsorted(np.cumsum(_CITY_WEIGHTS), u), len(_CITY_STATE) - 1)
+    city, state, prefix = _CITY_STATE[place, 0], _CITY_STATE[place, 1], _CITY_STATE[place, 2]
+    zip_code = _cat(prefix, pd.Series(((h >> np.uint64(48)) % np.uint64(1000)).astype(np.int64))
+                    .astype(str).str.zfill(3).to_numpy(dtype=object))
+    return street, normal, city, state, zip_code
+
+
+def _variant(values: np.ndarray, rng: np.random.Generator, rate: float) -> np.ndarray:
+    """Lightly perturbed copies (abbreviations, dropped tokens) of a share of the values."""
+    s = pd.Series(values, dtype=object)
+    which = rng.random(len(s)) < rate
+    if which.any():
+        alt = s[which]
+        kind = rng.integers(0, 3, len(alt))
+        alt = np.where(kind == 0, alt.str.replace(' LLC', ' L.L.C.', regex=False)
+                       .str.replace(' INC', ' INCORPORATED', regex=False),
+                       np.where(kind == 1, alt.str.rsplit(' ', n=1).str[0], alt + ' ETAL'))
+        s[which] = alt
+    return s.to_numpy(dtype=object)
+
+
+def _scores(rng: np.random.Generator, n: int, exact: float, high: float) -> np.ndarray:
+    """Mixture of exact matches (100), near matches (beta-shaped 70-99.9) and weak matches."""
+    u = rng.random(n)
+    near = np.round(70 + 29.9 * rng.beta(6, 2, n), 1)
+    weak = np.round(rng.uniform(5, 70, n), 1)
+    return np.where(u < exact, 100.0, np.where(u < exact + high, near, weak))
+
+
+def _detail_json(keys, *columns) -> np.ndarray:
+    """Compact JSON objects built column-wise ({"k1": v1, "k2": v2, ...})."""
+    out = None
+    for i, (key, col) in enumerate(zip(keys, columns)):
+        quoted = col.dtype == object
+        values = pd.Series(col).astype(str)
+        if quoted:
+            values = '"' + values.str.replace('"', '\\"', regex=False) + '"'
+        piece = ('{' if i == 0 else ', ') + f'"{key}": ' + values
+        out = piece if out is None else out + piece
+    return (out + '}').to_numpy(dtype=object)
+
+
+def generate_chunk(start: int, rows: int, total_rows: int, seed: int = DEFAULT_SEED,
+                   thresholds: Optional[Dict[str, Dict[str, float]]] = None) -> pd.DataFrame:
+    """Rows [start, start + rows) of a total_rows-row dataset."""
+    rng = np.random.default_rng([seed, start])
+    pos = np.arange(start, start + rows, dtype=np.int64)
+
+    # ~3 candidate rows per canvas BA, laid out consecutively like the source table
+    n_canvas = max(total_rows // 3, 1)
+    canvas_idx = pos * n_canvas // total_rows
+    canvas_name, canvas_norm = _entity_names(canvas_idx, seed)
+    canvas_street, canvas_street_norm, canvas_city, canvas_state, canvas_zip = _entity_addresses(canvas_idx, seed + 1)
+    canvas_h = _hash(canvas_idx, seed + 2)
+
+    name_score = _scores(rng, rows, exact=0.38, high=0.34)
+    # Address agreement correlates with name agreement
+    addr_exact = np.where(name_score >= 90, 0.55, 0.12)
+    address_score = np.where(rng.random(rows) < addr_exact, 100.0, _scores(rng, rows, exact=0.0, high=0.55))
+    missing = rng.random(rows) < 0.01
+    name_score[missing] = np.nan
+    address_score[rng.random(rows) < 0.01] = np.nan
+
+    # DEC candidate: the same BA (perturbed) when the name matches, another BA otherwise
+    n_dec = max(total_rows // 4, 1)
+    other_dec = (_hash(pos, seed + 3) % np.uint64(n_dec)).astype(np.int64)
+    same_name = name_score >= 90
+    other_name, other_norm = _entity_names(other_dec, seed + 4)
+    dec_name = np.where(same_name, _variant(canvas_name, rng, 0.4), other_name)
+    dec_norm = np.where(same_name, canvas_norm, other_norm)
+    dec_street, dec_street_norm, dec_city, dec_state, dec_zip = _entity_addresses(other_dec, seed + 5)
+    same_addr = address_score >= 90
+    # DEC stores addresses spelled out
+    dec_address = np.where(same_addr, canvas_street_norm, dec_street_norm)
+    dec_city = np.where(same_addr, canvas_city, dec_city)
+    dec_state = np.where(same_addr, canvas_state, dec_state)
+    dec_zip = np.where(same_addr, canvas_zip, dec_zip)
+    dec_hdrcode = np.where(same_name, (100000 + canvas_idx % 900000), 100000 + other_dec % 900000).astype(str)
+
+    ssn_match = np.where(same_name & (rng.random(rows) < 0.8), 100, 0)
+    canvas_ssn = pd.Series((canvas_h % np.uint64(10 ** 9)).astype(np.int64)).astype(str).str.zfill(9)
+
+    nameaddrscore = np.round((name_score + address_score) / 2, 1)
+    address_reason = np.select(
+        [np.isnan(address_score), address_score == 100, address_score >= 90, address_score >= 70],
+        ['NO ADDRESS', 'EXACT MATCH', 'MINOR DIFFERENCES', 'PARTIAL MATCH'], default='DIFFERENT ADDRESS'
+    ).astype(object)
+
+    # Recommendation from the bucket ranges (same precedence as BucketEngine.assign)
+    parsed = parse_thresholds(thresholds or BA_CONFIG_DEFAULTS)
+    conditions = [(name_score >= parsed[b]['min_name']) & (name_score <= parsed[b]['max_name'])
+                  & (address_score >= parsed[b]['min_addr']) & (address_score <= parsed[b]['max_addr'])
+                  for b in BUCKET_ORDER]
+    recommendation = np.select(conditions, BUCKET_ORDER, default=REVIEW_BUCKET).astype(object)
+    u = rng.random(rows)
+    recommendation[u < 0.03] = REVIEW_BUCKET
+    processed = (u >= 0.03) & (u < 0.06)
+    recommendation[processed] = 'PROCESSED'
+    how_to_process = np.full(rows, '', dtype=object)
+    how_to_process[processed] = _PROCESS_OPTS[rng.integers(0, len(_PROCESS_OPTS), int(processed.sum()))]
+
+    df = pd.DataFrame({
+        'id': pos + 1,
+        'canvas_id': (2300000 + canvas_idx).astype(str),
+        'canvas_addrseq': (1 + canvas_h % np.uint64(3)).astype(np.int64),
+        'canvas_ssn': canvas_ssn.to_numpy(dtype=object),
+        'canvas_name': canvas_name,
+        'canvas_address': canvas_street,
+        'canvas_city': canvas_city,
+        'canvas_state': canvas_state,
+        'canvas_zip': canvas_zip,
+        'dec_hdrcode': dec_hdrcode.astype(object),
+        'dec_addrsubcode': rng.integers(1, 5, rows).astype(str).astype(object),
+        'dec_name': dec_name,
+        'dec_address': dec_address,
+        'dec_city': dec_city,
+        'dec_state': dec_state,
+        'dec_zip': dec_zip,
+        'dec_contact': np.where(rng.random(rows) < 0.15, 'ATTN: LAND DEPT', '').astype(object),
+        'dec_address_looked_up': (rng.random(rows) < 0.1).astype(np.int64),
+        'ssn_match': ssn_match,
+        'name_score': name_score,
+        'address_score': address_score,
+        'nameaddrscore': nameaddrscore,
+        'recommendation': recommendation,
+        'address_reason': address_reason,
+        'how_to_process': how_to_process,
+        'is_trust': pd.Series(canvas_name).str.endswith(' TRUST').astype(np.int64).to_numpy(),
+        'run_id': _RUN_IDS[rng.integers(0, len(_RUN_IDS), rows)],
+        'name_normal_detail': _detail_json(('canvas', 'dec'), canvas_norm, dec_norm),
+        'address_normal_detail': _detail_json(('canvas', 'dec'), canvas_street_norm, dec_address),
+        'name_match_detail': _detail_json(
+            ('token_sort', 'token_set', 'jaro_winkler'),
+            np.nan_to_num(name_score), np.nan_to_num(np.minimum(name_score + 5, 100)),
+            np.round(np.nan_to_num(name_score) / 100, 3)),
+        'addr_match_detail': _detail_json(
+            ('number', 'street', 'city', 'zip'),
+            np.where(same_addr, 100, rng.integers(0, 100, rows)), np.nan_to_num(address_score),
+            np.where(dec_city == canvas_city, 100, 0), np.where(dec_zip == canvas_zip, 100, 0)),
+    })
+    return df
+
+
+def iter_matches(rows: int, seed: int = DEFAULT_SEED, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 thresholds: Optional[Dict[str, Dict[str, float]]] = None) -> Iterator[pd.DataFrame]:
+    """The dataset as consecutive chunks of at most chunk_rows rows."""
+    for start in range(0, rows, chunk_rows):
+        yield generate_chunk(start, min(chunk_rows, rows - start), rows, seed, thresholds)
+
+
+def generate_matches(rows: int, seed: int = DEFAULT_SEED, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     thresholds: Optional[Dict[str, Dict[str, float]]] = None) -> pd.DataFrame:
+    """The whole dataset as one DataFrame (RangeIndex)."""
+    return pd.concat(list(iter_matches(rows, seed, chunk_rows, thresholds)), ignore_index=True)
+
+
+def write_sqlite(path: str, rows: int, seed: int = DEFAULT_SEED, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 table: str = 'import_merge_matches') -> None:
+    """Create a SQLite database for DATA_SOURCE_TYPE=sqlite: match table, UPDATE_LOG and BA_CONFIG."""
+    from sqlite_backend import SQLiteBackend
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    try:
+        for i, chunk in enumerate(iter_matches(rows, seed, chunk_rows)):
+            chunk.to_sql(table, conn, if_exists='replace' if i == 0 else 'append', index=False)
+            print(f"  {min((i + 1) * chunk_rows, rows):,} / {rows:,} rows")
+        conn.commit()
+    finally:
+        conn.close()
+
+    backend = SQLiteBackend({'source_type': 'sqlite', 'path': path, 'table': table})
+    backend.ensure_schema()
+    with backend.transaction() as tx:
+        tx.execute("DELETE FROM BA_CONFIG WHERE CATEGORY = 'BUCKETS'")
+        tx.executemany("INSERT INTO BA_CONFIG (CATEGORY, CONFIG_KEY, CONFIG_VALUE) VALUES (?, ?, ?)",
+                       ba_config_rows())
+
+
+def write_parquet(path: str, rows: int, seed: int = DEFAULT_SEED, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """Write the dataset as Parquet, one row group per chunk (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer = None
+    try:
+        for i, chunk in enumerate(iter_matches(rows, seed, chunk_rows)):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+            writer.write_table(table)
+            print(f"  {min((i + 1) * chunk_rows, rows):,} / {rows:,} rows")
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='Rows to generate (10k to 5M is typical)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--sqlite', help='Write a SQLite database for DATA_SOURCE_TYPE=sqlite')
+    parser.add_argument('--parquet', help='Write a Parquet file (requires pyarrow)')
+    args = parser.parse_args()
+
+    if not args.sqlite and not args.parquet:
+        parser.error('give --sqlite and/or --parquet')
+    if args.rows < 1 or args.chunk_rows < 1:
+        parser.error('--rows and --chunk-rows must be positive')
+
+    t0 = time.perf_counter()
+    if args.sqlite:
+        print(f"Generating {args.rows:,} rows into {args.sqlite} (seed {args.seed})")
+        write_sqlite(args.sqlite, args.rows, args.seed, args.chunk_rows)
+    if args.parquet:
+        print(f"Generating {args.rows:,} rows into {args.parquet} (seed {args.seed})")
+        write_parquet(args.parquet, args.rows, args.seed, args.chunk_rows)
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
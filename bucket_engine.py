@@ -0,0 +1,185 @@
+"""
+BA_CONFIG Bucket Evaluation Engine
+What-if re-bucketing of match rows against candidate name/address score thresholds
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+
+# Bucket precedence when threshold ranges overlap: first matching bucket wins
+BUCKET_ORDER = (
+    'EXISTING BA AND EXISTING ADDRESS',
+    'EXISTING BA ADD NEW ADDRESS',
+    'NEW BA AND NEW ADDRESS',
+)
+
+# Rows that fall in no bucket land here
+REVIEW_BUCKET = 'NEEDS REVIEW'
+
+# Only machine-assigned statuses are re-bucketed; APPROVED/PROCESSED etc. stay put
+REBUCKETABLE = BUCKET_ORDER + (REVIEW_BUCKET,)
+
+# Above this many distinct score values the count cube gets too large; fall back to per-row
+_MAX_DISTINCT_SCORES = 2048
+
+
+def parse_thresholds(config: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    Normalise {bucket: {min_name, max_name, min_addr, max_addr}} to floats.
+    Blank or missing bounds are open-ended.
+    """
+    def bound(value, default):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return default
+        return float(value)
+
+    parsed = {}
+    for bucket in BUCKET_ORDER:
+        cfg = config.get(bucket) or {}
+        parsed[bucket] = {
+            'min_name': bound(cfg.get('min_name'), -np.inf),
+            'max_name': bound(cfg.get('max_name'), np.inf),
+            'min_addr': bound(cfg.get('min_addr'), -np.inf),
+            'max_addr': bound(cfg.get('max_addr'), np.inf),
+        }
+    return parsed
+
+
+class BucketEngine:
+    """
+    Precomputed view of one data snapshot for fast threshold what-ifs.
+
+    Re-bucketable rows are counted into a cube indexed by (current status, distinct
+    name score, distinct address score) with 2-D prefix sums per status, so the
+    resulting distribution for any thresholds is a handful of O(1) rectangle sums,
+    independent of row count. Per-row evaluation is only done when row ids are asked for.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        rec = df['recommendation'].astype(object)
+        self.row_ids = df.index.to_numpy()
+        self.name = pd.to_numeric(df['name_score'], errors='coerce').to_numpy(dtype=float)
+        self.addr = pd.to_numeric(df['address_score'], errors='coerce').to_numpy(dtype=float)
+        self.current = rec.fillna('').to_numpy(dtype=object)
+        self.status_idx = np.full(len(df), -1, dtype=np.int8)
+        for i, status in enumerate(REBUCKETABLE):
+            self.status_idx[self.current == status] = i
+
+        # Rows that keep their status no matter the thresholds
+        fixed = rec[self.status_idx < 0].fillna('')
+        self.fixed_counts = {k: int(v) for k, v in fixed.value_counts().items()}
+
+        movable = self.status_idx >= 0
+        scored = movable & ~np.isnan(self.name) & ~np.isnan(self.addr)
+        # Rows missing a score can never satisfy a bucket range
+        self.unscored_counts = np.bincount(self.status_idx[movable & ~scored],
+                                           minlength=len(REBUCKETABLE))
+
+        self.name_vals = np.unique(self.name[scored])
+        self.addr_vals = np.unique(self.addr[scored])
+        self.cube = None
+        if len(self.name_vals) <= _MAX_DISTINCT_SCORES and len(self.addr_vals) <= _MAX_DISTINCT_SCORES:
+            ni = np.searchsorted(self.name_vals, self.name[scored])
+            ai = np.searchsorted(self.addr_vals, self.addr[scored])
+            shape = (len(REBUCKETABLE), len(self.name_vals), len(self.addr_vals))
+            counts = np.zeros(shape, dtype=np.int64)
+            np.add.at(counts, (self.status_idx[scored], ni, ai), 1)
+            # Leading zero row/col so rectangle sums need no edge cases
+            self.cube = np.zeros((shape[0], shape[1] + 1, shape[2] + 1), dtype=np.int64)
+            self.cube[:, 1:, 1:] = counts.cumsum(axis=1).cumsum(axis=2)
+
+    # ── Counting via prefix sums ──
+    def _rect(self, b: Dict[str, float]):
+        """Index bounds [n0, n1) x [a0, a1) of a threshold rectangle over the distinct values."""
+        n0 = np.searchsorted(self.name_vals, b['min_name'], side='left')
+        n1 = np.searchsorted(self.name_vals, b['max_name'], side='right')
+        a0 = np.searchsorted(self.addr_vals, b['min_addr'], side='left')
+        a1 = np.searchsorted(self.addr_vals, b['max_addr'], side='right')
+        return n0, max(n0, n1), a0, max(a0, a1)
+
+    @staticmethod
+    def _intersect(r1, r2):
+        n0, a0 = max(r1[0], r2[0]), max(r1[2], r2[2])
+        return n0, max(n0, min(r1[1], r2[1])), a0, max(a0, min(r1[3], r2[3]))
+
+    def _count(self, rect) -> np.ndarray:
+        """Rows per current status inside a rectangle."""
+        n0, n1, a0, a1 = rect
+        c = self.cube
+        return c[:, n1, a1] - c[:, n0, a1] - c[:, n1, a0] + c[:, n0, a0]
+
+    def _transition_counts(self, thresholds) -> Dict[str, np.ndarray]:
+        """{target bucket: rows per current status} honouring BUCKET_ORDER precedence."""
+        rects = [self._rect(thresholds[b]) for b in BUCKET_ORDER]
+        result = {}
+        assigned = np.zeros(len(REBUCKETABLE), dtype=np.int64)
+        for i, bucket in enumerate(BUCKET_ORDER):
+            # |R_i \\ (R_0 ∪ ... ∪ R_{i-1})| by inclusion-exclusion over at most two earlier buckets
+            own = self._count(rects[i])
+            earlier = rects[:i]
+            overlap = sum((self._count(self._intersect(rects[i], e)) for e in earlier),
+                          np.zeros(len(REBUCKETABLE), dtype=np.int64))
+            if len(earlier) == 2:
+                overlap = overlap - self._count(
+                    self._intersect(self._intersect(rects[i], earlier[0]), earlier[1]))
+            result[bucket] = own - overlap
+            assigned += result[bucket]
+        scored_total = self.cube[:, -1, -1]
+        result[REVIEW_BUCKET] = scored_total - assigned + self.unscored_counts
+        return result
+
+    # ── Per-row evaluation ──
+    def assign(self, thresholds) -> np.ndarray:
+        """Vectorized new status for every row (fixed rows keep their current status)."""
+        conditions = []
+        for bucket in BUCKET_ORDER:
+            b = thresholds[bucket]
+            conditions.append((self.name >= b['min_name']) & (self.name <= b['max_name'])
+                              & (self.addr >= b['min_addr']) & (self.addr <= b['max_addr']))
+        new = np.select(conditions, BUCKET_ORDER, default=REVIEW_BUCKET).astype(object)
+        fixed = self.status_idx < 0
+        new[fixed] = self.current[fixed]
+        return new
+
+    def evaluate(self, thresholds, include_rows: bool = False,
+                 row_limit: Optional[int] = 1000) -> Dict[str, Any]:
+        """
+        Resulting recommendation distribution and status transitions for the thresholds.
+
+        Args:
+            thresholds: Output of parse_thresholds()
+            include_rows: Also return the row ids whose status would change
+            row_limit: Cap on returned row ids (None for all)
+        """
+        transitions = []
+        distribution = dict(self.fixed_counts)
+        if self.cube is not None and not include_rows:
+            for target, per_status in self._transition_counts(thresholds).items():
+                for i, source in enumerate(REBUCKETABLE):
+                    n = int(per_status[i])
+                    if n:
+                        distribution[target] = distribution.get(target, 0) + n
+                        if source != target:
+                            transitions.append({'from': source, 'to': target, 'count': n})
+            changed_ids = None
+        else:
+            new = self.assign(thresholds)
+            moved = new != self.current
+            pairs = pd.DataFrame({'from': self.current[moved], 'to': new[moved]})
+            transitions = [
+                {'from': f, 'to': t, 'count': int(n)}
+                for (f, t), n in pairs.value_counts().items()
+            ]
+            distribution = {k: int(v) for k, v in pd.Series(new).value_counts().items()}
+            changed_ids = self.row_ids[moved]
+
+        result = {
+            'distribution': distribution,
+            'transitions': sorted(transitions, key=lambda t: -t['count']),
+            'changed': sum(t['count'] for t in transitions),
+        }
+        if include_rows:
+            ids = changed_ids if row_limit is None else changed_ids[:row_limit]
+            result['row_ids'] = ids.tolist()
+            result['row_ids_truncated'] = len(ids) < len(changed_ids)
+        return result
@@ -0,0 +1,195 @@
+"""
+Duplicate Cluster Engine
+Groups match rows sharing a Canvas ID, a DEC header code, or a normalized Canvas name
+or address, with per-cluster sizes and score summaries precomputed
+"""
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+
+# Cluster kinds: raw canvas_id / dec_hdrcode values, normalized Canvas name, and
+# normalized Canvas address plus ZIP
+CLUSTER_KEYS = ('canvas_id', 'dec_hdrcode', 'name', 'address')
+
+# Kinds built only from read-only columns; their indexes stay valid across edits
+STABLE_KEYS = ('canvas_id', 'dec_hdrcode')
+
+# Scores summarized per cluster
+SUMMARY_SCORES = ('name_score', 'address_score', 'ssn_match')
+
+# Trailing entity-type words that don't tell two names apart
+_NAME_SUFFIXES = {
+    'INC', 'INCORPORATED', 'LLC', 'LLP', 'LP', 'LTD', 'LIMITED', 'CO', 'COMPANY',
+    'CORP', 'CORPORATION', 'PLLC', 'PC', 'TRUST', 'ETAL', 'ET', 'AL',
+}
+
+_STREET_WORDS = {
+    'ROAD': 'RD', 'DRIVE': 'DR', 'AVENUE': 'AVE', 'STREET': 'ST', 'BOULEVARD': 'BLVD',
+    'LANE': 'LN', 'COURT': 'CT', 'PLACE': 'PL', 'HIGHWAY': 'HWY', 'PARKWAY': 'PKWY',
+    'CIRCLE': 'CIR', 'TRAIL': 'TRL', 'SUITE': 'STE', 'NORTH': 'N', 'SOUTH': 'S',
+    'EAST': 'E', 'WEST': 'W', 'POST OFFICE BOX': 'PO BOX', 'P O BOX': 'PO BOX',
+}
+_STREET_RE = re.compile(r'\b(' + '|'.join(sorted(_STREET_WORDS, key=len, reverse=True)) + r')\b')
+
+
+def _clean(text: str) -> str:
+    """Upper case; periods and apostrophes dropped (L.P. -> LP), other punctuation to spaces."""
+    text = re.sub(r"[.']", '', str(text).upper())
+    return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', text).split())
+
+
+def normalize_name(text) -> Optional[str]:
+    words = _clean(text).split()
+    while len(words) > 1 and words[-1] in _NAME_SUFFIXES:
+        words.pop()
+    return ' '.join(words) or None
+
+
+def normalize_address(text) -> Optional[str]:
+    return _STREET_RE.sub(lambda m: _STREET_WORDS[m.group(1)], _clean(text)) or None
+
+
+def _normalized(values: pd.Series, normalize) -> pd.Series:
+    """Normalize each distinct value once (names repeat across a Canvas BA's matches)."""
+    codes, uniques = pd.factorize(values)
+    keys = np.array([normalize(v) for v in uniques] + [None], dtype=object)
+    return pd.Series(keys[codes], index=values.index)
+
+
+def _key_values(df: pd.DataFrame, kind: str) -> pd.Series:
+    """Cluster key per row (None where the row has none)."""
+    if kind == 'name':
+        return _normalized(df['canvas_name'], normalize_name)
+    if kind == 'address':
+        street = _normalized(df['canvas_address'], normalize_address)
+        zip5 = df['canvas_zip'].astype(object).fillna('').astype(str).str.extract(r'(\d{5})', expand=False)
+        # Same street in another town is another address
+        return street.where(street.isna(), street + ' ' + zip5.fillna(''))
+    values = df[kind]
+    text = values.where(values.isna(), values.astype(str).str.strip())
+    return text.where(text != '')
+
+
+class ClusterIndex:
+    """
+    Rows grouped by one key, stored CSR-style: `order` lists row positions sorted by
+    cluster and `offsets[c]:offsets[c + 1]` is cluster c's slice of it, so a cluster's
+    rows are one slice and every cluster's size and score summary is a vector op.
+    """
+
+    def __init__(self, df: pd.DataFrame, kind: str):
+        self.kind = kind
+        codes, keys = pd.factorize(_key_values(df, kind))
+        self.keys = np.asarray(keys, dtype=object)
+        self.codes = codes
+        self.lookup = pd.Index(self.keys)
+        keyed = np.flatnonzero(codes >= 0)
+        self.order = keyed[np.argsort(codes[keyed], kind='stable')]
+        self.sizes = np.bincount(codes[keyed], minlength=len(self.keys))
+        self.offsets = np.concatenate(([0], np.cumsum(self.sizes)))
+
+        # Per-cluster min/mean/max of each score (NaN scores ignored)
+        self.summary: Dict[str, Dict[str, np.ndarray]] = {}
+        starts = self.offsets[:-1]
+        for col in SUMMARY_SCORES:
+            if col not in df.columns or not len(self.keys):
+                continue
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)[self.order]
+            present = ~np.isnan(values)
+            counts = np.add.reduceat(present.astype(np.int64), starts)
+            sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.summary[col] = {
+                    'min': np.fmin.reduceat(values, starts),
+                    'mean': sums / counts,
+                    'max': np.fmax.reduceat(values, starts),
+                }
+
+    def positions(self, cluster: int) -> np.ndarray:
+        """Row positions in one cluster (frame order)."""
+        return self.order[self.offsets[cluster]:self.offsets[cluster + 1]]
+
+    def find(self, key) -> int:
+        """Cluster number for a key, -1 when no row has it."""
+        return int(self.lookup.get_indexer([key])[0]) if len(self.keys) else -1
+
+
+class ClusterEngine:
+    """
+    Cluster indexes of one data snapshot, each built on first use. Canvas names and
+    addresses are editable, so an engine belongs to one data version; `previous` (an
+    engine for an earlier version of the same load, same rows) hands over its
+    STABLE_KEYS indexes instead of rebuilding them.
+    """
+
+    def __init__(self, df: pd.DataFrame, previous: Optional['ClusterEngine'] = None):
+        self.df = df
+        self.row_ids = df.index.to_numpy()
+        self._indexes: Dict[str, ClusterIndex] = {}
+        if previous is not None:
+            for kind in STABLE_KEYS:
+                if kind in previous._indexes:
+                    self._indexes[kind] = previous._indexes[kind]
+
+    def index(self, kind: str) -> ClusterIndex:
+        if kind not in CLUSTER_KEYS:
+            raise ValueError(f"Unknown cluster key {kind!r} (expected one of: {', '.join(CLUSTER_KEYS)})")
+        if kind not in self._indexes:
+            self._indexes[kind] = ClusterIndex(self.df, kind)
+        return self._indexes[kind]
+
+    def _describe(self, idx: ClusterIndex, cluster: int) -> Dict[str, Any]:
+        out = {'key': idx.keys[cluster], 'size': int(idx.sizes[cluster])}
+        for col, stats in idx.summary.items():
+            out[col] = {k: (None if np.isnan(v[cluster]) else round(float(v[cluster]), 2))
+                        for k, v in stats.items()}
+        return out
+
+    def clusters(self, kind: str, min_size: int = 2, sort: str = 'size', ascending: bool = False,
+                 start: int = 0, length: Optional[int] = 100) -> Dict[str, Any]:
+        """
+        Clusters with at least min_size rows, ordered by size, key or a mean score.
+
+        Args:
+            kind: One of CLUSTER_KEYS
+            sort: 'size', 'key' or a SUMMARY_SCORES column (by its mean)
+            start, length: Page of the ordered clusters (length None for all)
+        """
+        idx = self.index(kind)
+        selected = np.flatnonzero(idx.sizes >= max(min_size, 1))
+        if sort == 'key':
+            ranked = selected[np.argsort(idx.keys[selected].astype(str), kind='stable')]
+            if not ascending:
+                ranked = ranked[::-1]
+        else:
+            if sort == 'size':
+                by = idx.sizes[selected].astype(float)
+            elif sort in idx.summary:
+                by = idx.summary[sort]['mean'][selected]
+            else:
+                raise ValueError(f"Cannot sort clusters by {sort!r}")
+            # Ties keep first-seen order either way; clusters without the score go last
+            ranked = selected[np.argsort(by if ascending else -by, kind='stable')]
+        page = ranked[start:] if length is None else ranked[start:start + length]
+        return {
+            'by': kind,
+            'total_clusters': int(len(selected)),
+            'clustered_rows': int(idx.sizes[selected].sum()),
+            'clusters': [self._describe(idx, c) for c in page],
+        }
+
+    def cluster(self, kind: str, key=None, row_id=None) -> Optional[Dict[str, Any]]:
+        """One cluster by key (a name key may be given un-normalized), or the cluster a
+        row belongs to, with its row ids."""
+        idx = self.index(kind)
+        if row_id is not None:
+            pos = pd.Index(self.row_ids).get_indexer([row_id])[0]
+            cluster = int(idx.codes[pos]) if pos >= 0 else -1
+        else:
+            cluster = idx.find(normalize_name(key) if kind == 'name' else key)
+        if cluster < 0:
+            return None
+        out = self._describe(idx, cluster)
+        out['row_ids'] = self.row_ids[idx.positions(cluster)].tolist()
+        return out
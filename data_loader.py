@@ -1,18 +1,29 @@
 """
 Data Source Abstraction Layer
-Supports loading data from Snowflake
+Supports Snowflake and, for offline testing/benchmarks, a local SQLite file
+(see sqlite_backend.py), behind the DataBackend interface
 """
 import os
 import time
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 import pandas as pd
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Callable
 
+import metrics
 
-# Persistent Snowflake connection — avoids repeated SSO browser popups
-_sf_conn = None
-_sf_config_hash = None
-_sf_conn_verified_at = 0  # timestamp of last successful health check
-_SF_CONN_TTL = 60         # seconds to trust a connection without re-checking
+
+# Pooled Snowflake connections, one pool per distinct connection config
+_sf_pools: Dict[str, 'SnowflakePool'] = {}
+_sf_pools_lock = threading.Lock()
+_SF_POOL_SIZE = int(os.environ.get('SNOWFLAKE_POOL_SIZE', '4'))
+
+# Rows per fetch while loading the match table (progress is reported per chunk)
+_LOAD_CHUNK_ROWS = 50_000
+
+# progress(phase, rows_loaded=None, rows_total=None)
+ProgressCallback = Callable[..., None]
 
 
 def _build_conn_params(config: Dict[str, Any]) -> dict:
@@ -28,10 +39,18 @@ def _build_conn_params(config: Dict[str, Any]) -> dict:
 
     if authenticator:
         conn_params['authenticator'] = authenticator
+        # Cache the SSO ID token / MFA token so pooled connections after the first
+        # authenticate silently instead of opening another browser prompt
         conn_params['client_store_temporary_credential'] = True
+        if authenticator.lower() == 'username_password_mfa':
+            conn_params['client_request_mfa_token'] = True
+            conn_params['password'] = os.environ.get('SNOWFLAKE_PASSWORD', config.get('password', ''))
     else:
         conn_params['password'] = os.environ.get('SNOWFLAKE_PASSWORD', config.get('password', ''))
 
+    if not conn_params['account']:
+        raise ValueError("SNOWFLAKE_ACCOUNT not set. Check your .env file.")
+
     wh = os.environ.get('SNOWFLAKE_WAREHOUSE', config.get('warehouse'))
     if wh:
         conn_params['warehouse'] = wh
@@ -42,73 +61,243 @@ def _build_conn_params(config: Dict[str, Any]) -> dict:
     return conn_params
 
 
-def get_snowflake_connection(config: Dict[str, Any]):
+class SnowflakePool:
     """
-    Get a persistent Snowflake connection, creating one only if needed.
-    Reuses the same connection across all operations to avoid repeated SSO prompts.
-    Skips the SELECT 1 health check if the connection was verified within _SF_CONN_TTL seconds.
+    Bounded pool of Snowflake connections.
+
+    Checkouts block (up to acquire_timeout) once max_size connections are in use.
+    A connection idle for longer than health_check_after is pinged with SELECT 1 on
+    checkout; idle connections past idle_timeout and any past max_lifetime are
+    closed instead of reused. New connections are opened one at a time, so only the
+    first one can trigger an SSO prompt; later ones reuse the cached token.
     """
-    global _sf_conn, _sf_config_hash, _sf_conn_verified_at
 
-    try:
-        from snowflake import connector
-    except ImportError:
-        raise ImportError(
-            "snowflake-connector-python not installed. "
-            "Install with: pip install snowflake-connector-python"
-        )
+    def __init__(self, connect, max_size: int = 4, health_check_after: float = 60.0,
+                 idle_timeout: float = 600.0, max_lifetime: float = 3600.0,
+                 acquire_timeout: float = 60.0):
+        self._connect = connect
+        self.max_size = max_size
+        self.health_check_after = health_check_after
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.acquire_timeout = acquire_timeout
+        self._cond = threading.Condition(threading.Lock())
+        self._connect_lock = threading.Lock()
+        self._idle: List[dict] = []   # [{conn, created, last_used}], most recently used last
+        self._in_use = 0
+        self.metrics = {
+            'checkouts': 0, 'waits': 0, 'wait_seconds': 0.0, 'created': 0,
+            'closed': 0, 'health_checks': 0, 'failures': 0,
+        }
 
-    conn_params = _build_conn_params(config)
-    config_hash = str(sorted(conn_params.items()))
+    @staticmethod
+    def _close(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        return (now - entry['created'] > self.max_lifetime
+                or now - entry['last_used'] > self.idle_timeout)
+
+    def _acquire(self) -> dict:
+        """Reserve a slot and return an idle entry, or {} if a new connection is needed."""
+        deadline = time.monotonic() + self.acquire_timeout
+        waited_from = None
+        expired = []
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._idle:
+                    entry = self._idle.pop()
+                    if self._expired(entry, now):
+                        expired.append(entry)
+                        continue
+                    self._in_use += 1
+                    break
+                else:
+                    entry = None
+                if entry is not None:
+                    break
+                if self._in_use < self.max_size:
+                    self._in_use += 1
+                    entry = {}
+                    break
+                if waited_from is None:
+                    waited_from = now
+                    self.metrics['waits'] += 1
+                if not self._cond.wait(timeout=max(deadline - now, 0)) and time.monotonic() >= deadline:
+                    self.metrics['failures'] += 1
+                    raise TimeoutError(f'No Snowflake connection free after {self.acquire_timeout:g}s '
+                                       f'({self.max_size} in use)')
+            self.metrics['checkouts'] += 1
+            self.metrics['closed'] += len(expired)
+            if waited_from is not None:
+                self.metrics['wait_seconds'] += time.monotonic() - waited_from
+        for old in expired:
+            self._close(old['conn'])
+        return entry
+
+    def _release(self, entry: Optional[dict], reuse: bool) -> None:
+        now = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            if entry and reuse and now - entry['created'] <= self.max_lifetime:
+                entry['last_used'] = now
+                self._idle.append(entry)
+                entry = None
+            elif entry:
+                self.metrics['closed'] += 1
+            self._cond.notify()
+        if entry:
+            self._close(entry['conn'])
+
+    def _healthy(self, entry: dict) -> bool:
+        if time.monotonic() - entry['last_used'] < self.health_check_after:
+            return True
+        with self._cond:
+            self.metrics['health_checks'] += 1
+        try:
+            if entry['conn'].is_closed():
+                return False
+            entry['conn'].cursor().execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def _open(self) -> dict:
+        with self._connect_lock:
+            conn = self._connect()
+        now = time.monotonic()
+        with self._cond:
+            self.metrics['created'] += 1
+        return {'conn': conn, 'created': now, 'last_used': now}
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block. On error the open
+        transaction is rolled back; a connection that can't roll back is discarded."""
+        entry = self._acquire()
+        try:
+            if entry and not self._healthy(entry):
+                with self._cond:
+                    self.metrics['failures'] += 1
+                    self.metrics['closed'] += 1
+                self._close(entry['conn'])
+                entry = {}
+            if not entry:
+                entry = self._open()
+        except Exception:
+            with self._cond:
+                self.metrics['failures'] += 1
+            self._release(None, reuse=False)
+            raise
 
-    # Reuse existing connection if same config
-    if _sf_conn is not None and _sf_config_hash == config_hash:
-        # Skip health check if recently verified
-        if (time.time() - _sf_conn_verified_at) < _SF_CONN_TTL:
-            return _sf_conn
-        # Otherwise verify with SELECT 1
+        reuse = True
         try:
-            _sf_conn.cursor().execute("SELECT 1")
-            _sf_conn_verified_at = time.time()
-            return _sf_conn
+            yield entry['conn']
         except Exception:
-            # Connection is dead — reconnect
             try:
-                _sf_conn.close()
+                entry['conn'].rollback()
             except Exception:
-                pass
-            _sf_conn = None
-
-    _sf_conn = connector.connect(**conn_params)
-    _sf_config_hash = config_hash
-    _sf_conn_verified_at = time.time()
-    return _sf_conn
+                reuse = False
+            raise
+        finally:
+            self._release(entry, reuse)
+
+    def close_all(self) -> None:
+        """Close idle connections; checked-out ones close when returned past max_lifetime."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self.metrics['closed'] += len(idle)
+        for entry in idle:
+            self._close(entry['conn'])
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(self.metrics, in_use=self._in_use, idle=len(self._idle),
+                        max_size=self.max_size, wait_seconds=round(self.metrics['wait_seconds'], 3))
+
+
+def get_snowflake_pool(config: Dict[str, Any]) -> SnowflakePool:
+    """The connection pool for this config, created on first use."""
+    conn_params = _build_conn_params(config)
+    config_hash = str(sorted(conn_params.items()))
+    with _sf_pools_lock:
+        pool = _sf_pools.get(config_hash)
+        if pool is None:
+            def connect():
+                try:
+                    from snowflake import connector
+                except ImportError:
+                    raise ImportError(
+                        "snowflake-connector-python not installed. "
+                        "Install with: pip install snowflake-connector-python"
+                    )
+                return connector.connect(**conn_params)
+            pool = SnowflakePool(connect, max_size=_SF_POOL_SIZE)
+            _sf_pools[config_hash] = pool
+        return pool
+
+
+def snowflake_connection(config: Dict[str, Any]):
+    """Context manager: `with snowflake_connection(config) as conn:` checks out a pooled connection."""
+    return get_snowflake_pool(config).connection()
+
+
+def snowflake_pool_stats() -> list:
+    """Metrics for every connection pool, for diagnostics."""
+    with _sf_pools_lock:
+        pools = list(_sf_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+def read_table_chunked(conn, table: str, report: ProgressCallback) -> pd.DataFrame:
+    """SELECT * in chunks over a DB-API connection, reporting rows fetched so far."""
+    with metrics.span('load.count'):
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        total = cursor.fetchone()[0]
+    report('querying', 0, total)
+    chunks = []
+    loaded = 0
+    with metrics.span('load.fetch'):
+        for chunk in pd.read_sql_query(f"SELECT * FROM {table}", conn, chunksize=_LOAD_CHUNK_ROWS):
+            chunks.append(chunk)
+            loaded += len(chunk)
+            report('fetching', loaded, total)
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
 
 
 class DataSource:
     """Data source that returns consistent DataFrame structure"""
 
     @staticmethod
-    def load_from_snowflake(config: Dict[str, Any]) -> pd.DataFrame:
+    def load_from_snowflake(config: Dict[str, Any], progress: Optional[ProgressCallback] = None) -> pd.DataFrame:
         """
         Load data from Snowflake.
 
         Args:
             config: Dict with account, user, password, database, schema, table, warehouse keys
+            progress: Optional callback(phase, rows_loaded, rows_total) for load status reporting
 
         Returns:
             DataFrame with import_merge_matches data
+
+        Connection and query errors propagate, so the load is reported as failed
+        (and retried) rather than served as an empty table.
         """
         table = config.get('table', 'import_merge_matches')
-        conn = get_snowflake_connection(config)
-        try:
-            df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+        report = progress or (lambda phase, rows_loaded=None, rows_total=None: None)
+        report('connecting')
+        with snowflake_connection(config) as conn:
+            df = read_table_chunked(conn, table, report)
+        report('normalizing', len(df))
+        with metrics.span('load.normalize'):
             # Snowflake uppercases column names by default — normalize to lowercase
             df.columns = df.columns.str.lower()
             return DataSource._normalize_dataframe(df)
-        except Exception as e:
-            print(f"Error loading from Snowflake: {e}")
-            return pd.DataFrame()
 
     @staticmethod
     def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
@@ -177,39 +366,63 @@ def ensure_snowflake_schema(config: Dict[str, Any]) -> None:
     Ensure Snowflake tables have all required columns and the UPDATE_LOG table exists.
     """
     table = config.get('table', 'import_merge_matches').upper()
-    conn = get_snowflake_connection(config)
-    cursor = conn.cursor()
-
-    # Check existing columns on main table
-    cursor.execute(f"DESCRIBE TABLE {table}")
-    existing_cols = {row[0].lower() for row in cursor.fetchall()}
-
-    # Add missing columns
-    needed = {
-        'jib': 'NUMBER DEFAULT 0',
-        'rev': 'NUMBER DEFAULT 0',
-        'vendor': 'NUMBER DEFAULT 0',
-        'memo': "VARCHAR DEFAULT ''",
-        'how_to_process': "VARCHAR DEFAULT ''",
-    }
-    for col, col_type in needed.items():
-        if col not in existing_cols:
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col.upper()} {col_type}")
-
-    # Ensure UPDATE_LOG table exists
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS UPDATE_LOG (
-            ID NUMBER AUTOINCREMENT,
-            CANVAS_ID VARCHAR,
-            CANVAS_SSN VARCHAR,
-            FIELD_NAME VARCHAR,
-            OLD_VALUE VARCHAR,
-            NEW_VALUE VARCHAR,
-            UPDATED_AT TIMESTAMP_NTZ,
-            CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
-        )
-    """)
-    conn.commit()
+    with snowflake_connection(config) as conn:
+        cursor = conn.cursor()
+
+        # Check existing columns on main table
+        cursor.execute(f"DESCRIBE TABLE {table}")
+        existing_cols = {row[0].lower() for row in cursor.fetchall()}
+
+        # Add missing columns
+        needed = {
+            'jib': 'NUMBER DEFAULT 0',
+            'rev': 'NUMBER DEFAULT 0',
+            'vendor': 'NUMBER DEFAULT 0',
+            'memo': "VARCHAR DEFAULT ''",
+            'how_to_process': "VARCHAR DEFAULT ''",
+        }
+        for col, col_type in needed.items():
+            if col not in existing_cols:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col.upper()} {col_type}")
+
+        # Ensure UPDATE_LOG table exists
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS UPDATE_LOG (
+                ID NUMBER AUTOINCREMENT,
+                CANVAS_ID VARCHAR,
+                CANVAS_SSN VARCHAR,
+                FIELD_NAME VARCHAR,
+                OLD_VALUE VARCHAR,
+                NEW_VALUE VARCHAR,
+                UPDATED_AT TIMESTAMP_NTZ,
+                CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+            )
+        """)
+        conn.commit()
+
+
+def merge_source_rows(pending_changes: Dict[int, Dict[str, Any]],
+                      df: pd.DataFrame) -> Tuple[List[str], List[list]]:
+    """
+    Flatten pending changes into MERGE source rows.
+
+    Returns (fields, rows): the sorted union of edited fields, and one
+    [canvas_id, canvas_ssn, value per field] row per changed record, None where
+    that record's field was not edited.
+    """
+    all_fields = set()
+    for fields in pending_changes.values():
+        all_fields.update(fields.keys())
+    all_fields = sorted(all_fields)
+
+    rows = []
+    for row_id, fields in pending_changes.items():
+        row = [str(df.at[row_id, 'canvas_id']), str(df.at[row_id, 'canvas_ssn'])]
+        for f in all_fields:
+            entry = fields.get(f)
+            row.append(entry[1] if isinstance(entry, tuple) else entry)
+        rows.append(row)
+    return all_fields, rows
 
 
 def merge_changes_to_snowflake(
@@ -234,41 +447,24 @@ def merge_changes_to_snowflake(
         return 0
 
     table = config.get('table', 'import_merge_matches').upper()
-
-    # Collect all fields being updated across all rows
-    all_fields = set()
-    for fields in pending_changes.values():
-        all_fields.update(fields.keys())
-    all_fields = sorted(all_fields)
+    all_fields, rows = merge_source_rows(pending_changes, df)
 
     # Build value rows and flat params for a single MERGE
-    placeholders = []
-    params: list = []
-    for row_id, fields in pending_changes.items():
-        cid = str(df.at[row_id, 'canvas_id'])
-        ssn = str(df.at[row_id, 'canvas_ssn'])
-        row_ph = ['%s', '%s']
-        params.extend([cid, ssn])
-        for f in all_fields:
-            entry = fields.get(f)
-            if isinstance(entry, tuple):
-                params.append(entry[1])
-            elif entry is not None:
-                params.append(entry)
-            else:
-                params.append(None)
-            row_ph.append('%s')
-        placeholders.append('(' + ', '.join(row_ph) + ')')
-
-    own_cursor = cursor is None
-    if own_cursor:
-        conn = get_snowflake_connection(config)
-        cursor = conn.cursor()
-
-    # Single MERGE: all rows in one statement
+    row_ph = '(' + ', '.join(['%s'] * (len(all_fields) + 2)) + ')'
+    placeholders = [row_ph] * len(rows)
+    params = [value for row in rows for value in row]
+
+    if cursor is None:
+        with snowflake_connection(config) as conn:
+            affected = merge_changes_to_snowflake(config, pending_changes, df, cursor=conn.cursor())
+            conn.commit()
+        return affected
+
+    # Single MERGE: all rows in one statement. A row only carries the fields edited on
+    # it; the others are NULL in the source and must keep their current value.
     src_cols = ['CID', 'SSN'] + [f.upper() for f in all_fields]
     values_block = ', '.join(placeholders)
-    set_clause = ', '.join(f't.{f.upper()} = s.{f.upper()}' for f in all_fields)
+    set_clause = ', '.join(f't.{f.upper()} = COALESCE(s.{f.upper()}, t.{f.upper()})' for f in all_fields)
 
     sql = (
         f"MERGE INTO {table} t USING ("
@@ -279,10 +475,7 @@ def merge_changes_to_snowflake(
     )
 
     cursor.execute(sql, params)
-    affected = cursor.rowcount
-    if own_cursor:
-        conn.commit()
-    return affected
+    return cursor.rowcount
 
 
 def write_audit_log_to_snowflake(
@@ -301,43 +494,140 @@ def write_audit_log_to_snowflake(
     if not log_entries:
         return
 
-    own_cursor = cursor is None
-    if own_cursor:
-        conn = get_snowflake_connection(config)
-        cursor = conn.cursor()
+    if cursor is None:
+        with snowflake_connection(config) as conn:
+            write_audit_log_to_snowflake(config, log_entries, cursor=conn.cursor())
+            conn.commit()
+        return
+
     cursor.executemany(
         """INSERT INTO UPDATE_LOG (CANVAS_ID, CANVAS_SSN, FIELD_NAME, OLD_VALUE, NEW_VALUE, UPDATED_AT)
            VALUES (%s, %s, %s, %s, %s, %s)""",
         log_entries
     )
-    if own_cursor:
-        conn.commit()
 
 
 def read_audit_log_from_snowflake(config: Dict[str, Any], limit: int = 100) -> list:
     """Read recent audit log entries from Snowflake."""
     from snowflake import connector as sf_connector
-    conn = get_snowflake_connection(config)
-    cursor = conn.cursor(sf_connector.DictCursor)
-    cursor.execute(f"SELECT * FROM UPDATE_LOG ORDER BY UPDATED_AT DESC LIMIT {limit}")
-    rows = cursor.fetchall()
+    with snowflake_connection(config) as conn:
+        cursor = conn.cursor(sf_connector.DictCursor)
+        cursor.execute(f"SELECT * FROM UPDATE_LOG ORDER BY UPDATED_AT DESC LIMIT {limit}")
+        rows = cursor.fetchall()
     # Lowercase keys for consistency with frontend expectations
     return [{k.lower(): v for k, v in row.items()} for row in rows]
 
 
-def load_data(config: Dict[str, Any]) -> pd.DataFrame:
+class DataBackend(ABC):
+    """
+    Storage operations the app needs from a data source.
+
+    Writes that must commit together (MERGE + audit log on save) run inside
+    transaction(), which yields a handle to pass as tx= and commits when the
+    block exits cleanly. A backend that leaves an operation out can't be constructed.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+    @abstractmethod
+    def load(self, progress: Optional[ProgressCallback] = None) -> pd.DataFrame:
+        """The normalized match table."""
+
+    @abstractmethod
+    def ensure_schema(self) -> None:
+        """Verify the table and create what the app writes to (review columns, UPDATE_LOG)."""
+
+    @abstractmethod
+    def transaction(self):
+        """Context manager yielding a handle for tx=; commits when the block exits cleanly."""
+
+    @abstractmethod
+    def merge_changes(self, pending_changes: Dict[int, Dict[str, Any]], df: pd.DataFrame, tx=None) -> int:
+        """Write edited fields back to the table; returns the number of rows updated."""
+
+    @abstractmethod
+    def write_audit_log(self, log_entries: List[Tuple], tx=None) -> None:
+        """Append (canvas_id, ssn, field, old, new, timestamp) rows to UPDATE_LOG."""
+
+    @abstractmethod
+    def read_audit_log(self, limit: int = 100) -> list:
+        """Most recent UPDATE_LOG rows, newest first."""
+
+    @abstractmethod
+    def read_config(self, category: str) -> Dict[str, str]:
+        """{CONFIG_KEY: CONFIG_VALUE} rows of one BA_CONFIG category."""
+
+    def stats(self) -> dict:
+        return {'source_type': self.config.get('source_type')}
+
+
+class SnowflakeBackend(DataBackend):
+    """The production warehouse, via the pooled connections above."""
+
+    def load(self, progress=None):
+        return DataSource.load_from_snowflake(self.config, progress=progress)
+
+    def ensure_schema(self):
+        ensure_snowflake_schema(self.config)
+
+    @contextmanager
+    def transaction(self):
+        with snowflake_connection(self.config) as conn:
+            yield conn.cursor()
+            conn.commit()
+
+    def merge_changes(self, pending_changes, df, tx=None):
+        return merge_changes_to_snowflake(self.config, pending_changes, df, cursor=tx)
+
+    def write_audit_log(self, log_entries, tx=None):
+        write_audit_log_to_snowflake(self.config, log_entries, cursor=tx)
+
+    def read_audit_log(self, limit=100):
+        return read_audit_log_from_snowflake(self.config, limit=limit)
+
+    def read_config(self, category):
+        with snowflake_connection(self.config) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT CONFIG_KEY, CONFIG_VALUE FROM BA_CONFIG WHERE CATEGORY = %s", (category,))
+            return {r[0]: r[1] for r in cursor.fetchall()}
+
+    def stats(self):
+        return dict(super().stats(), pools=snowflake_pool_stats())
+
+
+_backends: Dict[str, DataBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(config: Dict[str, Any]) -> DataBackend:
+    """The backend for config['source_type'] ('snowflake' or 'sqlite'), one instance per config."""
+    source_type = config.get('source_type', 'snowflake').lower()
+    key = str(sorted((k, str(v)) for k, v in config.items()))
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            if source_type == 'snowflake':
+                backend = SnowflakeBackend(config)
+            elif source_type == 'sqlite':
+                from sqlite_backend import SQLiteBackend
+                backend = SQLiteBackend(config)
+            else:
+                raise ValueError(f"Unknown source type: {source_type}. Supported: 'snowflake', 'sqlite'")
+            _backends[key] = backend
+        return backend
+
+
+def load_data(config: Dict[str, Any], progress: Optional[ProgressCallback] = None) -> pd.DataFrame:
     """
     Load data based on configuration settings.
 
     Args:
         config: Dictionary containing data source configuration
+        progress: Optional callback(phase, rows_loaded, rows_total) for load status reporting
 
     Example config:
         {'source_type': 'snowflake', 'account': '...', 'user': '...', ...}
+        {'source_type': 'sqlite', 'path': 'data/import_merge_matches.db', 'table': 'import_merge_matches'}
     """
-    source_type = config.get('source_type', 'snowflake').lower()
-
-    if source_type == 'snowflake':
-        return DataSource.load_from_snowflake(config)
-
-    raise ValueError(f"Unknown source type: {source_type}. Supported: 'snowflake'")
+    return get_backend(config).load(progress=progress)
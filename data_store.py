@@ -0,0 +1,334 @@
+"""
+Shared In-Memory Data Store
+Holds the cached match DataFrame and pending changes behind a reader/writer lock,
+with per-version snapshots that share column arrays until a column is edited, so
+long reads never block edits
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+
+class RWLock:
+    """
+    Writer-preferring reader/writer lock.
+
+    Any number of readers may hold the lock together; a writer waits for them to
+    drain and blocks new readers while it waits, so edits are never starved by a
+    steady stream of reads. Not reentrant: don't take it twice on one thread.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class Snapshot:
+    """Immutable view of the frame at one data version. Never mutate .df."""
+
+    __slots__ = ('df', 'version', 'loaded_at', 'epoch')
+
+    def __init__(self, df: pd.DataFrame, version: int, loaded_at: Optional[datetime], epoch: str = ''):
+        self.df = df
+        self.version = version
+        self.loaded_at = loaded_at
+        self.epoch = epoch
+
+
+class DataStore:
+    """
+    The live DataFrame, its pending changes and derived running stats.
+
+    Edits go through write(columns): the yielded frame is mutated in place under the
+    write lock and record_pending() bumps the data version. Readers that do real
+    work (filtering, serializing the whole table) call snapshot(), a shallow frame
+    sharing the live column arrays, then run lock-free. Copy-on-write is per column:
+    write() first gives the live frame its own copy of each named column still shared
+    with the latest snapshot, so an edit costs one column copy at most, not the table.
+    Small reads of pending/stats state use read().
+    """
+
+    def __init__(self, loader: Callable[[], pd.DataFrame],
+                 stats_builder: Optional[Callable[[pd.DataFrame], Any]] = None,
+                 on_load: Optional[Callable[[pd.DataFrame], None]] = None,
+                 copy_snapshots: bool = True, change_log_size: int = 100_000):
+        self._loader = loader
+        self._stats_builder = stats_builder
+        self._on_load = on_load
+        # Replicas that only ever swap whole frames can share them with readers as-is
+        self._copy_snapshots = copy_snapshots
+        self.lock = RWLock()
+        self._load_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: Optional[Snapshot] = None
+        # Live columns whose arrays the latest snapshot still shares
+        self._shared_columns: Set[str] = set()
+
+        self.df: Optional[pd.DataFrame] = None
+        self.loaded_at: Optional[datetime] = None
+        self.version = 0
+        # Names the sequence data versions belong to; they only compare within one epoch
+        self.epoch = ''
+        # Unsaved changes: {row_id: {field: (old_value, new_value), ...}, ...}
+        self.pending: Dict[Any, Dict[str, tuple]] = {}
+        self.stats = None
+        # (version, row_id) per edit since the last load, for clients catching up from an
+        # older version; changed_since() can answer from _change_log_floor onwards
+        self._change_log = deque(maxlen=change_log_size)
+        self._change_log_floor = 0
+
+        # Load progress for /api/load_status
+        self._status_lock = threading.Lock()
+        self._status = {'state': 'idle', 'phase': None, 'rows_loaded': None, 'rows_total': None,
+                        'started_at': None, 'finished_at': None, 'error': None}
+        self._load_thread: Optional[threading.Thread] = None
+        self._failed_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once a frame is available (a reload in progress keeps serving the old one)."""
+        return self.df is not None
+
+    # ── Loading ──
+    def ensure_loaded(self, force: bool = False) -> None:
+        """
+        Load the frame on first use (or reload when forced). The slow fetch runs
+        outside the RW lock; only the swap takes the write lock. A reload discards
+        pending changes, since their row ids refer to the previous frame.
+        """
+        if self.df is not None and not force:
+            return
+        with self._load_lock:
+            if self.df is not None and not force:
+                return
+            self._set_status(state='loading', phase='starting', rows_loaded=None, rows_total=None,
+                             started_at=datetime.now().isoformat(timespec='seconds'),
+                             finished_at=None, error=None)
+            try:
+                df = self._loader()
+                epoch = None
+                if self._on_load:
+                    # on_load may name the epoch (the writer uses its published frame's)
+                    self.report_progress('publishing', len(df))
+                    epoch = self._on_load(df)
+                self.report_progress('indexing', len(df))
+                self.replace(df, epoch=epoch)
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                self._set_status(state='error', error=str(e),
+                                 finished_at=datetime.now().isoformat(timespec='seconds'))
+                raise
+            self._failed_at = None
+            self._set_status(state='ready', phase=None, rows_loaded=len(df),
+                             finished_at=datetime.now().isoformat(timespec='seconds'))
+
+    def load_in_background(self, force: bool = False, retry_after: float = 30.0) -> bool:
+        """
+        Start ensure_loaded() on a daemon thread so the server can answer while the
+        frame loads. No-op if a load is already running (on any thread), or if the
+        last one failed less than retry_after seconds ago. Returns True if a load was started.
+        """
+        with self._status_lock:
+            if self._status['state'] == 'loading':
+                return False
+            if not force and self.df is not None:
+                return False
+            if self._failed_at is not None and time.monotonic() - self._failed_at < retry_after:
+                return False
+
+            def run():
+                try:
+                    self.ensure_loaded(force=force)
+                except Exception as e:
+                    print(f"  Background load failed: {e}")
+
+            self._load_thread = threading.Thread(target=run, name='data-load', daemon=True)
+            self._load_thread.start()
+            return True
+
+    def _set_status(self, **fields) -> None:
+        with self._status_lock:
+            self._status.update(fields)
+
+    def report_progress(self, phase: str, rows_loaded: Optional[int] = None,
+                        rows_total: Optional[int] = None) -> None:
+        """Loader progress callback: phase name plus optional row counts."""
+        fields = {'phase': phase}
+        if rows_loaded is not None:
+            fields['rows_loaded'] = rows_loaded
+        if rows_total is not None:
+            fields['rows_total'] = rows_total
+        self._set_status(**fields)
+
+    def load_status(self) -> Dict[str, Any]:
+        """Copy of the load progress, plus whether a frame is being served."""
+        with self._status_lock:
+            status = dict(self._status)
+        status['ready'] = self.ready
+        status['version'] = self.version
+        return status
+
+    def replace(self, df: pd.DataFrame, pending: Optional[Dict[Any, Dict[str, tuple]]] = None,
+                version: Optional[int] = None, epoch: Optional[str] = None) -> None:
+        """Swap in a whole new frame (and its pending changes) as a new version. A replica
+        passes the version and epoch it follows; otherwise the version is the next one and
+        the load starts a new epoch."""
+        stats = self._stats_builder(df) if self._stats_builder else None
+        self.lock.acquire_write()
+        try:
+            self.df = df
+            self._shared_columns = set()
+            self.stats = stats
+            self.loaded_at = datetime.now()
+            self.epoch = epoch or f"{self.loaded_at:%Y%m%d%H%M%S%f}"
+            self.pending = pending or {}
+            self.version = self.version + 1 if version is None else version
+            self._change_log.clear()
+            self._change_log_floor = self.version
+        finally:
+            self.lock.release_write()
+
+    # ── Locking ──
+    @contextmanager
+    def read(self):
+        """Shared access to the live frame; keep the body short."""
+        self.ensure_loaded()
+        self.lock.acquire_read()
+        try:
+            yield self.df
+        finally:
+            self.lock.release_read()
+
+    @contextmanager
+    def write(self, columns: Optional[Iterable[str]] = None):
+        """Exclusive access to the live frame for in-place edits of `columns` (the body
+        must not modify any other column; leave it None for bodies that only read)."""
+        self.ensure_loaded()
+        self.lock.acquire_write()
+        try:
+            if columns is not None:
+                self._unshare(columns)
+            yield self.df
+        finally:
+            self.lock.release_write()
+
+    def _unshare(self, columns: Iterable[str]) -> None:
+        """Copy live columns the latest snapshot shares before they are edited (write lock held)."""
+        for col in columns:
+            if col in self._shared_columns:
+                self.df[col] = self.df[col].copy()
+                self._shared_columns.discard(col)
+
+    def snapshot(self) -> Snapshot:
+        """Copy-on-write snapshot of the current version, shared by all readers of that version."""
+        self.ensure_loaded()
+        snap = self._snapshot
+        if snap is not None and snap.version == self.version and snap.epoch == self.epoch:
+            return snap
+        with self._snapshot_lock:
+            snap = self._snapshot
+            if snap is not None and snap.version == self.version and snap.epoch == self.epoch:
+                return snap
+            self.lock.acquire_read()
+            try:
+                if self._copy_snapshots:
+                    # New frame over the same column arrays; write() copies a column
+                    # before its first edit so this snapshot never sees the change
+                    df = self.df.copy(deep=False)
+                    self._shared_columns = set(self.df.columns)
+                else:
+                    df = self.df
+                snap = Snapshot(df, self.version, self.loaded_at, self.epoch)
+            finally:
+                self.lock.release_read()
+            self._snapshot = snap
+            return snap
+
+    # ── Pending changes (caller holds the write lock) ──
+    def _log_change(self, row_id) -> None:
+        if len(self._change_log) == self._change_log.maxlen:
+            # The oldest entry drops out; versions before it can no longer be caught up
+            self._change_log_floor = self._change_log[0][0]
+        self._change_log.append((self.version, row_id))
+
+    def record_pending(self, row_id, field: str, old_value, new_value) -> None:
+        """Track a deferred change, keeping the original old_value from the first edit this session."""
+        self.version += 1
+        self._log_change(row_id)
+        if row_id not in self.pending:
+            self.pending[row_id] = {}
+        if field not in self.pending[row_id]:
+            self.pending[row_id][field] = (str(old_value), new_value)
+        else:
+            orig_old = self.pending[row_id][field][0]
+            self.pending[row_id][field] = (orig_old, new_value)
+
+    def advance(self, df: pd.DataFrame, pending: Dict[Any, Dict[str, tuple]], row_ids,
+                version: Optional[int] = None) -> None:
+        """Swap in a frame that differs from the current one only in `row_ids` (a replica
+        catching up with edits made elsewhere, at the writer's `version`) as a new version
+        of the same load: the rows go into the change log and running stats are left to
+        the caller."""
+        self.df = df
+        self._shared_columns = set(df.columns)
+        self.pending = pending
+        self.version = self.version + 1 if version is None else max(version, self.version + 1)
+        for row_id in dict.fromkeys(row_ids):
+            self._log_change(row_id)
+
+    def changed_since(self, version: int) -> Optional[List[Any]]:
+        """Row ids edited after `version` of the current load (caller holds a lock), or
+        None when that version predates the load or the change log."""
+        if version < self._change_log_floor or version > self.version:
+            return None
+        return sorted({row_id for v, row_id in self._change_log if v > version})
+
+    def take_pending(self) -> Dict[Any, Dict[str, tuple]]:
+        """Detach the pending changes for saving; new edits start a fresh batch."""
+        taken = self.pending
+        self.pending = {}
+        self.version += 1
+        return taken
+
+    def restore_pending(self, changes: Dict[Any, Dict[str, tuple]]) -> None:
+        """Put back a batch whose save failed, keeping any newer value edited meanwhile."""
+        self.version += 1
+        for row_id, fields in changes.items():
+            current = self.pending.setdefault(row_id, {})
+            for field, (old_value, new_value) in fields.items():
+                if field in current:
+                    current[field] = (old_value, current[field][1])
+                else:
+                    current[field] = (old_value, new_value)
@@ -0,0 +1,221 @@
+"""
+Table Export
+Streams a frame as CSV, XLSX, Parquet or Arrow IPC in row chunks so large exports never
+build the whole file in memory (or in the browser); used by /api/export
+"""
+import tempfile
+import zlib
+from typing import Collection, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+# Rows serialized per chunk of the response
+EXPORT_CHUNK_ROWS = 50_000
+
+# Sheet limit, header row included
+XLSX_MAX_ROWS = 1_048_576
+
+# Disk spill threshold for XLSX (the zip container can only be written once complete)
+_XLSX_SPOOL_BYTES = 32 * 1024 * 1024
+_READ_BLOCK = 1024 * 1024
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+}
+
+# Typed formats (pyarrow); they also carry a DIRTY_COLUMN flag per row
+ARROW_FORMATS = ('parquet', 'arrow')
+DIRTY_COLUMN = 'dirty'
+
+
+def iter_chunks(df: pd.DataFrame, columns: List[str], rows: Optional[pd.Index] = None,
+                chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """The selected columns in chunks: all rows in frame order, or the `rows` labels in
+    their order. Each chunk is a small copy, never the whole selection."""
+    chunk_rows = chunk_rows or EXPORT_CHUNK_ROWS
+    total = len(df) if rows is None else len(rows)
+    for start in range(0, total, chunk_rows):
+        if rows is None:
+            yield df.iloc[start:start + chunk_rows][columns]
+        else:
+            yield df.loc[rows[start:start + chunk_rows], columns]
+
+
+def iter_csv(df: pd.DataFrame, columns: List[str], rows: Optional[pd.Index] = None) -> Iterator[bytes]:
+    """CSV header, then one encoded block per chunk of rows."""
+    yield df.iloc[:0][columns].to_csv(index=False).encode('utf-8')
+    for chunk in iter_chunks(df, columns, rows):
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+
+def iter_xlsx(df: pd.DataFrame, columns: List[str], rows: Optional[pd.Index] = None) -> Iterator[bytes]:
+    """XLSX built with openpyxl's write-only workbook (rows go to a temp file as they are
+    appended), then streamed from a spooled file."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Matches')
+    ws.append(columns)
+    for chunk in iter_chunks(df, columns, rows):
+        # Blank cells instead of NaN; numpy scalars to Python values
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            ws.append(row)
+
+    with tempfile.SpooledTemporaryFile(max_size=_XLSX_SPOOL_BYTES) as out:
+        wb.save(out)
+        out.seek(0)
+        while True:
+            block = out.read(_READ_BLOCK)
+            if not block:
+                break
+            yield block
+
+
+class _ByteSink:
+    """Write-only file object for pyarrow writers that hands back what was written so far,
+    keeping tell() (which the writers record in their footers) counting from the start."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("pyarrow not installed (needed for Parquet/Arrow export). "
+                          "Install with: pip install pyarrow")
+
+
+def _require_openpyxl():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        raise ImportError("openpyxl not installed (needed for Excel export). "
+                          "Install with: pip install openpyxl")
+
+
+def _arrow_schema(df: pd.DataFrame, columns: List[str]):
+    """Fixed schema for every chunk: text columns as string (a chunk of all-blank values
+    would otherwise infer null), numeric/bool/datetime columns keep their dtype."""
+    import pyarrow as pa
+
+    fields = []
+    for col in columns:
+        dtype = df[col].dtype
+        if dtype == object or pd.api.types.is_string_dtype(dtype):
+            fields.append(pa.field(col, pa.string()))
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            fields.append(pa.field(col, pa.timestamp('ns')))
+        else:
+            fields.append(pa.field(col, pa.from_numpy_dtype(dtype)))
+    fields.append(pa.field(DIRTY_COLUMN, pa.bool_()))
+    return pa.schema(fields)
+
+
+def _arrow_batches(df: pd.DataFrame, columns: List[str], rows: Optional[pd.Index],
+                   dirty: Collection, schema) -> Iterator:
+    """One pyarrow Table per chunk of rows, typed by `schema`."""
+    import pyarrow as pa
+
+    text_cols = [f.name for f in schema if f.type == pa.string()]
+    dirty = pd.Index(list(dirty))
+    for chunk in iter_chunks(df, columns, rows):
+        chunk = chunk.copy()
+        for col in text_cols:
+            # Edited cells can hold non-str values; blanks stay null
+            values = chunk[col]
+            chunk[col] = values.where(values.isna(), values.astype(str))
+        chunk[DIRTY_COLUMN] = chunk.index.isin(dirty)
+        yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def iter_parquet(df: pd.DataFrame, columns: List[str], rows: Optional[pd.Index] = None,
+                 dirty: Collection = ()) -> Iterator[bytes]:
+    """Parquet with one row group per chunk; each row group is sent as soon as it is
+    written and the footer follows the last one."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(df, columns)
+    sink = _ByteSink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema) as writer:
+        for table in _arrow_batches(df, columns, rows, dirty, schema):
+            writer.write_table(table, row_group_size=len(table) or 1)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_arrow(df: pd.DataFrame, columns: List[str], rows: Optional[pd.Index] = None,
+               dirty: Collection = ()) -> Iterator[bytes]:
+    """Arrow IPC file (Feather v2; pandas.read_feather / pyarrow.ipc.open_file), one record
+    batch per chunk, streamed as it is written."""
+    import pyarrow as pa
+
+    schema = _arrow_schema(df, columns)
+    sink = _ByteSink()
+    with pa.ipc.new_file(pa.PythonFile(sink, mode='w'), schema) as writer:
+        for table in _arrow_batches(df, columns, rows, dirty, schema):
+            writer.write_table(table)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compress a stream of byte chunks on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(df: pd.DataFrame, columns: List[str], fmt: str,
+                  rows: Optional[pd.Index] = None, dirty: Collection = ()) -> Iterator[bytes]:
+    """Byte chunks of the export in the given format (see FORMATS). `dirty` holds the row
+    labels with unsaved edits, flagged in the typed formats. Raises ValueError up front for
+    an unknown format or an export the format cannot hold, ImportError when the format
+    needs pyarrow or openpyxl and it is not installed."""
+    if fmt in ARROW_FORMATS:
+        _require_pyarrow()
+        if DIRTY_COLUMN in columns:
+            raise ValueError(f'Column {DIRTY_COLUMN!r} is reserved for the unsaved-edit flag')
+        writer = iter_parquet if fmt == 'parquet' else iter_arrow
+        return writer(df, columns, rows, dirty)
+    if fmt == 'csv':
+        return iter_csv(df, columns, rows)
+    if fmt == 'xlsx':
+        _require_openpyxl()
+        if (len(df) if rows is None else len(rows)) >= XLSX_MAX_ROWS:
+            raise ValueError(f'Too many rows for an Excel sheet (limit {XLSX_MAX_ROWS - 1:,}); export CSV instead')
+        return iter_xlsx(df, columns, rows)
+    raise ValueError(f"Unknown export format {fmt!r} (expected one of: {', '.join(FORMATS)})")
@@ -0,0 +1,94 @@
+"""
+Lookup Cache
+Small TTL cache for Snowflake lookups (BA_CONFIG, UPDATE_LOG, ...) with
+negative-result caching, exponential backoff and hit/miss counters
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LookupCache:
+    """
+    TTL cache around an expensive loader.
+
+    A failed load is cached too: further calls return the last good value (or the
+    default) without touching the source until a backoff expires, and the backoff
+    doubles on each consecutive failure up to max_backoff. invalidate() drops
+    entries so the next call reloads immediately.
+    """
+
+    def __init__(self, name: str, ttl: float, backoff: float = 5.0, max_backoff: float = 300.0):
+        self.name = name
+        self.ttl = ttl
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._entries: Dict[Hashable, dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.negative_hits = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any], default: Any = None) -> Any:
+        """Return the cached value for key, calling loader() on a miss or expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry['expires']:
+                if entry['failures']:
+                    self.negative_hits += 1
+                    return entry['value'] if entry['has_value'] else default
+                self.hits += 1
+                return entry['value']
+            self.misses += 1
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                entry = self._entries.get(key) or {'value': None, 'has_value': False, 'failures': 0}
+                entry['failures'] += 1
+                delay = min(self.backoff * 2 ** (entry['failures'] - 1), self.max_backoff)
+                entry['expires'] = time.monotonic() + delay
+                entry['error'] = str(e)
+                self._entries[key] = entry
+            print(f"  {self.name} lookup failed (retry in {delay:.0f}s): {e}")
+            return entry['value'] if entry['has_value'] else default
+
+        with self._lock:
+            self._entries[key] = {
+                'value': value, 'has_value': True, 'failures': 0,
+                'expires': time.monotonic() + self.ttl, 'error': None,
+            }
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or every key when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        """Counters plus per-key state, for diagnostics."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'name': self.name,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'negative_hits': self.negative_hits,
+                'failures': self.failures,
+                'entries': {
+                    str(k): {
+                        'expires_in': round(max(e['expires'] - now, 0), 1),
+                        'failures': e['failures'],
+                        'error': e['error'],
+                    }
+                    for k, e in self._entries.items()
+                },
+            }
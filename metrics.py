@@ -0,0 +1,200 @@
+"""
+Request Metrics
+Opt-in (APP_METRICS=1) timing spans around the hot paths, exported per request as a
+Server-Timing header and in aggregate as Prometheus histograms/counters at /api/metrics
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+ENABLED = os.environ.get('APP_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Seconds; covers sub-millisecond lookups up to full-table loads
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    """Monotonic counter per label set."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels.get(n, '') for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labelnames, key)} {value:g}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set (Prometheus semantics)."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # {labels: [per-bucket counts..., +Inf count, sum]}
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(n, '') for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), series):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float('inf') else f'le="{bound:g}"'
+                    lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}')
+                lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {series[-1]:.6f}')
+                lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {cumulative}')
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    def __init__(self, name: str, help: str, read: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self) -> List[str]:
+        try:
+            value = float(self.read())
+        except Exception:
+            return []
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge', f'{self.name} {value:g}']
+
+
+class Registry:
+    """Named metrics, rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_add(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_add(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        with self._lock:
+            self._metrics[name] = Gauge(name, help, read)
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+REQUEST_SECONDS = REGISTRY.histogram('ba_review_request_duration_seconds',
+                                     'Request latency by endpoint', ('endpoint', 'method', 'status'))
+REQUESTS_TOTAL = REGISTRY.counter('ba_review_requests_total',
+                                  'Requests served by endpoint', ('endpoint', 'method', 'status'))
+STAGE_SECONDS = REGISTRY.histogram('ba_review_stage_duration_seconds',
+                                   'Time spent in instrumented stages (fetch, filter, serialize, ...)', ('stage',))
+
+# Spans of the request being handled on this thread (None outside a request)
+_local = threading.local()
+
+
+def enable(on: bool = True) -> None:
+    """Turn instrumentation on or off at runtime (APP_METRICS sets the default)."""
+    global ENABLED
+    ENABLED = on
+
+
+def start_request() -> None:
+    if not ENABLED:
+        return
+    _local.start = time.perf_counter()
+    _local.spans = []
+
+
+@contextmanager
+def span(stage: str):
+    """Time a stage; recorded in the stage histogram and the current request's Server-Timing."""
+    if not ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        spans = getattr(_local, 'spans', None)
+        if spans is not None:
+            spans.append((stage, elapsed))
+
+
+def finish_request(endpoint: str, method: str, status: int) -> Optional[str]:
+    """Record the request and return its Server-Timing header value (None when disabled)."""
+    start = getattr(_local, 'start', None)
+    spans = getattr(_local, 'spans', None)
+    _local.start = _local.spans = None
+    if not ENABLED or start is None:
+        return None
+    total = time.perf_counter() - start
+    REQUEST_SECONDS.observe(total, endpoint=endpoint, method=method, status=status)
+    REQUESTS_TOTAL.inc(endpoint=endpoint, method=method, status=status)
+    entries = [f'{stage};dur={elapsed * 1000:.1f}' for stage, elapsed in spans or ()]
+    entries.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(entries)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return REGISTRY.render()
@@ -0,0 +1,78 @@
+"""
+Record Cache
+Serialized /api/record field groups per row, kept until the row is edited (tracked
+through the DataStore change log) or the table is reloaded
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class RecordCache:
+    """
+    LRU of JSON fragments keyed by row id, then field group.
+
+    sync() runs with the store's lock held before each lookup: it drops the rows edited
+    since the previous sync (DataStore.changed_since), or everything when the change
+    log can't tell (reload, log overflow). Lookups made under the same lock therefore
+    never return a row older than the frame they are read against.
+    """
+
+    def __init__(self, name: str, max_rows: int = 20_000):
+        self.name = name
+        self.max_rows = max_rows
+        self._rows: 'OrderedDict[Hashable, Dict[str, str]]' = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def sync(self, store) -> None:
+        """Forget rows changed since the last sync (caller holds the store's lock)."""
+        version = store.version
+        with self._lock:
+            if self._version == version:
+                return
+            changed = store.changed_since(self._version) if self._version is not None else None
+            if changed is None:
+                self._rows.clear()
+            else:
+                for row_id in changed:
+                    self._rows.pop(row_id, None)
+            self._version = version
+
+    def get(self, row_id: Hashable, group: str) -> Optional[str]:
+        with self._lock:
+            groups = self._rows.get(row_id)
+            fragment = groups.get(group) if groups is not None else None
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._rows.move_to_end(row_id)
+            self.hits += 1
+            return fragment
+
+    def put(self, row_id: Hashable, group: str, fragment: str) -> None:
+        with self._lock:
+            groups = self._rows.get(row_id)
+            if groups is None:
+                groups = self._rows[row_id] = {}
+            else:
+                self._rows.move_to_end(row_id)
+            groups[group] = fragment
+            while len(self._rows) > self.max_rows:
+                self._rows.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'name': self.name,
+                'rows': len(self._rows),
+                'max_rows': self.max_rows,
+                'version': self._version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,1703 @@
+"""
+Routes and Shared State
+API endpoints and the cached match data behind them, registered on the app by
+app.create_app(). Importing this module pulls in pandas; nothing touches
+Snowflake until the first load.
+"""
+from flask import Blueprint, render_template, request, jsonify, Response
+from werkzeug.datastructures import MultiDict
+import os
+import pandas as pd
+import json
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+from collections import OrderedDict
+from contextlib import nullcontext
+import threading
+import urllib.request
+import urllib.error
+
+from data_loader import load_data, get_backend
+from bucket_engine import BucketEngine, BUCKET_ORDER, parse_thresholds
+from lookup_cache import LookupCache
+from record_cache import RecordCache
+from detail_store import DetailStore, DETAIL_COLUMNS
+from cluster_engine import ClusterEngine, CLUSTER_KEYS
+from data_store import DataStore
+from shared_frame import FrameReplica, publish_frame, publish_overlay
+import metrics
+import exporter
+
+bp = Blueprint('main', __name__)
+
+
+@bp.after_app_request
+def add_no_cache_headers(response):
+    """Prevent browser from caching API responses"""
+    if request.path.startswith('/api/'):
+        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+    return response
+
+# Build the data source config from .env (all connection info lives in environment
+# variables; app.create_app() loads .env before importing this module).
+# DATA_SOURCE_TYPE=sqlite runs against a local file instead of Snowflake.
+_SOURCE_TYPE = os.environ.get('DATA_SOURCE_TYPE', 'snowflake').lower()
+DATA_CONFIG = {
+    'source_type': _SOURCE_TYPE,
+    'name': 'SQLite (local)' if _SOURCE_TYPE == 'sqlite' else 'Snowflake (Cloud)',
+    'path': os.environ.get('SQLITE_PATH', 'data/import_merge_matches.db'),
+    'account': os.environ.get('SNOWFLAKE_ACCOUNT', ''),
+    'user': os.environ.get('SNOWFLAKE_USER', ''),
+    'password': os.environ.get('SNOWFLAKE_PASSWORD', ''),
+    'database': os.environ.get('SNOWFLAKE_DATABASE', 'dgo_ma'),
+    'schema': os.environ.get('SNOWFLAKE_SCHEMA', 'ba_process'),
+    'warehouse': os.environ.get('SNOWFLAKE_WAREHOUSE', ''),
+    'table': os.environ.get('SNOWFLAKE_TABLE', 'import_merge_matches'),
+}
+
+# Snowflake lookups: BA_CONFIG score ranges change rarely; the audit log only on save
+_ba_config_cache = LookupCache('BA_CONFIG', ttl=600)
+_audit_log_cache = LookupCache('UPDATE_LOG', ttl=30)
+
+# Memoized /api/stats/grouped results for the current data version, keyed by filter signature
+_grouped_stats_memo = OrderedDict()
+_grouped_stats_lock = threading.Lock()
+_GROUPED_STATS_MEMO_MAX = 64
+
+# Filtered + sorted row order behind /api/matches for the current data version, keyed by
+# query, so the grid's consecutive block requests don't re-filter and re-sort the table
+_matches_order_memo = OrderedDict()
+_matches_order_lock = threading.Lock()
+_MATCHES_ORDER_MEMO_MAX = 8
+
+# Serialized /api/record field groups, dropped per row as rows are edited
+_record_cache = RecordCache('RECORDS')
+
+# One save at a time, so batches reach Snowflake in the order they were taken
+_save_lock = threading.Lock()
+
+# (data version, BucketEngine) for the what-if endpoint; rebuilt when the data moves
+_bucket_engine = None
+
+# (loaded table, data version, ClusterEngine) for /api/clusters
+_cluster_engine = None
+
+# (loaded table, DetailStore): match-detail columns parsed once per load
+_detail_store = None
+_detail_store_lock = threading.Lock()
+
+
+def _build_stats(df):
+    """Full pass over the frame to seed the running aggregates behind /api/stats."""
+    if df.empty:
+        return None
+    ssn = df['ssn_match']
+    return {
+        'total_records': len(df),
+        # Replica frames hold strings as Categoricals, whose counts list unused categories too
+        'recommendations': {k: int(v) for k, v in df['recommendation'].value_counts().items() if v},
+        'name_score_sum': float(df['name_score'].sum()),
+        'name_score_count': int(df['name_score'].count()),
+        'address_score_sum': float(df['address_score'].sum()),
+        'address_score_count': int(df['address_score'].count()),
+        'ssn_perfect_matches': int((ssn == 100).sum()),
+        'ssn_partial_matches': int(((ssn > 0) & (ssn < 100)).sum()),
+        'ssn_no_match': int((ssn == 0).sum()),
+    }
+
+
+# Serving role (see serve.py): 'standalone' loads and edits in-process; under multiple
+# worker processes one 'writer' loads from Snowflake and publishes the frame to
+# APP_SHARED_DIR, and 'reader' workers attach to it and forward edits to APP_WRITER_URL
+APP_ROLE = os.environ.get('APP_ROLE', 'standalone')
+APP_SHARED_DIR = os.environ.get('APP_SHARED_DIR', '')
+APP_WRITER_URL = os.environ.get('APP_WRITER_URL', '').rstrip('/')
+# Grid row model: 'clientSide' ships the whole table to the browser (/api/matches_all),
+# 'infinite' fetches blocks from /api/matches as the user scrolls; 'auto' picks infinite
+# once the table has more than GRID_INFINITE_ROWS rows
+GRID_ROW_MODEL = os.environ.get('GRID_ROW_MODEL', 'auto')
+GRID_INFINITE_ROWS = int(os.environ.get('GRID_INFINITE_ROWS', '500000'))
+# GRID_CLIENT_CACHE=1 lets browsers keep the last table in IndexedDB and sync it through
+# /api/matches_delta. Off by default: the cached rows (SSNs included) stay on client disks
+GRID_CLIENT_CACHE = os.environ.get('GRID_CLIENT_CACHE', '0').lower() not in ('0', 'false', 'no', 'off')
+if GRID_ROW_MODEL not in ('auto', 'clientSide', 'infinite'):
+    raise ValueError(f"GRID_ROW_MODEL must be auto, clientSide or infinite (got {GRID_ROW_MODEL!r})")
+if APP_ROLE not in ('standalone', 'writer', 'reader'):
+    raise ValueError(f"APP_ROLE must be standalone, writer or reader (got {APP_ROLE!r})")
+if APP_ROLE != 'standalone' and not APP_SHARED_DIR:
+    raise ValueError(f"APP_SHARED_DIR is required when APP_ROLE={APP_ROLE}")
+if APP_ROLE == 'reader' and not APP_WRITER_URL:
+    raise ValueError("APP_WRITER_URL is required when APP_ROLE=reader")
+
+# Writer: generation of the published frame and the edits saved on top of it since.
+# Past _SHARED_REPUBLISH_ROWS saved rows the live frame is published as a new generation,
+# so the overlay every reader re-reads after each edit stays small
+_SHARED_REPUBLISH_ROWS = 10_000
+_shared_generation = None
+_shared_saved_edits = {}
+_shared_published_version = None
+_shared_publish_lock = threading.Lock()
+_replica = FrameReplica(APP_SHARED_DIR) if APP_ROLE == 'reader' else None
+
+
+def _publish_loaded_frame(df):
+    """Writer: publish a freshly loaded frame for the reader workers, at the version the
+    store is about to give it. Returns its epoch, which the load takes on, so every
+    worker labels data versions the same way."""
+    global _shared_generation, _shared_saved_edits
+    with _shared_publish_lock:
+        _shared_generation, epoch = publish_frame(df, APP_SHARED_DIR, version=store.version + 1)
+        _shared_saved_edits = {}
+    print(f"  Published {len(df):,} records to {APP_SHARED_DIR} (generation {_shared_generation})")
+    return epoch
+
+
+def _republish_frame():
+    """Writer: publish the live frame (saved edits included) as a new generation and keep
+    only the saved edits made after it. Caller holds _shared_publish_lock."""
+    global _shared_generation, _shared_saved_edits
+    snap = store.snapshot()
+    if snap.loaded_at != store.loaded_at:
+        return False
+    generation, epoch = publish_frame(snap.df, APP_SHARED_DIR, version=snap.version)
+    with store.write():
+        newer = store.changed_since(snap.version)
+        if newer is None:
+            return False  # Reloaded meanwhile; the load publishes its own frame
+        newer = set(newer)
+        _shared_saved_edits = {rid: f for rid, f in _shared_saved_edits.items() if rid in newer}
+        _shared_generation = generation
+        # Readers start their change logs over from the new frame, so clients do too
+        store.epoch = epoch
+    print(f"  Republished {len(snap.df):,} records (generation {generation})")
+    return True
+
+
+if APP_ROLE == 'reader':
+    # Readers never edit in place, so snapshots can share the attached frame
+    store = DataStore(lambda: _replica.refresh(force=True)[0],
+                      stats_builder=_build_stats, copy_snapshots=False)
+else:
+    # Shared cache of the match table, pending changes and running stats (see data_store.py)
+    store = DataStore(lambda: load_data(DATA_CONFIG, progress=store.report_progress),
+                      stats_builder=_build_stats,
+                      on_load=_publish_loaded_frame if APP_ROLE == 'writer' else None)
+
+# Scrape-time gauges for /api/metrics
+metrics.REGISTRY.gauge('ba_review_data_rows', 'Rows in the loaded match table',
+                       lambda: len(store.df) if store.df is not None else 0)
+metrics.REGISTRY.gauge('ba_review_pending_changes', 'Rows with unsaved edits', lambda: len(store.pending))
+metrics.REGISTRY.gauge('ba_review_data_version', 'Current data version', lambda: store.version)
+
+
+def start_background_load():
+    """Verify the source schema and load the data on a background thread, so the
+    server can bind immediately; data endpoints answer 503 until the load finishes."""
+    def warm():
+        try:
+            get_backend(DATA_CONFIG).ensure_schema()
+            print(f"  {DATA_CONFIG['name']} schema verified")
+        except Exception as e:
+            print(f"  WARNING: Could not verify {DATA_CONFIG['name']} schema: {e}")
+        try:
+            store.ensure_loaded()
+        except Exception as e:
+            print(f"  ERROR: Data load failed: {e}")
+            return
+        with store.read() as df:
+            print(f'  Records loaded: {len(df):,}')
+            if not df.empty and 'recommendation' in df.columns:
+                print(f'  Recommendations: {df["recommendation"].value_counts().to_dict()}')
+        try:
+            details = _get_detail_store()[1]
+            print(f'  Match details parsed ({details.nbytes() / 2**20:.1f} MB)')
+        except Exception as e:
+            print(f"  WARNING: Could not parse match details: {e}")
+
+    threading.Thread(target=warm, name='warm-start', daemon=True).start()
+
+
+def load_cached_data(force_reload=False):
+    """Snapshot of the cached data (loaded from Snowflake on first use). Read-only."""
+    store.ensure_loaded(force=force_reload)
+    return store.snapshot().df
+
+
+def _stats_recommendation_changed(old_values, new_values):
+    """Move rows between recommendation counts (caller holds the write lock). Scores and
+    SSN are read-only, so only recommendation edits touch the aggregates; cost is
+    O(changed rows), not O(table)."""
+    if store.stats is None:
+        return
+    counts = store.stats['recommendations']
+    for old in old_values:
+        if old is None or pd.isna(old):
+            continue
+        counts[old] = counts.get(old, 0) - 1
+        if counts[old] <= 0:
+            del counts[old]
+    for new in new_values:
+        if new is None or pd.isna(new):
+            continue
+        counts[new] = counts.get(new, 0) + 1
+
+
+def _fetch_ba_config():
+    """Query BA_CONFIG bucket score ranges from the data source."""
+    rows = get_backend(DATA_CONFIG).read_config('BUCKETS')
+    print(f"  BA_CONFIG loaded: {len(rows)} score params")
+    if not rows:
+        raise ValueError('no BUCKETS rows in BA_CONFIG')
+    return {
+        'NEW BA AND NEW ADDRESS': {
+            'min_name': rows.get('NEW_BA_NEW_ADDR_MIN_NAME_SCORE', ''),
+            'max_name': rows.get('NEW_BA_NEW_ADDR_MAX_NAME_SCORE', ''),
+            'min_addr': rows.get('NEW_BA_NEW_ADDR_MIN_ADDR_SCORE', ''),
+            'max_addr': rows.get('NEW_BA_NEW_ADDR_MAX_ADDR_SCORE', ''),
+        },
+        'EXISTING BA ADD NEW ADDRESS': {
+            'min_name': rows.get('EXISTING_BA_NEW_ADDR_MIN_NAME_SCORE', ''),
+            'max_name': rows.get('EXISTING_BA_NEW_ADDR_MAX_NAME_SCORE', ''),
+            'min_addr': rows.get('EXISTING_BA_NEW_ADDR_MIN_ADDR_SCORE', ''),
+            'max_addr': rows.get('EXISTING_BA_NEW_ADDR_MAX_ADDR_SCORE', ''),
+        },
+        'EXISTING BA AND EXISTING ADDRESS': {
+            'min_name': rows.get('EXISTING_BA_EXISTING_ADDR_MIN_NAME_SCORE', ''),
+            'max_name': rows.get('EXISTING_BA_EXISTING_ADDR_MAX_NAME_SCORE', ''),
+            'min_addr': rows.get('EXISTING_BA_EXISTING_ADDR_MIN_ADDR_SCORE', ''),
+            'max_addr': rows.get('EXISTING_BA_EXISTING_ADDR_MAX_ADDR_SCORE', ''),
+        },
+    }
+
+
+def _load_ba_config():
+    """BA_CONFIG score ranges via the lookup cache (TTL, with backoff after failures)."""
+    return _ba_config_cache.get('buckets', _fetch_ba_config, default={})
+
+
+def _apply_filters(df, args):
+    """Apply the /api/matches filter parameters (recommendation, SSN, score ranges,
+    global search) to the frame and return the filtered view."""
+    search_value = args.get('search[value]', default='')
+
+    # Custom filters
+    recommendation_filter = args.get('recommendation', default='')
+    ssn_filter = args.get('ssn_match', default='')
+    min_name_score = args.get('min_name_score', type=float, default=None)
+    max_name_score = args.get('max_name_score', type=float, default=None)
+    min_addr_score = args.get('min_addr_score', type=float, default=None)
+    max_addr_score = args.get('max_addr_score', type=float, default=None)
+
+    # Apply filters
+    mask = pd.Series(True, index=df.index)
+
+    if recommendation_filter:
+        rec_values = [v.strip() for v in recommendation_filter.split(',') if v.strip()]
+        if rec_values:
+            mask &= df['recommendation'].isin(rec_values)
+
+    if ssn_filter == 'yes':
+        mask &= df['ssn_match'] == 100
+    elif ssn_filter == 'no':
+        mask &= df['ssn_match'] == 0
+    elif ssn_filter == 'partial':
+        mask &= (df['ssn_match'] > 0) & (df['ssn_match'] < 100)
+
+    if min_name_score is not None:
+        mask &= df['name_score'] >= min_name_score
+    if max_name_score is not None:
+        mask &= df['name_score'] <= max_name_score
+
+    if min_addr_score is not None:
+        mask &= df['address_score'] >= min_addr_score
+    if max_addr_score is not None:
+        mask &= df['address_score'] <= max_addr_score
+
+    df_filtered = df[mask]
+
+    if search_value.strip():
+        df_filtered = df_filtered[_quick_filter_mask(df_filtered, search_value)]
+
+    return df_filtered
+
+
+def _quick_filter_mask(df, text):
+    """Rows matching the grid's quick filter the way AG Grid matches it client-side:
+    every whitespace-separated term must appear (literally, ignoring case) in one of
+    the grid columns. Vectorized per column; Categorical columns (replica frames)
+    match their distinct values once and map the result through the codes."""
+    haystacks = []
+    for col in _GRID_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            haystacks.append((values.cat.categories.astype(str).str.lower(), values.cat.codes.to_numpy()))
+        else:
+            haystacks.append((values.where(values.notna(), '').astype(str).str.lower(), None))
+
+    mask = np.ones(len(df), dtype=bool)
+    for term in text.lower().split():
+        hit = np.zeros(len(df), dtype=bool)
+        for strings, codes in haystacks:
+            found = np.asarray(strings.str.contains(term, regex=False), dtype=bool)
+            # Code -1 (missing) picks the appended False
+            hit |= np.append(found, False)[codes] if codes is not None else found
+        mask &= hit
+    return mask
+
+
+# Endpoints that modify the cached data (or report on its loading); reader workers
+# forward them to the writer
+_WRITE_ENDPOINTS = {'update_record', 'bulk_update', 'search_replace', 'import_ids',
+                    'save_changes', 'reload_data', 'get_load_status'}
+
+# Endpoints that work before the data has finished loading
+_NO_DATA_ENDPOINTS = {'static', 'index', 'get_load_status', 'get_datasources', 'dev_notes',
+                      'get_cache_stats', 'get_update_log', 'get_metrics'}
+
+# Seconds clients are told to wait before retrying while data is loading
+_LOAD_RETRY_AFTER = 5
+
+
+def _endpoint_name():
+    """View name of the current request without the blueprint prefix."""
+    return (request.endpoint or '').rpartition('.')[2]
+
+
+def _loading_response(status):
+    """503 for data endpoints hit before the first load has finished."""
+    error = 'Data is still loading' if status.get('state') != 'error' else f"Data load failed: {status['error']}"
+    response = jsonify({'error': error, 'load_status': status})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(_LOAD_RETRY_AFTER)
+    return response
+
+
+def _forward_to_writer():
+    """Reader: replay the current request against the writer process."""
+    req = urllib.request.Request(
+        APP_WRITER_URL + request.full_path.rstrip('?'),
+        data=request.get_data() if request.method != 'GET' else None,
+        method=request.method,
+        headers={'Content-Type': request.headers.get('Content-Type', 'application/json')},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=600) as resp:
+            return Response(resp.read(), status=resp.status,
+                            content_type=resp.headers.get('Content-Type'))
+    except urllib.error.HTTPError as e:
+        return Response(e.read(), status=e.code, content_type=e.headers.get('Content-Type'))
+    except urllib.error.URLError as e:
+        return jsonify({'error': f'Writer process unavailable: {e.reason}'}), 503
+
+
+@bp.before_app_request
+def _start_request_timing():
+    metrics.start_request()
+
+
+@bp.after_app_request
+def _add_server_timing(response):
+    timing = metrics.finish_request(_endpoint_name() or 'unknown', request.method, response.status_code)
+    if timing:
+        response.headers['Server-Timing'] = timing
+    return response
+
+
+@bp.before_app_request
+def _sync_shared_frame():
+    if APP_ROLE != 'reader':
+        return None
+    endpoint = _endpoint_name()
+    if endpoint in _WRITE_ENDPOINTS:
+        return _forward_to_writer()
+    if endpoint in _NO_DATA_ENDPOINTS:
+        return None
+    if not _replica.available():
+        return _loading_response({'state': 'loading', 'phase': 'waiting for writer', 'ready': False})
+    # Pick up a newly published frame or overlay before serving the read (holding the
+    # replica lock so concurrent requests hand updates to the store in order), taking
+    # the writer's epoch and version so a client's cache syncs against any worker
+    with _replica.lock:
+        update = _replica.refresh()
+        if update is None:
+            return None
+        frame, pending, changes = update
+        if changes is None:
+            store.replace(frame, pending, version=_replica.version, epoch=_replica.epoch)
+            return None
+        with store.write():
+            store.advance(frame, pending, [c[0] for c in changes], version=_replica.version)
+            rec = [(old, new) for _rid, field, old, new in changes if field == 'recommendation']
+            _stats_recommendation_changed([o for o, _ in rec], [n for _, n in rec])
+    return None
+
+
+@bp.before_app_request
+def _require_data():
+    if APP_ROLE == 'reader' or _endpoint_name() in _NO_DATA_ENDPOINTS or store.ready:
+        return None
+    # First request after startup without a warm start kicks off the load
+    store.load_in_background()
+    return _loading_response(store.load_status())
+
+
+@bp.after_app_request
+def _publish_shared_overlay(response):
+    global _shared_published_version
+    if APP_ROLE != 'writer' or _shared_generation is None:
+        return response
+    with _shared_publish_lock:
+        republished = len(_shared_saved_edits) > _SHARED_REPUBLISH_ROWS and _republish_frame()
+        if store.version == _shared_published_version and not republished:
+            return response
+        with store.read():
+            version = store.version
+            pending = {rid: dict(fields) for rid, fields in store.pending.items()}
+            saved = {rid: dict(fields) for rid, fields in _shared_saved_edits.items()}
+        publish_overlay(APP_SHARED_DIR, _shared_generation, version, saved, pending)
+        _shared_published_version = version
+    return response
+
+
+@bp.route('/')
+def index():
+    return render_template('index.html')
+
+
+@bp.route('/api/recommendations')
+def get_recommendations():
+    """Get distinct recommendation values from the data"""
+    try:
+        df = load_cached_data()
+        if df.empty:
+            return jsonify([])
+        values = sorted(df['recommendation'].dropna().unique().tolist())
+        return jsonify(values)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# Columns the grid needs (skip internal/unused fields). The match-detail columns are
+# fetched per row when shown (/api/records groups=detail), not shipped with every row
+_GRID_COLUMNS = [
+    'id', 'ssn_match', 'name_score', 'address_score', 'nameaddrscore', 'recommendation',
+    'how_to_process', 'canvas_id', 'canvas_addrseq', 'canvas_name',
+    'canvas_address', 'canvas_city', 'canvas_state', 'canvas_zip', 'canvas_ssn',
+    'dec_name', 'dec_address', 'dec_city', 'dec_state', 'dec_zip',
+    'dec_hdrcode', 'dec_addrsubcode', 'dec_contact', 'dec_address_looked_up',
+    'address_reason', 'jib', 'rev', 'vendor', 'memo', 'is_trust', 'run_id'
+]
+
+# Columns /api/matches can sort on; grid columns built by value getters sort on their base field
+_SORTABLE_FIELDS = {
+    'id', 'ssn_match', 'name_score', 'address_score', 'nameaddrscore', 'recommendation',
+    'canvas_name', 'canvas_address', 'canvas_city', 'canvas_id',
+    'dec_name', 'dec_address', 'dec_city', 'dec_hdrcode', 'dec_address_looked_up',
+    'jib', 'rev', 'vendor', 'how_to_process', 'memo', 'run_id'
+}
+_SORT_ALIASES = {'uid': 'id', 'canvas_csz': 'canvas_city', 'dec_csz': 'dec_city'}
+
+
+
+def _blank_missing(df):
+    """Missing values as '' for the grid. Categorical columns (replica frames) are decoded
+    first, since a Categorical can't take a value outside its categories."""
+    decode = {c: object for c, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+    return (df.astype(decode) if decode else df).fillna('')
+
+
+# Paging params: they pick a slice of the ordered rows, not the order itself
+_PAGING_PARAMS = {'draw', 'start', 'length', 'startRow', 'endRow', '_'}
+
+
+def _sort_spec(args):
+    """[(column, ascending), ...] from `sort=col:dir,col:dir` (grid) or DataTables order[0]."""
+    spec = []
+    if args.get('sort'):
+        for part in args.get('sort').split(','):
+            col, _, direction = part.partition(':')
+            col = _SORT_ALIASES.get(col.strip(), col.strip())
+            if col in _SORTABLE_FIELDS:
+                spec.append((col, direction.strip().lower() != 'desc'))
+        return spec
+    order_col = args.get('order[0][column]', type=int, default=None)
+    if order_col is not None:
+        col_data = args.get(f'columns[{order_col}][data]', default=None)
+        if col_data in _SORTABLE_FIELDS:
+            spec.append((col_data, args.get('order[0][dir]', default='asc') == 'asc'))
+    return spec
+
+
+def _matches_order(snap, args):
+    """Row labels of the snapshot after /api/matches filtering and sorting, memoized per
+    query until the data next changes."""
+    signature = (snap.version, tuple(sorted(
+        (k, v) for k, v in args.items(multi=True) if k not in _PAGING_PARAMS
+    )))
+    with _matches_order_lock:
+        order = _matches_order_memo.get(signature)
+        if order is not None:
+            _matches_order_memo.move_to_end(signature)
+            return order
+
+    df = snap.df
+    with metrics.span('matches.filter'):
+        df_filtered = _apply_filters(df, args)
+    spec = [(col, asc) for col, asc in _sort_spec(args) if col in df.columns]
+    if spec:
+        with metrics.span('matches.sort'):
+            df_filtered = df_filtered.sort_values(
+                [col for col, _ in spec], ascending=[asc for _, asc in spec],
+                na_position='last', kind='stable'
+            )
+    order = df_filtered.index
+
+    with _matches_order_lock:
+        for key in [k for k in _matches_order_memo if k[0] != snap.version]:
+            del _matches_order_memo[key]
+        _matches_order_memo[signature] = order
+        if len(_matches_order_memo) > _MATCHES_ORDER_MEMO_MAX:
+            _matches_order_memo.popitem(last=False)
+    return order
+
+
+@bp.route('/api/matches')
+def get_matches():
+    """Server-side rows endpoint: DataTables paging (start/length) or AG Grid infinite
+    row model blocks (startRow/endRow, sort=col:dir,...), with the same filters."""
+    try:
+        with metrics.span('matches.snapshot'):
+            store.ensure_loaded()
+            snap = store.snapshot()
+        df = snap.df
+
+        if df.empty:
+            return jsonify({'data': [], 'recordsTotal': 0, 'recordsFiltered': 0})
+
+        records_total = len(df)
+
+        # DataTables parameters
+        draw = request.args.get('draw', type=int, default=1)
+        start = request.args.get('start', type=int, default=0)
+        length = request.args.get('length', type=int, default=25)
+        # Infinite row model block
+        if 'startRow' in request.args:
+            start = request.args.get('startRow', type=int, default=0)
+            length = max(request.args.get('endRow', type=int, default=start + 100) - start, 0)
+
+        order = _matches_order(snap, request.args)
+        records_filtered = len(order)
+
+        # Paginate (-1 means all)
+        df_page = df.loc[order[start:] if length == -1 else order[start:start + length]]
+
+        available = [c for c in _GRID_COLUMNS if c in df_page.columns]
+        with metrics.span('matches.serialize'):
+            df_out = _blank_missing(df_page[available])
+            df_out = df_out.copy()
+            df_out['_row_id'] = df_page.index
+
+            # Fast-serialize: use to_dict + json.dumps
+            data = df_out.to_dict('records')
+
+        with metrics.span('matches.encode'):
+            result = json.dumps({
+                'draw': draw,
+                'recordsTotal': records_total,
+                'recordsFiltered': records_filtered,
+                'data': data
+            }, ensure_ascii=False, default=str)
+        return Response(result, mimetype='application/json')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# /api/export params that are not filters or sort
+_EXPORT_PARAMS = {'format', 'columns', 'row_ids', 'gzip', 'filename'}
+
+
+@bp.route('/api/export', methods=['GET', 'POST'])
+def export_matches():
+    """Stream rows as CSV, XLSX, Parquet or Arrow IPC straight from the cached frame (so
+    unsaved edits are included): the rows matching the /api/matches filter and sort params,
+    or a selection (row_ids=1,2,3, in that order unless a sort is given; the client-side
+    grid sends the rows it displays this way). columns=a,b,c picks and orders the columns
+    (default: the grid columns); Parquet/Arrow add a boolean `dirty` column for rows with
+    unsaved edits. CSV is gzip-encoded for clients that accept it (gzip=0 turns that off)."""
+    try:
+        params = request.values
+        fmt = params.get('format', default='csv').lower()
+        if fmt not in exporter.FORMATS:
+            return jsonify({'error': f"Unknown export format {fmt!r}"}), 400
+
+        store.ensure_loaded()
+        snap = store.snapshot()
+        df = snap.df
+
+        if params.get('columns'):
+            columns = [c.strip() for c in params.get('columns').split(',') if c.strip()]
+            unknown = [c for c in columns if c not in df.columns]
+            if unknown:
+                return jsonify({'error': f"Unknown column(s): {', '.join(unknown)}"}), 400
+        else:
+            columns = [c for c in _GRID_COLUMNS + list(DETAIL_COLUMNS) if c in df.columns]
+
+        query = MultiDict([(k, v) for k, v in params.items(multi=True) if k not in _EXPORT_PARAMS])
+        rows = _matches_order(snap, query)
+        if params.get('row_ids'):
+            try:
+                wanted = [int(x) for x in params.get('row_ids').split(',') if x.strip()]
+            except ValueError:
+                return jsonify({'error': 'row_ids must be a comma-separated list of row ids'}), 400
+            if query.get('sort'):
+                rows = rows[rows.isin(wanted)]
+            else:
+                wanted = pd.Index(list(dict.fromkeys(wanted)))
+                rows = wanted[wanted.isin(rows)]
+
+        dirty = ()
+        if fmt in exporter.ARROW_FORMATS:
+            with store.read():
+                dirty = list(store.pending)
+
+        try:
+            stream = exporter.export_stream(df, columns, fmt, rows, dirty)
+        except (ValueError, ImportError) as e:
+            return jsonify({'error': str(e)}), 400
+
+        mimetype, ext = exporter.FORMATS[fmt]
+        filename = params.get('filename') or f"matches_export_{datetime.now():%Y-%m-%d}.{ext}"
+        headers = {'Content-Disposition': f'attachment; filename="{filename}"',
+                   'X-Export-Rows': str(len(rows))}
+        if (fmt == 'csv' and params.get('gzip', default='1') != '0'
+                and 'gzip' in request.headers.get('Accept-Encoding', '')):
+            stream = exporter.gzip_stream(stream)
+            headers['Content-Encoding'] = 'gzip'
+            headers['Vary'] = 'Accept-Encoding'
+        return Response(stream, mimetype=mimetype, headers=headers)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/stats')
+def get_stats():
+    try:
+        # Constant-time: everything comes from the running aggregates
+        with store.read():
+            agg = store.stats
+            if agg is None:
+                return jsonify({'error': 'No data available'}), 404
+            name_n = agg['name_score_count']
+            addr_n = agg['address_score_count']
+            stats = {
+                'total_records': agg['total_records'],
+                'recommendations': dict(agg['recommendations']),
+                'avg_name_score': round(agg['name_score_sum'] / name_n, 1) if name_n else 0.0,
+                'avg_address_score': round(agg['address_score_sum'] / addr_n, 1) if addr_n else 0.0,
+                'ssn_perfect_matches': agg['ssn_perfect_matches'],
+                'ssn_partial_matches': agg['ssn_partial_matches'],
+                'ssn_no_match': agg['ssn_no_match'],
+            }
+
+        stats['rec_config'] = _load_ba_config()
+
+        return jsonify(stats)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# SSN match buckets shared by the SSN filter and grouped stats
+SSN_BUCKETS = ('yes', 'partial', 'no')
+
+# Score columns summarised as histograms by /api/stats/grouped
+HISTOGRAM_COLS = ('name_score', 'address_score', 'nameaddrscore')
+
+
+def _ssn_bucket(ssn):
+    """Vectorized SSN bucket label matching the ssn_match filter values."""
+    return pd.Series(np.select([ssn == 100, ssn == 0, (ssn > 0) & (ssn < 100)],
+                               SSN_BUCKETS, default='unknown'), index=ssn.index)
+
+
+def _histogram_edges(spec):
+    """Parse the bins parameter: a bin count ('10') or explicit edges ('0,50,75,90,100')."""
+    if not spec:
+        return np.linspace(0, 100, 11)
+    malformed = 'bins must be a bin count or comma-separated numeric edges'
+    if ',' in spec:
+        try:
+            edges = np.array(sorted({float(v) for v in spec.split(',') if v.strip()}))
+        except ValueError:
+            raise ValueError(malformed)
+        if not np.isfinite(edges).all():
+            raise ValueError('bins edges must be finite numbers')
+        if len(edges) < 2:
+            raise ValueError('bins needs at least two edges')
+        return edges
+    try:
+        count = int(spec)
+    except ValueError:
+        raise ValueError(malformed)
+    if not 1 <= count <= 100:
+        raise ValueError('bins must be between 1 and 100')
+    return np.linspace(0, 100, count + 1)
+
+
+def _grouped_stats(df, args, pending):
+    """Group-by aggregates over the filtered frame (one vectorized pass per breakdown)."""
+    edges = _histogram_edges(args.get('bins', default=''))
+    df_f = _apply_filters(df, args)
+
+    grouped = (
+        df_f.assign(ssn_bucket=_ssn_bucket(df_f['ssn_match']))
+        .groupby(['recommendation', 'ssn_bucket'], dropna=False, observed=True)
+        .agg(rows=('ssn_match', 'size'),
+             avg_name_score=('name_score', 'mean'),
+             avg_address_score=('address_score', 'mean'))
+        .reset_index()
+    )
+    by_rec_ssn = [
+        {
+            'recommendation': '' if pd.isna(r.recommendation) else r.recommendation,
+            'ssn_bucket': r.ssn_bucket,
+            'count': int(r.rows),
+            'avg_name_score': None if pd.isna(r.avg_name_score) else round(float(r.avg_name_score), 1),
+            'avg_address_score': None if pd.isna(r.avg_address_score) else round(float(r.avg_address_score), 1),
+        }
+        for r in grouped.itertuples(index=False)
+    ]
+
+    histograms = {}
+    for col in HISTOGRAM_COLS:
+        if col not in df_f.columns:
+            continue
+        values = df_f[col].dropna().to_numpy()
+        counts, _ = np.histogram(values, bins=edges)
+        histograms[col] = {
+            'edges': edges.tolist(),
+            'counts': counts.tolist(),
+            'missing': int(len(df_f) - len(values)),
+        }
+
+    by_run = {}
+    if 'run_id' in df_f.columns:
+        by_run = {str(k): int(v) for k, v in df_f['run_id'].value_counts(dropna=False).items() if v}
+
+    # Pending changes restricted to the filtered rows
+    pending_ids = df_f.index.intersection(list(pending.keys()))
+    pending_fields = {}
+    for rid in pending_ids:
+        for field in pending[rid]:
+            pending_fields[field] = pending_fields.get(field, 0) + 1
+
+    return {
+        'records_total': len(df),
+        'records_filtered': len(df_f),
+        'by_recommendation_ssn': by_rec_ssn,
+        'histograms': histograms,
+        'by_run_id': by_run,
+        'pending': {'rows': len(pending_ids), 'fields': pending_fields},
+    }
+
+
+@bp.route('/api/stats/grouped')
+def get_grouped_stats():
+    """Filtered, grouped statistics. Accepts the same filter parameters as /api/matches
+    plus bins; results are memoized per filter signature until the data next changes."""
+    try:
+        snap = store.snapshot()
+        if snap.df.empty:
+            return jsonify({'error': 'No data available'}), 404
+
+        # DataTables paging/cache-buster params don't change the result
+        ignored = {'draw', 'start', 'length', '_'}
+        signature = (snap.version, tuple(sorted(
+            (k, v) for k, v in request.args.items(multi=True) if k not in ignored
+        )))
+
+        with _grouped_stats_lock:
+            result = _grouped_stats_memo.get(signature)
+            if result is not None:
+                _grouped_stats_memo.move_to_end(signature)
+
+        if result is None:
+            with store.read():
+                pending = {rid: list(fields) for rid, fields in store.pending.items()}
+            try:
+                result = _grouped_stats(snap.df, request.args, pending)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            with _grouped_stats_lock:
+                # Entries from older data versions can never hit again
+                for key in [k for k in _grouped_stats_memo if k[0] != snap.version]:
+                    del _grouped_stats_memo[key]
+                _grouped_stats_memo[signature] = result
+                if len(_grouped_stats_memo) > _GROUPED_STATS_MEMO_MAX:
+                    _grouped_stats_memo.popitem(last=False)
+
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _get_bucket_engine(snap):
+    """Bucket engine for the snapshot's data version, built once per version."""
+    global _bucket_engine
+    cached = _bucket_engine
+    if cached is None or cached[0] != snap.version:
+        cached = (snap.version, BucketEngine(snap.df))
+        _bucket_engine = cached
+    return cached[1]
+
+
+def _loaded_table_key(snap=None):
+    """Identifies the loaded table (same rows, same read-only columns) of a snapshot or
+    the live frame: one load, or for readers one published frame generation (edit
+    overlays only touch editable fields)."""
+    if _replica is not None:
+        return ('generation', _replica.generation)
+    return ('load', snap.loaded_at if snap is not None else store.loaded_at)
+
+
+def _get_cluster_engine(snap):
+    """Cluster engine for the snapshot's data version; a new version of the same load
+    keeps the indexes that edits can't change."""
+    global _cluster_engine
+    cached = _cluster_engine
+    table = _loaded_table_key(snap)
+    if cached is None or cached[0] != table or cached[1] != snap.version:
+        previous = cached[2] if cached is not None and cached[0] == table else None
+        cached = (table, snap.version, ClusterEngine(snap.df, previous))
+        _cluster_engine = cached
+    return cached[2]
+
+
+@bp.route('/api/clusters')
+def get_clusters():
+    """Duplicate clusters: rows sharing by=canvas_id|dec_hdrcode|name|address (name and
+    address normalized), with sizes and min/mean/max scores. min_size (default 2),
+    sort=size|key|name_score|address_score|ssn_match, dir=asc|desc, start/length page the
+    list. key=... or row_id=... returns that one cluster with its row ids instead (and
+    its grid rows with rows=1)."""
+    try:
+        args = request.args
+        by = args.get('by', default='canvas_id')
+        if by not in CLUSTER_KEYS:
+            return jsonify({'error': f"by must be one of: {', '.join(CLUSTER_KEYS)}"}), 400
+        store.ensure_loaded()
+        snap = store.snapshot()
+        engine = _get_cluster_engine(snap)
+
+        if 'key' in args or 'row_id' in args:
+            with metrics.span('clusters.lookup'):
+                cluster = engine.cluster(by, key=args.get('key'), row_id=args.get('row_id', type=int))
+            if cluster is None:
+                return jsonify({'error': 'No such cluster'}), 404
+            if args.get('rows') in ('1', 'true'):
+                available = [c for c in _GRID_COLUMNS if c in snap.df.columns]
+                df_out = _blank_missing(snap.df.loc[cluster['row_ids'], available])
+                df_out['_row_id'] = df_out.index
+                cluster['rows'] = df_out.to_dict('records')
+            return Response(json.dumps(cluster, ensure_ascii=False, default=str), mimetype='application/json')
+
+        try:
+            with metrics.span('clusters.list'):
+                result = engine.clusters(
+                    by,
+                    min_size=args.get('min_size', type=int, default=2),
+                    sort=args.get('sort', default='size'),
+                    ascending=args.get('dir', default='desc') == 'asc',
+                    start=max(args.get('start', type=int, default=0), 0),
+                    length=max(args.get('length', type=int, default=100), 0),
+                )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        result['version'] = snap.version
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/ba_config/whatif', methods=['POST'])
+def ba_config_whatif():
+    """Re-bucket rows against candidate BA_CONFIG thresholds without changing anything.
+
+    Body: {thresholds: {bucket: {min_name, max_name, min_addr, max_addr}}, include_rows, row_limit}.
+    Buckets or bounds left out fall back to the live BA_CONFIG values.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        snap = store.snapshot()
+        if snap.df.empty:
+            return jsonify({'error': 'No data available'}), 404
+
+        candidate = data.get('thresholds') or {}
+        if not isinstance(candidate, dict) or not all(
+                t is None or isinstance(t, dict) for t in candidate.values()):
+            return jsonify({'error': 'thresholds must map each bucket to an object of bounds'}), 400
+        row_limit = data.get('row_limit', 1000)
+        if row_limit is not None:
+            try:
+                if isinstance(row_limit, bool):
+                    raise ValueError
+                row_limit = int(row_limit)
+                if row_limit < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                return jsonify({'error': 'row_limit must be a non-negative integer or null'}), 400
+
+        live = _load_ba_config()
+        merged = {b: {**live.get(b, {}), **(candidate.get(b) or {})} for b in BUCKET_ORDER}
+        try:
+            thresholds = parse_thresholds(merged)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Thresholds must be numeric'}), 400
+
+        result = _get_bucket_engine(snap).evaluate(
+            thresholds,
+            include_rows=bool(data.get('include_rows', False)),
+            row_limit=row_limit,
+        )
+        with store.read():
+            result['current'] = dict(store.stats['recommendations']) if store.stats else {}
+        result['thresholds'] = {
+            b: {k: (None if np.isinf(v) else v) for k, v in t.items()}
+            for b, t in thresholds.items()
+        }
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# Field groups /api/record(s) can return; columns outside every group come back as 'other'
+_RECORD_GROUPS = {
+    'canvas': ('canvas_id', 'canvas_addrseq', 'canvas_ssn', 'canvas_name', 'canvas_address',
+               'canvas_city', 'canvas_state', 'canvas_zip'),
+    'dec': ('dec_hdrcode', 'dec_addrsubcode', 'dec_name', 'dec_address', 'dec_city', 'dec_state',
+            'dec_zip', 'dec_contact', 'dec_address_looked_up'),
+    'scores': ('ssn_match', 'name_score', 'address_score', 'nameaddrscore'),
+    'review': ('id', 'recommendation', 'how_to_process', 'address_reason', 'memo',
+               'jib', 'rev', 'vendor', 'is_trust', 'run_id'),
+    'detail': DETAIL_COLUMNS,
+}
+_RECORD_BATCH_MAX = 500
+
+
+def _record_groups(value):
+    """Group names from `a,b` or a list; every group when empty. Raises ValueError."""
+    if not value:
+        return list(_RECORD_GROUPS) + ['other']
+    groups = value.split(',') if isinstance(value, str) else list(value)
+    groups = [g.strip() for g in groups if g and g.strip()]
+    unknown = [g for g in groups if g not in _RECORD_GROUPS and g != 'other']
+    if unknown:
+        raise ValueError(f"Unknown field group(s): {', '.join(unknown)} "
+                         f"(expected: {', '.join(list(_RECORD_GROUPS) + ['other'])})")
+    return groups
+
+
+def _record_value(value):
+    if value is None or (np.isscalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    return value
+
+
+def _get_detail_store():
+    """(key, DetailStore) for the loaded table, parsed on first use after each load."""
+    global _detail_store
+    cached = _detail_store
+    if cached is None or cached[0] != _loaded_table_key():
+        with _detail_store_lock:
+            cached = _detail_store
+            snap = store.snapshot()
+            key = _loaded_table_key(snap)
+            if cached is None or cached[0] != key:
+                with metrics.span('details.parse'):
+                    cached = (key, DetailStore(snap.df))
+                _detail_store = cached
+    return cached
+
+
+def _record_fragments(df, row_ids, groups, details=None):
+    """{row_id: 'k":v,...' JSON text per row} for labels present in df, read through the
+    record cache (caller holds the store lock and has synced the cache). The detail
+    group comes from `details` (see _get_detail_store) in its parsed form."""
+    positions = df.index.get_indexer(row_ids)
+    found = [(rid, pos) for rid, pos in zip(row_ids, positions) if pos >= 0]
+    fragments = {rid: [] for rid, _ in found}
+    for group in groups:
+        if group == 'other':
+            grouped = {c for cols in _RECORD_GROUPS.values() for c in cols}
+            cols = [c for c in df.columns if c not in grouped]
+        else:
+            cols = [c for c in _RECORD_GROUPS[group] if c in df.columns]
+        misses = []
+        for rid, pos in found:
+            fragment = _record_cache.get(rid, group)
+            if fragment is None:
+                misses.append((rid, pos))
+            else:
+                fragments[rid].append(fragment)
+        if not misses:
+            continue
+        if group == 'detail':
+            if details is None or details[0] != _loaded_table_key():
+                raise RuntimeError('Data was reloaded while reading match details; retry')
+            detail_positions = details[1].positions([rid for rid, _ in misses])
+            values = [details[1].row(p) if p >= 0 else {} for p in detail_positions]
+        else:
+            values = df.iloc[[pos for _, pos in misses]][cols].to_dict('records')
+        for (rid, _), record in zip(misses, values):
+            record = {c: _record_value(v) for c, v in record.items()}
+            fragment = json.dumps(record, ensure_ascii=False, default=str)[1:-1]
+            _record_cache.put(rid, group, fragment)
+            fragments[rid].append(fragment)
+    return {rid: ','.join([f for f in parts if f] + [f'"_row_id":{json.dumps(rid, default=str)}'])
+            for rid, parts in fragments.items()}
+
+
+@bp.route('/api/record/<int:row_id>')
+def get_record(row_id):
+    """One record by row id (index label). groups=canvas,dec,scores,review,detail,other
+    limits the fields returned (default: all)."""
+    try:
+        try:
+            groups = _record_groups(request.args.get('groups'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        details = _get_detail_store() if 'detail' in groups else None
+        with store.read() as df:
+            _record_cache.sync(store)
+            fragments = _record_fragments(df, [row_id], groups, details)
+        if row_id not in fragments:
+            return jsonify({'error': 'Invalid row_id'}), 404
+        return Response('{' + fragments[row_id] + '}', mimetype='application/json')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/records', methods=['GET', 'POST'])
+def get_records():
+    """Many records in one call (e.g. prefetching the rows around the one being edited):
+    row_ids as JSON {row_ids, groups} or ?row_ids=1,2,3&groups=... Returns the records in
+    the order asked, plus the ids that don't exist."""
+    try:
+        if request.is_json:
+            data = request.json or {}
+            row_ids, groups = data.get('row_ids') or [], data.get('groups')
+        else:
+            row_ids = [x for x in request.values.get('row_ids', '').split(',') if x.strip()]
+            groups = request.values.get('groups')
+        try:
+            row_ids = [int(x) for x in row_ids]
+            groups = _record_groups(groups)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        if len(row_ids) > _RECORD_BATCH_MAX:
+            return jsonify({'error': f'At most {_RECORD_BATCH_MAX} records per request'}), 400
+
+        details = _get_detail_store() if 'detail' in groups else None
+        with store.read() as df:
+            _record_cache.sync(store)
+            version = store.version
+            fragments = _record_fragments(df, list(dict.fromkeys(row_ids)), groups, details)
+        records = ','.join('{' + fragments[rid] + '}' for rid in row_ids if rid in fragments)
+        missing = [rid for rid in row_ids if rid not in fragments]
+        return Response(f'{{"version":{version},"records":[{records}],"missing":{json.dumps(missing)}}}',
+                        mimetype='application/json')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/update', methods=['POST'])
+def update_record():
+    """Update a single field on a record. All changes are deferred until Save."""
+    try:
+        data = request.json
+        row_id = data.get('row_id')
+        field = data.get('field')
+        value = data.get('value')
+
+        if row_id is None or not field:
+            return jsonify({'error': 'Missing required fields'}), 400
+
+        allowed_fields = {
+            'recommendation', 'canvas_name', 'canvas_address',
+            'canvas_city', 'canvas_state', 'canvas_zip', 'address_reason',
+            'jib', 'rev', 'vendor', 'how_to_process', 'memo'
+        }
+        if field not in allowed_fields:
+            return jsonify({'error': f'Field "{field}" cannot be updated'}), 400
+
+        # Coerce value types
+        if field in ('jib', 'rev', 'vendor'):
+            value = int(value)
+
+        with store.write(columns=[field]) as df:
+            if row_id >= len(df):
+                return jsonify({'error': 'Invalid row_id'}), 400
+
+            # Capture old value before updating
+            old_value = df.at[row_id, field]
+
+            # Update in-memory DataFrame
+            df.at[row_id, field] = value
+            if field == 'recommendation':
+                _stats_recommendation_changed([old_value], [value])
+
+            # Track as pending with (old_value, new_value)
+            store.record_pending(row_id, field, old_value, value)
+            pending_count = len(store.pending)
+
+        return jsonify({
+            'success': True,
+            'pending_count': pending_count,
+            'message': 'Updated (unsaved)'
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/bulk_update', methods=['POST'])
+def bulk_update():
+    """Bulk update recommendation for multiple records (deferred until Save)."""
+    try:
+        data = request.json
+        row_ids = data.get('row_ids', [])
+        new_recommendation = data.get('recommendation', 'APPROVED')
+
+        if not row_ids:
+            return jsonify({'error': 'No row IDs provided'}), 400
+
+        success_count = 0
+        errors = []
+
+        with store.write(columns=['recommendation']) as df:
+            for row_id in row_ids:
+                try:
+                    if row_id >= len(df):
+                        errors.append(f"Invalid row_id: {row_id}")
+                        continue
+
+                    old_rec = df.at[row_id, 'recommendation']
+                    df.at[row_id, 'recommendation'] = new_recommendation
+                    _stats_recommendation_changed([old_rec], [new_recommendation])
+
+                    store.record_pending(row_id, 'recommendation', old_rec or '', new_recommendation)
+
+                    success_count += 1
+
+                except Exception as e:
+                    errors.append(f"Row {row_id}: {str(e)}")
+            pending_count = len(store.pending)
+
+        return jsonify({
+            'success': True,
+            'updated': success_count,
+            'errors': errors,
+            'pending_count': pending_count
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/matches_all')
+def get_matches_all():
+    """Return full dataset as JSON for AG Grid client-side processing. The data epoch and
+    version headers let the client cache it and later ask /api/matches_delta for changes."""
+    try:
+        with metrics.span('matches_all.snapshot'):
+            store.ensure_loaded()
+            snap = store.snapshot()
+        df = snap.df
+        headers = {'X-Data-Epoch': snap.epoch, 'X-Data-Version': str(snap.version)}
+        if df.empty:
+            return Response('[]', mimetype='application/json', headers=headers)
+
+        available = [c for c in _GRID_COLUMNS if c in df.columns]
+        with metrics.span('matches_all.serialize'):
+            df_out = _blank_missing(df[available]).copy()
+            df_out['_row_id'] = df.index.tolist()
+        with metrics.span('matches_all.encode'):
+            result = df_out.to_json(orient='records', default_handler=str)
+        return Response(result, mimetype='application/json', headers=headers)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/matches_delta')
+def get_matches_delta():
+    """Rows changed since a version the client already holds (epoch + since from the
+    /api/matches_all headers). full=true when that version is from another load or
+    older than the change log, and the client should refetch /api/matches_all."""
+    try:
+        since = request.args.get('since', type=int)
+        epoch = request.args.get('epoch', default='')
+        with store.read() as df:
+            current_epoch = store.epoch
+            version = store.version
+            row_ids = None
+            if since is not None and epoch == current_epoch:
+                row_ids = store.changed_since(since)
+            if row_ids is None:
+                return jsonify({'full': True, 'epoch': current_epoch, 'version': version})
+            available = [c for c in _GRID_COLUMNS if c in df.columns]
+            df_out = _blank_missing(df.loc[row_ids, available])
+        df_out['_row_id'] = df_out.index
+        result = json.dumps({
+            'full': False,
+            'epoch': current_epoch,
+            'version': version,
+            'rows': df_out.to_dict('records'),
+        }, ensure_ascii=False, default=str)
+        return Response(result, mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/dev_notes')
+def dev_notes():
+    notes_path = Path('Things to consider.docx').resolve()
+    if not notes_path.exists():
+        return jsonify({'error': 'Dev notes file not found'}), 404
+    import subprocess
+    subprocess.Popen(
+        ['powershell', '-WindowStyle', 'Hidden', '-Command',
+         f'Start-Process "{notes_path}";'
+         ' Start-Sleep -Milliseconds 500;'
+         ' (New-Object -ComObject WScript.Shell).AppActivate("Word")'],
+        creationflags=0x08000000
+    )
+    return jsonify({'message': 'Opened in Word'})
+
+
+
+
+@bp.route('/api/search_replace', methods=['POST'])
+def search_replace():
+    """Search and replace text in one or all text columns (deferred until Save)."""
+    try:
+        data = request.json
+        search = data.get('search', '')
+        replace = data.get('replace', '')
+        column = data.get('column', 'all')
+        case_sensitive = data.get('case_sensitive', False)
+        mode = data.get('mode', 'find')  # 'find' or 'replace'
+
+        if not search:
+            return jsonify({'error': 'Search text is required'}), 400
+
+        text_fields = {
+            'canvas_name', 'canvas_address', 'canvas_city', 'canvas_state', 'canvas_zip',
+            'recommendation', 'how_to_process', 'memo', 'address_reason'
+        }
+
+        if column == 'all':
+            cols_to_search = list(text_fields)
+        elif column in text_fields:
+            cols_to_search = [column]
+        else:
+            return jsonify({'error': f'Column "{column}" is not searchable'}), 400
+
+        # Find only reads a snapshot; replace edits the live frame under the write lock
+        ctx = nullcontext(store.snapshot().df) if mode == 'find' else store.write(columns=cols_to_search)
+        with ctx as df_full:
+            if df_full.empty:
+                return jsonify({'matches': 0, 'rows': 0})
+
+            # Restrict to visible/filtered rows if provided: explicit row ids, or the
+            # /api/matches filter params (grid in infinite mode only holds a few blocks)
+            row_ids = data.get('row_ids')
+            if row_ids is not None:
+                df = df_full.loc[df_full.index.isin(row_ids)]
+            elif data.get('filters') is not None:
+                df = _apply_filters(df_full, MultiDict(data['filters']))
+            else:
+                df = df_full
+
+            # Count matches
+            match_count = 0
+            match_rows = set()
+            for col in cols_to_search:
+                if col not in df.columns:
+                    continue
+                series = df[col].astype(str).fillna('')
+                if case_sensitive:
+                    mask = series.str.contains(search, case=True, na=False, regex=False)
+                else:
+                    mask = series.str.contains(search, case=False, na=False, regex=False)
+                hits = mask.sum()
+                match_count += hits
+                match_rows.update(df.index[mask].tolist())
+
+            if mode == 'find':
+                return jsonify({'matches': int(match_count), 'rows': len(match_rows)})
+
+            # Replace mode
+            if not match_rows:
+                return jsonify({'replaced': 0, 'rows': 0, 'pending_count': len(store.pending)})
+
+            replaced_count = 0
+            replaced_rows = set()
+            for col in cols_to_search:
+                if col not in df.columns:
+                    continue
+                for idx in list(match_rows):
+                    old_raw = df_full.at[idx, col]
+                    old_val = str(old_raw) if pd.notna(old_raw) else ''
+                    if case_sensitive:
+                        if search not in old_val:
+                            continue
+                        new_val = old_val.replace(search, replace)
+                    else:
+                        # Case-insensitive replace
+                        import re
+                        new_val = re.sub(re.escape(search), replace, old_val, flags=re.IGNORECASE)
+                        if new_val == old_val:
+                            continue
+
+                    df_full.at[idx, col] = new_val
+                    if col == 'recommendation':
+                        _stats_recommendation_changed([old_raw], [new_val])
+                    replaced_count += 1
+                    replaced_rows.add(idx)
+
+                    # Track in pending changes
+                    store.record_pending(idx, col, old_val, new_val)
+
+            return jsonify({
+                'replaced': replaced_count,
+                'rows': len(replaced_rows),
+                'pending_count': len(store.pending)
+            })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# Fields an import file may set, keyed to the coercion applied to each cell
+IMPORT_FIELDS = {
+    'jib': 'flag', 'rev': 'flag', 'vendor': 'flag',
+    'how_to_process': 'text', 'memo': 'text', 'recommendation': 'text',
+}
+
+_FLAG_WORDS = {'y': 1, 'yes': 1, 'true': 1, 'x': 1, 'n': 0, 'no': 0, 'false': 0}
+
+
+def _read_import_frame(data):
+    """Build the import DataFrame from an uploaded CSV/XLSX file or a JSON payload.
+
+    JSON payloads are either {rows: [{canvas_id, <field>: value, ...}, ...]} or the
+    legacy {field, canvas_ids} form, which sets that flag to 1 for every listed ID.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        name = (upload.filename or '').lower()
+        if name.endswith(('.xlsx', '.xls')):
+            imp = pd.read_excel(upload, dtype=str)
+        else:
+            imp = pd.read_csv(upload, dtype=str, keep_default_na=False, na_values=[''])
+        imp.columns = [str(c).strip().lower() for c in imp.columns]
+        return imp
+
+    if data.get('rows') is not None:
+        imp = pd.DataFrame(data['rows'])
+        imp.columns = [str(c).strip().lower() for c in imp.columns]
+        return imp
+
+    field = data.get('field')
+    if field not in ('jib', 'rev', 'vendor'):
+        raise ValueError('Invalid field')
+    return pd.DataFrame({'canvas_id': data.get('canvas_ids', []), field: 1})
+
+
+def _coerce_import_column(values, kind):
+    """Coerce one import column; returns (values, valid_mask). Blank cells are never valid."""
+    present = values.notna() & (values.astype(str).str.strip() != '')
+    if kind == 'text':
+        return values.astype(str).str.strip(), present
+    words = values.astype(str).str.strip().str.lower().map(_FLAG_WORDS)
+    flags = words.fillna(pd.to_numeric(values, errors='coerce'))
+    return flags, present & flags.isin([0, 1])
+
+
+@bp.route('/api/import_ids', methods=['POST'])
+def import_ids():
+    """Import a classification file keyed by canvas_id — updates in-memory only (pending until Save).
+
+    Every allowed field column present in the file is applied in one join against
+    the cached frame; blank cells leave the existing value untouched.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            imp = _read_import_frame(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if 'canvas_id' not in imp.columns:
+            return jsonify({'error': 'Import file must have a canvas_id column'}), 400
+        fields = [c for c in imp.columns if c in IMPORT_FIELDS]
+        if not fields:
+            return jsonify({'error': 'No importable fields in file. Allowed: '
+                                     + ', '.join(sorted(IMPORT_FIELDS))}), 400
+
+        # Blank id cells read as NaN/None; drop them before the cast turns them into 'nan'
+        imp = imp[imp['canvas_id'].notna()].copy()
+        imp['canvas_id'] = imp['canvas_id'].astype(str).str.strip()
+        imp = imp[imp['canvas_id'] != '']
+        if imp.empty:
+            return jsonify({'error': 'No Canvas IDs provided'}), 400
+        # Later lines in the file win over earlier ones for the same canvas_id
+        imp = imp.drop_duplicates('canvas_id', keep='last')[['canvas_id'] + fields].copy()
+
+        # Coerce each field once per file row; invalid cells are dropped, blanks skipped
+        invalid = 0
+        for field in fields:
+            raw = imp[field]
+            values, valid = _coerce_import_column(raw, IMPORT_FIELDS[field])
+            invalid += int((raw.notna() & (raw.astype(str).str.strip() != '') & ~valid).sum())
+            imp[field] = values.where(valid)
+
+        with store.write(columns=fields) as df:
+            # One join maps every file row onto all frame rows sharing its canvas_id
+            keys = pd.DataFrame({'canvas_id': df['canvas_id'].astype(str).str.strip(),
+                                 '_row_id': df.index})
+            joined = keys.merge(imp, on='canvas_id', how='inner')
+            unmatched = int((~imp['canvas_id'].isin(joined['canvas_id'])).sum())
+
+            changed_rows = set()
+            field_counts = {}
+            for field in fields:
+                present = joined[field].notna()
+                row_ids = joined.loc[present, '_row_id'].to_numpy()
+                new_vals = joined.loc[present, field]
+                if IMPORT_FIELDS[field] == 'flag':
+                    new_vals = new_vals.astype(int)
+                new_vals = new_vals.to_numpy()
+                old_vals = df.loc[row_ids, field].to_numpy()
+
+                if IMPORT_FIELDS[field] == 'flag':
+                    changed = old_vals != new_vals
+                else:
+                    changed = pd.Series(old_vals).fillna('').astype(str).to_numpy() != new_vals
+                row_ids, old_vals, new_vals = row_ids[changed], old_vals[changed], new_vals[changed]
+                if len(row_ids) == 0:
+                    continue
+
+                # Update in-memory DataFrame only (vectorized)
+                df.loc[row_ids, field] = new_vals
+                if field == 'recommendation':
+                    _stats_recommendation_changed(old_vals.tolist(), new_vals.tolist())
+
+                # Track as pending with (old_value, new_value)
+                for rid, old, new in zip(row_ids.tolist(), old_vals.tolist(), new_vals.tolist()):
+                    store.record_pending(rid, field, '' if pd.isna(old) else old, new)
+                field_counts[field] = len(row_ids)
+                changed_rows.update(row_ids.tolist())
+            applicable = int(joined[fields].notna().any(axis=1).sum())
+            pending_count = len(store.pending)
+
+        skipped = []
+        if unmatched:
+            skipped.append(f'{unmatched} Canvas IDs not found')
+        if invalid:
+            skipped.append(f'{invalid} invalid values')
+        if not applicable:
+            # Nothing in the file could be applied: report why instead of "up to date"
+            return jsonify({
+                'error': 'Nothing imported: ' + ('; '.join(skipped) or 'no values to apply'),
+                'updated': 0,
+                'matched': len(joined),
+                'unmatched_ids': unmatched,
+                'invalid_values': invalid,
+                'total_in_file': len(imp),
+            }), 400
+        if not changed_rows:
+            message = f'No new changes. {len(joined)} matching records already up to date.'
+        else:
+            summary = ', '.join(f'{f.upper()} ({n})' for f, n in field_counts.items())
+            message = f'Updated {summary} on {len(changed_rows)} records (unsaved)'
+        if skipped:
+            message += f" (skipped {', '.join(skipped)})"
+
+        return jsonify({
+            'success': True,
+            'updated': len(changed_rows),
+            'fields': field_counts,
+            'matched': len(joined),
+            'unmatched_ids': unmatched,
+            'invalid_values': invalid,
+            'total_in_file': len(imp),
+            'pending_count': pending_count,
+            'message': message
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/save_changes', methods=['POST'])
+def save_changes():
+    """Persist all pending changes to Snowflake"""
+    changes = None
+    try:
+        with _save_lock:
+            # Detach the batch under the write lock; edits made during the
+            # Snowflake round trip go into a fresh batch for the next save
+            with store.write() as df:
+                if not store.pending:
+                    return jsonify({'success': True, 'saved': 0, 'pending_count': 0,
+                                    'message': 'Nothing to save'})
+                changes = store.take_pending()
+                batch_loaded_at = store.loaded_at
+                if APP_ROLE == 'writer':
+                    # Readers keep showing these values whether or not the save succeeds
+                    for rid, fields in changes.items():
+                        saved = _shared_saved_edits.setdefault(rid, {})
+                        for field, (_old, new) in fields.items():
+                            saved[field] = new
+                keys = df.loc[list(changes), ['canvas_id', 'canvas_ssn']].copy()
+            now = datetime.now()
+
+            # Build audit log entries from pending changes
+            log_entries = []
+            for row_id, fields in changes.items():
+                cid = str(keys.at[row_id, 'canvas_id'])
+                ssn = str(keys.at[row_id, 'canvas_ssn'])
+                for field, change in fields.items():
+                    if isinstance(change, tuple):
+                        old_val, new_val = change
+                    else:
+                        old_val, new_val = '', change
+                    log_entries.append((cid, ssn, field, str(old_val), str(new_val), now))
+
+            # Single connection + single commit for both operations
+            backend = get_backend(DATA_CONFIG)
+            with metrics.span('save.transaction'):
+                with backend.transaction() as tx:
+                    with metrics.span('save.merge'):
+                        affected = backend.merge_changes(changes, keys, tx=tx)
+                    with metrics.span('save.audit_log'):
+                        backend.write_audit_log(log_entries, tx=tx)
+
+        saved_count = len(changes)
+        _audit_log_cache.invalidate()
+        with store.read():
+            pending_count = len(store.pending)
+
+        return jsonify({
+            'success': True,
+            'saved': saved_count,
+            'pending_count': pending_count,
+            'message': f'Saved {saved_count} record(s) to {DATA_CONFIG["name"]} ({affected} rows updated)'
+        })
+
+    except Exception as e:
+        if changes:
+            # Nothing was committed; put the batch back so the user can retry
+            # (unless a reload replaced the frame the row ids refer to)
+            with store.write():
+                if store.loaded_at == batch_loaded_at:
+                    store.restore_pending(changes)
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/reload', methods=['POST'])
+def reload_data():
+    """Force reload data from the configured source (clears in-memory and lookup caches)"""
+    try:
+        _ba_config_cache.invalidate()
+        _audit_log_cache.invalidate()
+        df = load_cached_data(force_reload=True)
+        return jsonify({
+            'success': True,
+            'records': len(df),
+            'message': f'Reloaded {len(df):,} records from {DATA_CONFIG.get("name", DATA_CONFIG.get("source_type", "source"))}'
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/update_log')
+def get_update_log():
+    """View recent update history from the data source"""
+    try:
+        rows = _audit_log_cache.get(
+            100, lambda: get_backend(DATA_CONFIG).read_audit_log(limit=100), default=None
+        )
+        if rows is None:
+            return jsonify({'error': 'Update log unavailable, retrying shortly'}), 503
+        return jsonify(rows)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/cache_stats')
+def get_cache_stats():
+    """Hit/miss counters for the lookup caches, plus data source (connection pool) stats"""
+    return jsonify({
+        'lookups': [_ba_config_cache.stats(), _audit_log_cache.stats()],
+        'records': _record_cache.stats(),
+        'backend': get_backend(DATA_CONFIG).stats(),
+    })
+
+
+@bp.route('/api/metrics')
+def get_metrics():
+    """Request and stage timings in the Prometheus text format (requires APP_METRICS=1)"""
+    if not metrics.ENABLED:
+        return jsonify({'error': 'Metrics are disabled; set APP_METRICS=1 to enable'}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+def _grid_row_model():
+    """Row model the grid should use for the loaded table (see GRID_ROW_MODEL)."""
+    if GRID_ROW_MODEL != 'auto':
+        return GRID_ROW_MODEL
+    df = store.df
+    return 'infinite' if df is not None and len(df) > GRID_INFINITE_ROWS else 'clientSide'
+
+
+@bp.route('/api/load_status')
+def get_load_status():
+    """Progress of the background data load (state, phase, rows loaded/total)"""
+    if not store.ready:
+        # Polling clients restart a failed load once its retry backoff has passed
+        store.load_in_background()
+    status = store.load_status()
+    status['row_model'] = _grid_row_model()
+    status['client_cache'] = GRID_CLIENT_CACHE
+    return jsonify(status)
+
+
+@bp.route('/api/datasources')
+def get_datasources():
+    """Return the active data source info"""
+    source_type = DATA_CONFIG.get('source_type', 'snowflake')
+    return jsonify({
+        'datasources': [{
+            'id': source_type,
+            'name': DATA_CONFIG.get('name', 'Snowflake'),
+            'type': source_type
+        }],
+        'active': source_type
+    })
@@ -0,0 +1,85 @@
+"""
+Production Server
+Runs the app under a production WSGI server instead of the Flask dev server.
+
+    python serve.py                  # waitress: one process, --threads request threads
+    python serve.py --workers 4      # one writer process + 4 gunicorn reader workers (POSIX)
+
+With --workers > 1 only the writer loads from Snowflake; it publishes the frame as
+memory-mapped columns under --shared-dir, reader workers attach to it read-only and
+forward every edit to the writer over localhost (see shared_frame.py).
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Serve the BA review app')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8, help='Request threads per process')
+    parser.add_argument('--workers', type=int, default=1, help='Reader worker processes (gunicorn)')
+    parser.add_argument('--writer-port', type=int, default=5001, help='Localhost port of the writer process')
+    parser.add_argument('--shared-dir', default=os.path.join(tempfile.gettempdir(), 'ba_review_frame'),
+                        help='Directory for the published frame')
+    parser.add_argument('--role', choices=('standalone', 'writer'), default='standalone',
+                        help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def _serve_in_process(args):
+    """Standalone or writer: serve with waitress while the data loads in the background."""
+    os.environ['APP_ROLE'] = args.role
+    if args.role == 'writer':
+        os.environ['APP_SHARED_DIR'] = args.shared_dir
+    from waitress import serve
+    from app import create_app
+    app = create_app()
+    from routes import start_background_load
+
+    start_background_load()
+    host = '127.0.0.1' if args.role == 'writer' else args.host
+    print(f'  Serving on http://{host}:{args.port} ({args.threads} threads, role={args.role})')
+    serve(app, host=host, port=args.port, threads=args.threads)
+
+
+def _serve_workers(args):
+    """Start the writer and the gunicorn readers; readers answer 503 until the writer publishes."""
+    if os.name == 'nt':
+        sys.exit('--workers > 1 needs gunicorn, which does not run on Windows. '
+                 'Use the default single-process mode with --threads instead.')
+    # A frame or overlay left over from an earlier run must not be mistaken for this one
+    shutil.rmtree(args.shared_dir, ignore_errors=True)
+
+    writer = subprocess.Popen([
+        sys.executable, os.path.abspath(__file__), '--role', 'writer',
+        '--port', str(args.writer_port), '--threads', str(args.threads),
+        '--shared-dir', args.shared_dir,
+    ])
+    try:
+        env = dict(os.environ, APP_ROLE='reader', APP_SHARED_DIR=args.shared_dir,
+                   APP_WRITER_URL=f'http://127.0.0.1:{args.writer_port}')
+        readers = subprocess.Popen([
+            sys.executable, '-m', 'gunicorn', 'wsgi:app',
+            '--workers', str(args.workers), '--threads', str(args.threads),
+            '--worker-class', 'gthread', '--bind', f'{args.host}:{args.port}',
+            '--timeout', '600',
+        ], env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+        readers.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.terminate()
+        writer.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    args = _parse_args()
+    if args.workers > 1 and args.role == 'standalone':
+        _serve_workers(args)
+    else:
+        _serve_in_process(args)
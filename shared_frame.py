@@ -0,0 +1,345 @@
+"""
+Shared Columnar Frame
+Publishes the normalized match DataFrame as memory-mapped column files so several
+worker processes can attach to one copy, plus a small overlay of the edits made
+on top of it by the single writer process
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_CURRENT = 'current.json'
+_OVERLAY = 'overlay.json'
+
+# FrameReplica.refresh() result: (frame, pending, changes)
+ReplicaUpdate = Tuple[pd.DataFrame, Dict[Any, Dict[str, tuple]], Optional[List[Tuple[Any, str, Any, Any]]]]
+
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    """Write JSON atomically so readers never see a half-written file."""
+    tmp = f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, default=str)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _plain(value):
+    """JSON-safe scalar for a dictionary-encoded category."""
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _codes_dtype(categories: int) -> np.dtype:
+    """Smallest code type pandas keeps as-is for this many categories, so
+    Categorical.from_codes can wrap the mapped file instead of converting it."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _factorize(series: pd.Series):
+    """Codes and sorted categories (first-seen order when values don't compare), so
+    sorting the categorical matches sorting the strings."""
+    try:
+        return pd.factorize(series, sort=True, use_na_sentinel=True)
+    except TypeError:
+        return pd.factorize(series, use_na_sentinel=True)
+
+
+def publish_frame(df: pd.DataFrame, directory: str, version: int = 0) -> Tuple[int, str]:
+    """
+    Write df as one .npy file per column into a new generation directory and point
+    current.json at it. Numeric and datetime columns are stored as-is; object columns
+    are dictionary-encoded as integer codes + a JSON category list. Readers mmap both
+    zero-copy. `version` is the writer's data version the frame was taken at.
+
+    Returns (generation, epoch): the epoch names this publication, unlike generation
+    numbers, which start over when a new server run clears the directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    current = _read_json(os.path.join(directory, _CURRENT)) or {}
+    generation = current.get('generation', 0) + 1
+    gen_dir = os.path.join(directory, f'gen-{generation}')
+    os.makedirs(gen_dir, exist_ok=True)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {'name': col, 'file': f'c{i}.npy'}
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = _factorize(series)
+            np.save(os.path.join(gen_dir, entry['file']), codes.astype(_codes_dtype(len(uniques))))
+            entry['kind'] = 'dict'
+            entry['categories'] = [_plain(v) for v in uniques]
+        else:
+            np.save(os.path.join(gen_dir, entry['file']), series.to_numpy())
+            entry['kind'] = 'array'
+        columns.append(entry)
+
+    epoch = f'{generation}-{time.time_ns():x}'
+    _write_json(os.path.join(gen_dir, 'manifest.json'), {
+        'generation': generation,
+        'epoch': epoch,
+        'version': version,
+        'rows': len(df),
+        'index': [df.index.start, df.index.stop, df.index.step] if isinstance(df.index, pd.RangeIndex) else None,
+        'columns': columns,
+    })
+    if not isinstance(df.index, pd.RangeIndex):
+        np.save(os.path.join(gen_dir, 'index.npy'), df.index.to_numpy())
+    _write_json(os.path.join(directory, _CURRENT), {'generation': generation, 'published_at': time.time()})
+
+    # Older generations are only kept while some reader may still be mapping them
+    for name in os.listdir(directory):
+        if name.startswith('gen-') and name != f'gen-{generation}' and name != f'gen-{generation - 1}':
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    return generation, epoch
+
+
+def current_generation(directory: str) -> Optional[int]:
+    """Generation number of the latest published frame, or None if nothing is published yet."""
+    current = _read_json(os.path.join(directory, _CURRENT))
+    return current['generation'] if current else None
+
+
+def attach_frame(directory: str, generation: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Open a published frame read-only: (frame, manifest), the manifest giving its
+    generation, epoch and the writer version it was taken at. Every column stays
+    memory-mapped, so its pages are shared by all processes attached to the same
+    generation; string columns become Categoricals over the mapped codes (only the
+    category values are held per process).
+    """
+    if generation is None:
+        generation = current_generation(directory)
+        if generation is None:
+            raise FileNotFoundError(f'No frame published in {directory}')
+    gen_dir = os.path.join(directory, f'gen-{generation}')
+    manifest = _read_json(os.path.join(gen_dir, 'manifest.json'))
+
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(os.path.join(gen_dir, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'dict':
+            # Code -1 is missing; the writer already checked the codes
+            categories = pd.Index(entry['categories'], dtype=object)
+            data[entry['name']] = pd.Categorical.from_codes(values, categories=categories, validate=False)
+        else:
+            data[entry['name']] = values
+
+    if manifest['index'] is not None:
+        index = pd.RangeIndex(*manifest['index'])
+    else:
+        index = pd.Index(np.load(os.path.join(gen_dir, 'index.npy'), allow_pickle=True))
+    df = pd.DataFrame(data, index=index, copy=False)
+    return df, manifest
+
+
+def publish_overlay(directory: str, generation: int, version: int,
+                    edits: Dict[Any, Dict[str, Any]],
+                    pending: Dict[Any, Dict[str, tuple]]) -> None:
+    """
+    Publish the edits made on top of a frame generation.
+
+    edits: {row_id: {field: value}} already saved since the frame was published
+    pending: {row_id: {field: (old_value, new_value)}} not yet saved
+    """
+    _write_json(os.path.join(directory, _OVERLAY), {
+        'generation': generation,
+        'version': version,
+        'edits': {str(rid): fields for rid, fields in edits.items()},
+        'pending': {str(rid): {f: list(c) for f, c in fields.items()} for rid, fields in pending.items()},
+    })
+
+
+def read_overlay(directory: str) -> Optional[Dict[str, Any]]:
+    """The latest overlay with integer row ids and (old, new) tuples, or None."""
+    overlay = _read_json(os.path.join(directory, _OVERLAY))
+    if overlay is None:
+        return None
+    overlay['edits'] = {int(rid): fields for rid, fields in overlay['edits'].items()}
+    overlay['pending'] = {
+        int(rid): {f: tuple(c) for f, c in fields.items()}
+        for rid, fields in overlay['pending'].items()
+    }
+    return overlay
+
+
+def _overlay_cells(overlay: Optional[Dict[str, Any]]) -> Dict[str, Dict[Any, Any]]:
+    """{field: {row_id: value}} an overlay sets; pending values win over saved ones."""
+    cells: Dict[str, Dict[Any, Any]] = {}
+    if not overlay:
+        return cells
+    for rid, fields in overlay['edits'].items():
+        for field, value in fields.items():
+            cells.setdefault(field, {})[rid] = value
+    for rid, fields in overlay['pending'].items():
+        for field, (_old, new) in fields.items():
+            cells.setdefault(field, {})[rid] = new
+    return cells
+
+
+def _same(a, b) -> bool:
+    return a == b or (pd.isna(a) and pd.isna(b))
+
+
+def _set_positions(series: pd.Series, positions: np.ndarray, values: List[Any]):
+    """Copy of a column with values written at positions. Categoricals copy only their
+    codes (new values become categories); other columns copy their array."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cat = series.array
+        new = [v for v in dict.fromkeys(values) if not pd.isna(v) and v not in cat.categories]
+        if new:
+            categories = list(cat.categories) + new
+            try:
+                categories.sort()
+            except TypeError:
+                pass
+            cat = cat.set_categories(pd.Index(categories, dtype=object))
+        else:
+            cat = cat.copy()
+        cat[positions] = values
+        return cat
+    col = series.to_numpy(copy=True)
+    if col.dtype != object and not all(isinstance(v, (int, float)) for v in values):
+        col = col.astype(object)
+    col[positions] = np.array(values, dtype=object)
+    return col
+
+
+def _with_cells(df: pd.DataFrame, cells: Dict[str, Dict[Any, Any]]) -> pd.DataFrame:
+    """New frame with cells ({field: {row_id: value}}) set. Only the edited columns
+    are copied; the rest keep pointing at df's (shared) arrays."""
+    out = df.copy(deep=False)
+    for field, values in cells.items():
+        if field not in df.columns or not values:
+            continue
+        positions = df.index.get_indexer(list(values))
+        keep = positions >= 0
+        kept = [v for v, k in zip(values.values(), keep) if k]
+        out[field] = _set_positions(df[field], positions[keep], kept)
+    return out
+
+
+def apply_overlay(base: pd.DataFrame, overlay: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    """New frame with the overlay applied on top of a published base frame."""
+    return _with_cells(base, _overlay_cells(overlay))
+
+
+class FrameReplica:
+    """
+    Read-only view of a published frame for a worker process.
+
+    refresh() is cheap when nothing changed (two small file reads). It re-attaches
+    when a new generation is published; when only the overlay moved it writes just the
+    cells that changed since the previous refresh into a shallow copy of the last
+    frame. Request threads share one replica: `lock` serializes refreshes, and callers
+    hold it while applying a result so updates reach the DataStore in order.
+
+    `epoch` (the attached publication) and `version` (the writer's data version) label
+    the state last returned, so data versions mean the same in every worker.
+    """
+
+    def __init__(self, directory: str, wait: float = 600.0):
+        self.directory = directory
+        self.wait = wait
+        self.lock = threading.RLock()
+        self._base: Optional[pd.DataFrame] = None
+        self._frame: Optional[pd.DataFrame] = None
+        self._cells: Dict[str, Dict[Any, Any]] = {}
+        self._generation: Optional[int] = None
+        self._overlay_key: Optional[Tuple[int, int]] = None
+        self.epoch = ''
+        self.version = 0
+        self._base_version = 0
+
+    @property
+    def generation(self) -> Optional[int]:
+        """Frame generation currently attached (None before the first refresh)."""
+        return self._generation
+
+    def available(self) -> bool:
+        """True once the writer has published a frame."""
+        return self._generation is not None or current_generation(self.directory) is not None
+
+    def _wait_for_frame(self) -> int:
+        deadline = time.monotonic() + self.wait
+        while True:
+            generation = current_generation(self.directory)
+            if generation is not None:
+                return generation
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'No frame published in {self.directory} after {self.wait:.0f}s')
+            time.sleep(0.5)
+
+    def refresh(self, force: bool = False) -> Optional[ReplicaUpdate]:
+        """
+        (frame, pending, changes) when the published state moved since the last call
+        (or force), else None. changes lists the (row_id, field, old, new) cells edited
+        since the previous frame, or is None when the frame was (re)attached or forced.
+        """
+        with self.lock:
+            changes: Optional[List[Tuple[Any, str, Any, Any]]] = None if force else []
+            if force:
+                self._overlay_key = None
+            generation = self._wait_for_frame()
+            if generation != self._generation:
+                self._base, manifest = attach_frame(self.directory, generation)
+                self._generation, self.epoch = generation, manifest['epoch']
+                self._base_version = manifest['version']
+                self._frame, self._cells = self._base, {}
+                self._overlay_key = None
+                changes = None
+
+            overlay = read_overlay(self.directory)
+            if overlay is not None and overlay['generation'] != self._generation:
+                overlay = None  # Overlay for a frame we haven't attached to yet
+            key = (self._generation, overlay['version'] if overlay else 0)
+            if key == self._overlay_key:
+                return None
+            self._overlay_key = key
+            self.version = max(self._base_version, overlay['version'] if overlay else 0)
+
+            # Cells whose value differs from the last frame: new or changed overlay
+            # values, and cells that left the overlay (back to the base value)
+            cells = _overlay_cells(overlay)
+            moved: Dict[str, Dict[Any, Any]] = {}
+            for field, values in cells.items():
+                applied = self._cells.get(field, {})
+                for rid, value in values.items():
+                    if rid not in applied or not _same(applied[rid], value):
+                        moved.setdefault(field, {})[rid] = value
+            for field, applied in self._cells.items():
+                if field not in self._base.columns:
+                    continue
+                for rid in applied.keys() - cells.get(field, {}).keys():
+                    moved.setdefault(field, {})[rid] = self._base.at[rid, field]
+
+            frame = _with_cells(self._frame, moved)
+            if changes is not None:
+                for field, values in moved.items():
+                    if field not in frame.columns:
+                        continue
+                    for rid, value in values.items():
+                        if rid in frame.index:
+                            changes.append((rid, field, self._frame.at[rid, field], value))
+            self._frame, self._cells = frame, cells
+            return frame, (overlay['pending'] if overlay else {}), changes
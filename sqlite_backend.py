@@ -0,0 +1,179 @@
+"""
+SQLite Data Backend
+Local stand-in for Snowflake with the same load / MERGE / UPDATE_LOG / BA_CONFIG
+behaviour, so the whole app can be run and benchmarked offline
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import metrics
+from data_loader import DataBackend, DataSource, merge_source_rows, read_table_chunked
+
+# Columns the app may add to an existing match table (same set as ensure_snowflake_schema)
+_EXTRA_COLUMNS = {
+    'jib': 'INTEGER DEFAULT 0',
+    'rev': 'INTEGER DEFAULT 0',
+    'vendor': 'INTEGER DEFAULT 0',
+    'memo': "TEXT DEFAULT ''",
+    'how_to_process': "TEXT DEFAULT ''",
+}
+
+
+class SQLiteBackend(DataBackend):
+    """
+    One SQLite file holding the match table, UPDATE_LOG and BA_CONFIG.
+
+    Connections are opened per operation (cheap for SQLite, and sqlite3
+    connections must not cross threads). WAL mode lets loads run while a save
+    is writing.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.path = config.get('path') or 'data/import_merge_matches.db'
+        self.table = config.get('table', 'import_merge_matches')
+        self._lock = threading.Lock()
+        self.metrics = {'connections': 0, 'merges': 0, 'rows_merged': 0, 'audit_rows': 0}
+
+    def connect(self) -> sqlite3.Connection:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"SQLite database not found: {self.path} (create one with benchmarks/generate_data.py)")
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock:
+            self.metrics['connections'] += 1
+        return conn
+
+    def load(self, progress=None):
+        report = progress or (lambda phase, rows_loaded=None, rows_total=None: None)
+        report('connecting')
+        conn = self.connect()
+        try:
+            df = read_table_chunked(conn, self.table, report)
+        finally:
+            conn.close()
+        report('normalizing', len(df))
+        with metrics.span('load.normalize'):
+            df.columns = df.columns.str.lower()
+            return DataSource._normalize_dataframe(df)
+
+    def ensure_schema(self):
+        conn = self.connect()
+        try:
+            existing = {row[1].lower() for row in conn.execute(f"PRAGMA table_info({self.table})")}
+            if not existing:
+                raise ValueError(f"Table {self.table} not found in {self.path}")
+            for col, col_type in _EXTRA_COLUMNS.items():
+                if col not in existing:
+                    conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {col} {col_type}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_key ON {self.table} (canvas_id, canvas_ssn)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS UPDATE_LOG (
+                    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    CANVAS_ID TEXT,
+                    CANVAS_SSN TEXT,
+                    FIELD_NAME TEXT,
+                    OLD_VALUE TEXT,
+                    NEW_VALUE TEXT,
+                    UPDATED_AT TEXT,
+                    CREATED_AT TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS BA_CONFIG (
+                    CATEGORY TEXT,
+                    CONFIG_KEY TEXT,
+                    CONFIG_VALUE TEXT
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connect()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def merge_changes(self, pending_changes, df, tx=None):
+        """Same semantics as the Snowflake MERGE: match on (canvas_id, canvas_ssn),
+        update only the fields edited on each row."""
+        if not pending_changes:
+            return 0
+        if tx is None:
+            with self.transaction() as conn:
+                return self.merge_changes(pending_changes, df, tx=conn)
+
+        all_fields, rows = merge_source_rows(pending_changes, df)
+        src_cols = ['cid', 'ssn'] + all_fields
+        tx.execute("DROP TABLE IF EXISTS temp._merge_src")
+        tx.execute(f"CREATE TEMP TABLE _merge_src ({', '.join(src_cols)})")
+        tx.executemany(f"INSERT INTO temp._merge_src VALUES ({', '.join('?' * len(src_cols))})",
+                       [[_sql_value(v) for v in row] for row in rows])
+        set_clause = ', '.join(f'{f} = COALESCE(s.{f}, {self.table}.{f})' for f in all_fields)
+        cursor = tx.execute(
+            f"UPDATE {self.table} SET {set_clause} FROM temp._merge_src AS s "
+            f"WHERE {self.table}.canvas_id = s.cid AND {self.table}.canvas_ssn = s.ssn"
+        )
+        tx.execute("DROP TABLE temp._merge_src")
+        with self._lock:
+            self.metrics['merges'] += 1
+            self.metrics['rows_merged'] += cursor.rowcount
+        return cursor.rowcount
+
+    def write_audit_log(self, log_entries: List[Tuple], tx=None):
+        if not log_entries:
+            return
+        if tx is None:
+            with self.transaction() as conn:
+                return self.write_audit_log(log_entries, tx=conn)
+        tx.executemany(
+            """INSERT INTO UPDATE_LOG (CANVAS_ID, CANVAS_SSN, FIELD_NAME, OLD_VALUE, NEW_VALUE, UPDATED_AT)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [[_sql_value(v) for v in entry] for entry in log_entries]
+        )
+        with self._lock:
+            self.metrics['audit_rows'] += len(log_entries)
+
+    def read_audit_log(self, limit=100):
+        conn = self.connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM UPDATE_LOG ORDER BY UPDATED_AT DESC, ID DESC LIMIT ?",
+                                (int(limit),)).fetchall()
+        finally:
+            conn.close()
+        return [{k.lower(): row[k] for k in row.keys()} for row in rows]
+
+    def read_config(self, category):
+        conn = self.connect()
+        try:
+            rows = conn.execute("SELECT CONFIG_KEY, CONFIG_VALUE FROM BA_CONFIG WHERE CATEGORY = ?",
+                                (category,)).fetchall()
+        finally:
+            conn.close()
+        return {k: v for k, v in rows}
+
+    def stats(self):
+        with self._lock:
+            return dict(super().stats(), path=self.path, **self.metrics)
+
+
+def _sql_value(value):
+    """sqlite3 only binds plain Python scalars; timestamps are stored as ISO text."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
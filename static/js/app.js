@@ -6,6 +6,14 @@ let pendingCount = 0;
 let allRowData = [];
 let activeRecFilter = '';
 let recConfig = {};
+// 'clientSide' (whole table in the browser) or 'infinite' (blocks from /api/matches); set by the server
+let gridRowModel = 'clientSide';
+// Keep the last table in IndexedDB between visits (server setting GRID_CLIENT_CACHE)
+let gridClientCache = false;
+let quickFilterText = '';
+// Row counts from the last block response (infinite row model)
+let infiniteCounts = { filtered: 0, total: 0 };
+var INFINITE_BLOCK_SIZE = 200;
 
 // Undo/Redo stacks
 var undoStack = [];
@@ -162,55 +170,289 @@ function toggleAllCols(show) {
     });
 }
 
+// ── Numeric column store ──
+// Score columns as Float32Arrays indexed by _row_id (NaN = blank), rebuilt whenever the
+// client-side rows arrive, so filters, score badges and sorting compare plain numbers
+var NUMERIC_COLS = ['ssn_match', 'name_score', 'address_score', 'nameaddrscore'];
+var numericColumns = {};
+
+function toNumber(v) {
+    return (v === '' || v === null || v === undefined) ? NaN : Number(v);
+}
+
+function buildNumericColumns(rows) {
+    var size = 0;
+    for (var i = 0; i < rows.length; i++) {
+        if (rows[i]._row_id >= size) size = rows[i]._row_id + 1;
+    }
+    var cols = {};
+    NUMERIC_COLS.forEach(function(field) {
+        var arr = new Float32Array(size).fill(NaN);
+        for (var i = 0; i < rows.length; i++) arr[rows[i]._row_id] = toNumber(rows[i][field]);
+        cols[field] = arr;
+    });
+    numericColumns = cols;
+}
+
+// Keep the store in step with rows changed in place (edits, partial refreshes)
+function updateNumericColumns(rows) {
+    if (!numericColumns[NUMERIC_COLS[0]]) return;
+    rows.forEach(function(row) {
+        var rid = row._row_id;
+        NUMERIC_COLS.forEach(function(field) {
+            if (!(field in row)) return;
+            var arr = numericColumns[field];
+            if (rid >= arr.length) {
+                var grown = new Float32Array(Math.max(rid + 1, arr.length * 2)).fill(NaN);
+                grown.set(arr);
+                arr = numericColumns[field] = grown;
+            }
+            arr[rid] = toNumber(row[field]);
+        });
+    });
+}
+
+// Value of a numeric field for a row, from the store when it holds the row
+function numericValue(field, data) {
+    var arr = numericColumns[field];
+    if (arr && data._row_id < arr.length) return arr[data._row_id];
+    return toNumber(data[field]);
+}
+
+// Sort comparator over the store; blanks sort below every score
+function numericComparator(field) {
+    return function(valueA, valueB, nodeA, nodeB) {
+        var a = numericValue(field, nodeA.data), b = numericValue(field, nodeB.data);
+        if (a !== a) return b !== b ? 0 : -1;
+        if (b !== b) return 1;
+        return a - b;
+    };
+}
+
+// ── Data worker (static/js/data_worker.js) ──
+// Fetches and decodes /api/matches_all (or catches up from its IndexedDB copy through
+// /api/matches_delta) and answers search/replace Find off the main thread; null when
+// Web Workers are unavailable, and everything then runs inline
+var DATA_WORKER_URL = '/static/js/data_worker.js';
+var dataWorker = null;
+var dataWorkerHasRows = false;
+var dataWorkerCallbacks = {};
+var dataWorkerSeq = 0;
+
+function startDataWorker() {
+    if (typeof Worker === 'undefined') return;
+    try {
+        dataWorker = new Worker(DATA_WORKER_URL);
+    } catch (e) {
+        console.error('Data worker unavailable:', e);
+        return;
+    }
+    dataWorker.onmessage = function(e) {
+        var callback = dataWorkerCallbacks[e.data.id];
+        // Cached rows are followed by a delta (or fresh rows) for the same request
+        if (!e.data.more) delete dataWorkerCallbacks[e.data.id];
+        if (callback) callback(e.data);
+    };
+    dataWorker.onerror = function(e) {
+        // Fall back to the main thread; pending requests see the error and retry inline
+        console.error('Data worker failed:', e.message);
+        var pending = dataWorkerCallbacks;
+        dataWorker = null;
+        dataWorkerHasRows = false;
+        dataWorkerCallbacks = {};
+        Object.keys(pending).forEach(function(id) { pending[id]({ type: 'error', error: e.message }); });
+    };
+}
+
+function dataWorkerRequest(msg, transfer, callback) {
+    msg.id = ++dataWorkerSeq;
+    dataWorkerCallbacks[msg.id] = callback;
+    dataWorker.postMessage(msg, transfer || []);
+}
+
+// Fetch and decode the whole table (in the worker when available), then callback(rows)
+// with the numeric column store already built. With the worker, callback may run twice
+// (cached rows, then fresh ones) and changed rows since the held copy go to onDelta(rows)
+function fetchAllRows(callback, onError, onDelta) {
+    if (!dataWorker) {
+        fetch('/api/matches_all')
+            .then(function(r) { return r.json(); })
+            .then(function(data) {
+                buildNumericColumns(data);
+                callback(data);
+            })
+            .catch(onError);
+        return;
+    }
+    var request = { type: 'load', url: '/api/matches_all', deltaUrl: '/api/matches_delta', persist: gridClientCache };
+    dataWorkerRequest(request, null, function(msg) {
+        if (msg.type === 'error') {
+            if (!dataWorker) fetchAllRows(callback, onError, onDelta);
+            else onError(new Error(msg.error));
+            return;
+        }
+        if (msg.type === 'delta') {
+            if (onDelta) onDelta(msg.rows);
+            return;
+        }
+        numericColumns = msg.numeric;
+        dataWorkerHasRows = true;
+        callback(msg.rows);
+    });
+}
+
+// Rows changed on the server since the grid's copy: update them in place
+function applyRowDelta(rows) {
+    if (!rows.length) return;
+    rows.forEach(function(row) { recordPrefetch.delete(row._row_id); });
+    updateNumericColumns(rows);
+    gridApi.applyTransaction({ update: rows });
+    updateGridInfo();
+}
+
 // ── External filter state ──
-function isExternalFilterPresent() {
-    if (activeRecFilter) return true;
-    if ($('#ssnFilter').val()) return true;
-    if ($('#minNameScore').val()) return true;
-    if ($('#maxNameScore').val()) return true;
-    if ($('#minAddrScore').val()) return true;
-    if ($('#maxAddrScore').val()) return true;
-    return false;
+// Predicate over row data built from the filter inputs by compileExternalFilter(), so a
+// filter pass reads no DOM; null when no external filter is set
+var externalFilter = null;
+
+function scoreRangeCheck(field, min, max) {
+    // Bounds rounded to float32 like the stored scores, so a score equal to a bound passes
+    var lo = min ? Math.fround(Number(min)) : -Infinity;
+    var hi = max ? Math.fround(Number(max)) : Infinity;
+    return function(data) {
+        // Blank scores are NaN and fail both comparisons
+        var v = numericValue(field, data);
+        return v >= lo && v <= hi;
+    };
 }
 
-function doesExternalFilterPass(node) {
-    var data = node.data;
+function compileExternalFilter() {
+    var checks = [];
 
     // Recommendation filter
-    if (activeRecFilter && data.recommendation !== activeRecFilter) return false;
+    var rec = activeRecFilter;
+    if (rec) checks.push(function(data) { return data.recommendation === rec; });
 
     // SSN filter
     var ssn = $('#ssnFilter').val();
-    if (ssn === 'yes' && data.ssn_match !== 100) return false;
-    if (ssn === 'no' && data.ssn_match !== 0) return false;
-    if (ssn === 'partial' && (data.ssn_match <= 0 || data.ssn_match >= 100)) return false;
+    if (ssn === 'yes') checks.push(function(data) { return numericValue('ssn_match', data) === 100; });
+    else if (ssn === 'no') checks.push(function(data) { return numericValue('ssn_match', data) === 0; });
+    else if (ssn === 'partial') checks.push(function(data) {
+        var v = numericValue('ssn_match', data);
+        return v > 0 && v < 100;
+    });
 
     // Score filters
-    var minName = $('#minNameScore').val();
-    if (minName && (data.name_score === '' || Number(data.name_score) < Number(minName))) return false;
-    var maxName = $('#maxNameScore').val();
-    if (maxName && (data.name_score === '' || Number(data.name_score) > Number(maxName))) return false;
-    var minAddr = $('#minAddrScore').val();
-    if (minAddr && (data.address_score === '' || Number(data.address_score) < Number(minAddr))) return false;
-    var maxAddr = $('#maxAddrScore').val();
-    if (maxAddr && (data.address_score === '' || Number(data.address_score) > Number(maxAddr))) return false;
+    var minName = $('#minNameScore').val(), maxName = $('#maxNameScore').val();
+    if (minName || maxName) checks.push(scoreRangeCheck('name_score', minName, maxName));
+    var minAddr = $('#minAddrScore').val(), maxAddr = $('#maxAddrScore').val();
+    if (minAddr || maxAddr) checks.push(scoreRangeCheck('address_score', minAddr, maxAddr));
+
+    if (checks.length === 0) { externalFilter = null; return; }
+    var n = checks.length;
+    externalFilter = function(data) {
+        for (var i = 0; i < n; i++) {
+            if (!checks[i](data)) return false;
+        }
+        return true;
+    };
+}
 
-    return true;
+function isExternalFilterPresent() {
+    return externalFilter !== null;
+}
+
+function doesExternalFilterPass(node) {
+    return externalFilter(node.data);
 }
 
 function onExternalFilterChanged() {
     if (!gridApi) return;
+    compileExternalFilter();
     gridApi.deselectAll();
     selectedRows.clear();
     updateSelectionInfo();
+    if (gridRowModel === 'infinite') {
+        // The server applies the filters; refetch from the first block
+        gridApi.purgeInfiniteCache();
+        return;
+    }
     gridApi.onFilterChanged();
     updateGridInfo();
 }
 
+function setQuickFilter(val) {
+    quickFilterText = val;
+    if (!gridApi) return;
+    if (gridRowModel === 'infinite') { onExternalFilterChanged(); return; }
+    gridApi.setGridOption('quickFilterText', val);
+    updateGridInfo();
+}
+
+// External filters (and the quick filter) as /api/matches query parameters
+function matchesQueryParams() {
+    var params = {};
+    if (activeRecFilter) params.recommendation = activeRecFilter;
+    var ssn = $('#ssnFilter').val();
+    if (ssn) params.ssn_match = ssn;
+    var ranges = { min_name_score: '#minNameScore', max_name_score: '#maxNameScore',
+                   min_addr_score: '#minAddrScore', max_addr_score: '#maxAddrScore' };
+    Object.keys(ranges).forEach(function(key) {
+        var val = $(ranges[key]).val();
+        if (val) params[key] = val;
+    });
+    if (quickFilterText) params['search[value]'] = quickFilterText;
+    return params;
+}
+
+// Infinite row model datasource: one /api/matches request per block
+var matchesDatasource = {
+    getRows: function(params) {
+        var query = matchesQueryParams();
+        query.startRow = params.startRow;
+        query.endRow = params.endRow;
+        if (params.sortModel.length) {
+            query.sort = params.sortModel.map(function(s) { return s.colId + ':' + s.sort; }).join(',');
+        }
+        if (params.startRow === 0) performance.mark('grid:fetch-start');
+        fetch('/api/matches?' + $.param(query))
+            .then(function(r) { return r.json(); })
+            .then(function(data) {
+                if (data.error) throw new Error(data.error);
+                infiniteCounts = { filtered: data.recordsFiltered, total: data.recordsTotal };
+                params.successCallback(data.data, data.recordsFiltered);
+                updateGridInfo();
+                if (params.startRow === 0 && !performance.getEntriesByName('grid:first-row').length) {
+                    performance.mark('grid:data-set');
+                    requestAnimationFrame(function() { performance.mark('grid:first-row'); });
+                }
+            })
+            .catch(function(err) {
+                console.error('Failed to load rows:', err);
+                params.failCallback();
+                showToast('Failed to load data', 'error');
+            });
+    }
+};
+
+// Rows currently displayed (client-side: after filter and sort; infinite: the loaded blocks)
+function forEachDisplayedNode(callback) {
+    if (gridRowModel === 'infinite') {
+        gridApi.forEachNode(function(node) { if (node.data) callback(node); });
+    } else {
+        gridApi.forEachNodeAfterFilterAndSort(callback);
+    }
+}
+
 function updateGridInfo() {
     if (!gridApi) return;
-    var displayed = 0;
-    gridApi.forEachNodeAfterFilterAndSort(function() { displayed++; });
+    if (gridRowModel === 'infinite') {
+        $('#gridInfo').text('Showing ' + infiniteCounts.filtered.toLocaleString() + ' of ' +
+                            infiniteCounts.total.toLocaleString() + ' records');
+        return;
+    }
+    // No row grouping, so the displayed rows are exactly the filter result
+    var displayed = gridApi.getDisplayedRowCount();
     var total = allRowData.length;
     $('#gridInfo').text('Showing ' + displayed.toLocaleString() + ' of ' + total.toLocaleString() + ' records');
 }
@@ -224,10 +466,11 @@ function ssnCellRenderer(params) {
 function scoreCellRenderer(params) {
     var val = params.value;
     if (val === '' || val === null || val === undefined) return '<span class="badge bg-secondary" style="font-size:0.6rem;line-height:16px;padding:0 4px;">-</span>';
+    var num = numericValue(params.colDef.field, params.data);
     var cls = 'score-low';
-    if (val === 100) cls = 'score-perfect';
-    else if (val >= 90) cls = 'score-high';
-    else if (val >= 75) cls = 'score-medium';
+    if (num === 100) cls = 'score-perfect';
+    else if (num >= 90) cls = 'score-high';
+    else if (num >= 75) cls = 'score-medium';
     return '<span class="score-badge ' + cls + '">' + val + '</span>';
 }
 
@@ -239,6 +482,7 @@ function recCellRenderer(params) {
 }
 
 function processValueGetter(params) {
+    if (!params.data) return '';
     var val = params.data.how_to_process || '';
     if (!val) {
         var rec = (params.data.recommendation || '').toUpperCase();
@@ -272,23 +516,23 @@ function actionsCellRenderer(params) {
 }
 
 function canvasIdValueGetter(params) {
-    var d = params.data;
+    var d = params.data || {};
     var seq = d.canvas_addrseq || '';
     return seq ? (d.canvas_id || '') + '-' + seq : (d.canvas_id || '');
 }
 
 function canvasCszValueGetter(params) {
-    var d = params.data;
+    var d = params.data || {};
     return (d.canvas_city || '') + ', ' + (d.canvas_state || '') + ' ' + (d.canvas_zip || '');
 }
 
 function decCszValueGetter(params) {
-    var d = params.data;
+    var d = params.data || {};
     return (d.dec_city || '') + ', ' + (d.dec_state || '') + ' ' + (d.dec_zip || '');
 }
 
 function decCodeValueGetter(params) {
-    var d = params.data;
+    var d = params.data || {};
     var code = d.dec_hdrcode || '';
     var sub = d.dec_addrsubcode || '';
     return sub ? code + '-' + sub : code;
@@ -298,14 +542,17 @@ function decCodeValueGetter(params) {
 function initGrid() {
     var columnDefs = [
         { headerName: 'UID', field: 'id', colId: 'uid', width: 60, hide: true },
-        { headerName: 'SSN', field: 'ssn_match', colId: 'ssn_match', cellRenderer: ssnCellRenderer, width: 62 },
+        { headerName: 'SSN', field: 'ssn_match', colId: 'ssn_match', cellRenderer: ssnCellRenderer, width: 62,
+          comparator: numericComparator('ssn_match') },
         { headerName: 'Name', field: 'name_score', colId: 'name_score', cellRenderer: scoreCellRenderer, width: 80,
+          comparator: numericComparator('name_score'),
           tooltipValueGetter: function(p) {
               if (p.value !== '' && p.value !== null && p.value < 45) return 'This may be low because name may exist in address field';
               return null;
           }
         },
         { headerName: 'Addr', field: 'address_score', colId: 'address_score', cellRenderer: scoreCellRenderer, width: 76,
+          comparator: numericComparator('address_score'),
           tooltipValueGetter: function(p) {
               if (p.value !== '' && p.value !== null && p.value > 45 &&
                   p.data.recommendation && p.data.recommendation.toUpperCase().indexOf('NEW ADDRESS') !== -1) {
@@ -315,6 +562,7 @@ function initGrid() {
           }
         },
         { headerName: 'N+A', field: 'nameaddrscore', colId: 'nameaddrscore', width: 66, hide: true,
+          comparator: numericComparator('nameaddrscore'),
           cellRenderer: function(params) {
             var rec = (params.data && params.data.recommendation || '').toUpperCase();
             if (rec !== 'NEEDS REVIEW') return '<span class="badge bg-secondary" style="font-size:0.6rem;line-height:16px;padding:0 4px;" title="Not Scored - Only NEEDS REVIEW scored">NS</span>';
@@ -364,17 +612,21 @@ function initGrid() {
         { headerName: 'Vendor', field: 'vendor', colId: 'vendor', cellRenderer: checkboxCellRenderer, width: 55, hide: true },
         { headerName: 'Memo', field: 'memo', colId: 'memo', cellRenderer: memoCellRenderer, width: 160, hide: true },
         { headerName: 'Run ID', field: 'run_id', colId: 'run_id', width: 120, hide: true },
-        { headerName: 'Name Normal', field: 'name_normal_detail', colId: 'name_normal_detail', width: 200, hide: true },
-        { headerName: 'Addr Normal', field: 'address_normal_detail', colId: 'address_normal_detail', width: 200, hide: true },
-        { headerName: 'Name Match', field: 'name_match_detail', colId: 'name_match_detail', width: 200, hide: true },
-        { headerName: 'Addr Match', field: 'addr_match_detail', colId: 'addr_match_detail', width: 200, hide: true },
+        { headerName: 'Name Normal', field: 'name_normal_detail', colId: 'name_normal_detail', width: 200, hide: true,
+          valueGetter: detailValueGetter, getQuickFilterText: noQuickFilterText, sortable: false },
+        { headerName: 'Addr Normal', field: 'address_normal_detail', colId: 'address_normal_detail', width: 200, hide: true,
+          valueGetter: detailValueGetter, getQuickFilterText: noQuickFilterText, sortable: false },
+        { headerName: 'Name Match', field: 'name_match_detail', colId: 'name_match_detail', width: 200, hide: true,
+          valueGetter: detailValueGetter, getQuickFilterText: noQuickFilterText, sortable: false },
+        { headerName: 'Addr Match', field: 'addr_match_detail', colId: 'addr_match_detail', width: 200, hide: true,
+          valueGetter: detailValueGetter, getQuickFilterText: noQuickFilterText, sortable: false },
         { headerName: 'Actions', colId: 'actions', cellRenderer: actionsCellRenderer, width: 80,
           sortable: false, filter: false, hide: true, pinned: 'right' }
     ];
 
+    var infinite = gridRowModel === 'infinite';
     var gridOptions = {
         columnDefs: columnDefs,
-        rowData: [],
         getRowId: function(params) { return String(params.data._row_id); },
         defaultColDef: {
             sortable: true,
@@ -385,7 +637,8 @@ function initGrid() {
         rowSelection: {
             mode: 'multiRow',
             checkboxes: true,
-            headerCheckbox: true,
+            // Select-all needs every row in the browser
+            headerCheckbox: !infinite,
             selectAll: 'currentPage',
             enableClickSelection: false
         },
@@ -401,16 +654,23 @@ function initGrid() {
         pagination: false,
         suppressCellFocus: false,
         tooltipShowDelay: 300,
-        isExternalFilterPresent: isExternalFilterPresent,
-        doesExternalFilterPass: doesExternalFilterPass,
+        // Build each row's quick-filter text once instead of on every keystroke
+        cacheQuickFilter: true,
         rowClassRules: {
             'trust-highlight': function(params) {
-                var v = params.data.is_trust;
+                var v = params.data && params.data.is_trust;
                 return v === 1 || v === true || v === '1' || v === 'true' || v === 'True';
             }
         },
         singleClickEdit: true,
         onCellValueChanged: function(params) {
+            recordPrefetch.delete(params.data._row_id);
+            if (numericColumns[params.colDef.field]) updateNumericColumns([params.data]);
+            if (dataWorkerHasRows && SR_TEXT_COLS.indexOf(params.colDef.field) !== -1) {
+                dataWorker.postMessage({ type: 'update', changes: [
+                    { rowId: params.data._row_id, field: params.colDef.field, value: params.newValue }
+                ] });
+            }
             if (params.colDef.field === 'how_to_process' && params.oldValue !== params.newValue && !window._bulkProcessUpdate) {
                 // Check if multiple Process cells are shift-selected
                 var selectedCells = $('.cell-selected[col-id="how_to_process"]');
@@ -457,47 +717,98 @@ function initGrid() {
         },
         getRowClass: undefined
     };
+    if (infinite) {
+        // Blocks of rows fetched from /api/matches as the user scrolls; filters and sort run server-side
+        gridOptions.rowModelType = 'infinite';
+        gridOptions.cacheBlockSize = INFINITE_BLOCK_SIZE;
+        gridOptions.maxBlocksInCache = 50;
+        gridOptions.infiniteInitialRowCount = INFINITE_BLOCK_SIZE;
+    } else {
+        gridOptions.rowData = [];
+        gridOptions.isExternalFilterPresent = isExternalFilterPresent;
+        gridOptions.doesExternalFilterPass = doesExternalFilterPass;
+    }
 
     var gridDiv = document.getElementById('matchesGrid');
     gridApi = agGrid.createGrid(gridDiv, gridOptions);
 }
 
 function loadGridData() {
-    fetch('/api/matches_all')
-        .then(function(r) { return r.json(); })
-        .then(function(data) {
-            allRowData = data;
-            gridApi.setGridOption('rowData', data);
-            updateGridInfo();
-        })
-        .catch(function(err) {
-            console.error('Failed to load data:', err);
-            showToast('Failed to load data', 'error');
-        });
+    if (gridRowModel === 'infinite') {
+        gridApi.setGridOption('datasource', matchesDatasource);
+        return;
+    }
+    // Performance marks (read by the grid performance tests)
+    performance.mark('grid:fetch-start');
+    var first = true;
+    fetchAllRows(function(data) {
+        if (first) performance.mark('grid:data-parsed');
+        allRowData = data;
+        gridApi.setGridOption('rowData', data);
+        updateGridInfo();
+        if (first) {
+            performance.mark('grid:data-set');
+            requestAnimationFrame(function() { performance.mark('grid:first-row'); });
+        }
+        first = false;
+    }, function(err) {
+        console.error('Failed to load data:', err);
+        showToast('Failed to load data', 'error');
+    }, applyRowDelta);
 }
 
 function refreshGridData() {
-    fetch('/api/matches_all')
-        .then(function(r) { return r.json(); })
-        .then(function(data) {
-            allRowData = data;
-            gridApi.setGridOption('rowData', data);
-            updateGridInfo();
-        });
+    recordPrefetch.clear();
+    if (gridRowModel === 'infinite') {
+        gridApi.refreshInfiniteCache();
+        return;
+    }
+    fetchAllRows(function(data) {
+        // A full download means a new table; deltas (applyRowDelta) never change details
+        detailCache.clear();
+        allRowData = data;
+        gridApi.setGridOption('rowData', data);
+        updateGridInfo();
+    }, function(err) {
+        console.error('Failed to refresh data:', err);
+    }, applyRowDelta);
+}
+
+// The server answers 503 until its background data load finishes; show progress meanwhile
+function waitForData(onReady) {
+    $.get('/api/load_status', function(s) {
+        if (s.ready) {
+            gridRowModel = s.row_model || 'clientSide';
+            gridClientCache = s.client_cache === true;
+            onReady();
+            return;
+        }
+        var msg = 'Loading data from Snowflake';
+        if (s.state === 'error') msg = 'Data load failed: ' + s.error + ' (retrying)';
+        else if (s.rows_total) msg += '... ' + (s.rows_loaded || 0).toLocaleString() + ' / ' + s.rows_total.toLocaleString() + ' rows';
+        else if (s.phase) msg += ' (' + s.phase + ')...';
+        $('#gridInfo').text(msg);
+        setTimeout(function() { waitForData(onReady); }, 1000);
+    }).fail(function() {
+        setTimeout(function() { waitForData(onReady); }, 2000);
+    });
 }
 
 // ── Document ready ──
 $(document).ready(function() {
     editModal = new bootstrap.Modal(document.getElementById('editModal'));
-    $.get('/api/recommendations', function(recs) {
-        recommendationValues = sortByRecOrder(recs.slice());
-        buildRecFilterDropdown(recommendationValues);
-        recommendationValues.forEach(function(r) {
-            $('#editRecommendation').append('<option value="' + r + '">' + r + '</option>');
+    startDataWorker();
+    waitForData(function() {
+        $.get('/api/recommendations', function(recs) {
+            recommendationValues = sortByRecOrder(recs.slice());
+            buildRecFilterDropdown(recommendationValues);
+            recommendationValues.forEach(function(r) {
+                $('#editRecommendation').append('<option value="' + r + '">' + r + '</option>');
+            });
+            $('#editRecommendation').append('<option value="PROCESSED">PROCESSED</option>');
+            initGrid();
+            loadStats();
         });
-        $('#editRecommendation').append('<option value="PROCESSED">PROCESSED</option>');
-        initGrid();
-        loadStats();
     });
 
     // Filter dropdowns trigger external filter
@@ -511,10 +822,13 @@ $(document).ready(function() {
     $('#quickFilterInput').on('input', function() {
         var val = $(this).val();
         clearTimeout(quickFilterTimer);
-        quickFilterTimer = setTimeout(function() {
-            gridApi.setGridOption('quickFilterText', val);
-            updateGridInfo();
-        }, 300);
+        quickFilterTimer = setTimeout(function() { setQuickFilter(val); }, 300);
+    });
+
+    // Export filtered dropdown
+    $('#exportType').on('change', function() {
+        var format = $(this).val();
+        if (format) { exportData(format); $(this).val(''); }
     });
 
     // Import type dropdown
@@ -527,6 +841,25 @@ $(document).ready(function() {
         var file = this.files[0];
         var field = $('#importType').val();
         if (!file || !field) return;
+        if (field === 'multi') {
+            // Multi-field files are parsed server-side (CSV or XLSX with a canvas_id column)
+            var form = new FormData();
+            form.append('file', file);
+            $.ajax({
+                url: '/api/import_ids', method: 'POST', data: form,
+                processData: false, contentType: false,
+                success: function(data) {
+                    showToast(data.message, 'success');
+                    pendingCount = data.pending_count || 0;
+                    updateSaveBtn();
+                    refreshGridData();
+                    if (data.fields && data.fields.recommendation) loadStats();
+                },
+                error: function(xhr) { showToast(xhr.responseJSON ? xhr.responseJSON.error : 'Import failed', 'error'); }
+            });
+            $('#importType').val('');
+            return;
+        }
         var reader = new FileReader();
         reader.onload = function(e) {
             var ids = e.target.result.split(/[\r\n,]+/).map(function(s) { return s.trim(); }).filter(function(s) { return s && s !== ''; });
@@ -733,7 +1066,7 @@ $(document).ready(function() {
             var count = 0;
             var undoChanges = [];
             window._bulkProcessUpdate = true;
-            gridApi.forEachNodeAfterFilterAndSort(function(node) {
+            forEachDisplayedNode(function(node) {
                 var oldVal = node.data.how_to_process || '';
                 if (oldVal !== chosen) {
                     undoChanges.push({ rowId: node.data._row_id, field: 'how_to_process', oldValue: oldVal, newValue: chosen });
@@ -853,6 +1186,7 @@ function loadStats() {
                 '</div></div></div>';
         });
         $('#recBreakdown').html(html);
+        performance.mark('stats:loaded');
     });
 }
 
@@ -899,7 +1233,8 @@ function clearFilters() {
     $('#minAddrScore').val('');
     $('#maxAddrScore').val('');
     $('#quickFilterInput').val('');
-    if (gridApi) gridApi.setGridOption('quickFilterText', '');
+    quickFilterText = '';
+    if (gridApi && gridRowModel !== 'infinite') gridApi.setGridOption('quickFilterText', '');
     onExternalFilterChanged();
 }
 
@@ -907,6 +1242,7 @@ function refreshData() {
     if (pendingCount > 0 && !confirm('You have unsaved changes. Refresh will discard them. Continue?')) return;
     showToast('Reloading from Snowflake...', 'info');
     $.post('/api/reload', function(data) {
+        detailCache.clear();
         pendingCount = 0;
         updateSaveBtn();
         loadStats();
@@ -925,34 +1261,123 @@ function updateSelectionInfo() {
     $('#bulkApproveBtn').prop('disabled', n === 0);
 }
 
+// ── Match details ──
+// Not part of the bulk row payload: fetched for the rows on screen while a detail
+// column is shown, parsed ({token_sort: 25.6, ...}) and kept per row until a reload
+var DETAIL_FIELDS = ['name_normal_detail', 'address_normal_detail', 'name_match_detail', 'addr_match_detail'];
+// _row_id -> record with the detail fields (null while its request is in flight)
+var detailCache = new Map();
+var detailFetchTimer = null;
+
+// Details are mostly not loaded, so they can't take part in the quick filter
+function noQuickFilterText() {
+    return '';
+}
+
+function detailValueGetter(params) {
+    if (!params.data) return '';
+    var d = detailCache.get(params.data._row_id);
+    if (d === undefined) {
+        clearTimeout(detailFetchTimer);
+        detailFetchTimer = setTimeout(fetchShownDetails, 50);
+    }
+    return d ? formatDetail(d[params.colDef.field]) : '';
+}
+
+function formatDetail(v) {
+    if (v === null || v === undefined) return '';
+    if (typeof v !== 'object') return String(v);
+    return Object.keys(v).map(function(k) { return k + ': ' + v[k]; }).join(', ');
+}
+
+function fetchShownDetails() {
+    var shown = DETAIL_FIELDS.filter(function(f) {
+        var col = gridApi.getColumn(f);
+        return col && col.isVisible();
+    });
+    if (!shown.length) return;
+    var nodes = gridApi.getRenderedNodes().filter(function(n) {
+        return n.data && !detailCache.has(n.data._row_id);
+    }).slice(0, 500);
+    if (!nodes.length) return;
+    var ids = nodes.map(function(n) { return n.data._row_id; });
+    ids.forEach(function(id) { detailCache.set(id, null); });
+    $.ajax({
+        url: '/api/records', method: 'POST', contentType: 'application/json',
+        data: JSON.stringify({ row_ids: ids, groups: ['detail'] }),
+        success: function(data) {
+            data.records.forEach(function(d) { detailCache.set(d._row_id, d); });
+            // Rows gone from the server show blank rather than being asked for again
+            data.missing.forEach(function(id) { detailCache.set(id, {}); });
+            gridApi.refreshCells({ rowNodes: nodes, columns: shown, force: true });
+        },
+        error: function() {
+            ids.forEach(function(id) { detailCache.delete(id); });
+        }
+    });
+}
+
 // ── Edit modal ──
-function editRecord(rowId) {
-    $.get('/api/record/' + rowId, function(d) {
-        $('#editRowId').val(d._row_id);
-        $('#editCanvasName').val(d.canvas_name || '');
-        $('#editCanvasAddress').val(d.canvas_address || '');
-        $('#editCanvasCity').val(d.canvas_city || '');
-        $('#editCanvasState').val(d.canvas_state || '');
-        $('#editCanvasZip').val(d.canvas_zip || '');
-        $('#editCanvasId').text(d.canvas_addrseq ? (d.canvas_id + '-' + d.canvas_addrseq) : (d.canvas_id || ''));
-        $('#editCanvasSSN').text(d.canvas_ssn || '');
-        $('#editDecName').text(d.dec_name || '');
-        $('#editDecAddress').text(d.dec_address || '');
-        $('#editDecCity').text(d.dec_city || '');
-        $('#editDecState').text(d.dec_state || '');
-        $('#editDecZip').text(d.dec_zip || '');
-        $('#editDecContact').text(d.dec_contact || '');
-        $('#editDecHdrcode').text(d.dec_hdrcode || '');
-        setScoreBadgeEl('#editSsnMatch', d.ssn_match);
-        setScoreBadgeEl('#editNameScore', d.name_score);
-        setScoreBadgeEl('#editAddressScore', d.address_score);
-        $('#editRecommendation').val(d.recommendation || '');
-        $('#editAddressReason').val(d.address_reason || '');
-        $('#editMemo').val(d.memo || '');
-        editModal.show();
+// Field groups the modal shows (the match-detail JSON is left out)
+var EDIT_RECORD_GROUPS = 'canvas,dec,scores,review';
+// Rows either side of the edited one fetched ahead, in one /api/records call
+var RECORD_PREFETCH_ROWS = 5;
+// Prefetched records by _row_id; dropped when the row changes in the grid
+var recordPrefetch = new Map();
+
+function prefetchRecords(rowId) {
+    var node = gridApi.getRowNode(String(rowId));
+    if (!node || node.rowIndex == null) return;
+    var ids = [];
+    for (var i = node.rowIndex - RECORD_PREFETCH_ROWS; i <= node.rowIndex + RECORD_PREFETCH_ROWS; i++) {
+        var n = i >= 0 ? gridApi.getDisplayedRowAtIndex(i) : null;
+        if (n && n.data && n.data._row_id !== rowId && !recordPrefetch.has(n.data._row_id)) ids.push(n.data._row_id);
+    }
+    if (!ids.length) return;
+    $.ajax({
+        url: '/api/records', method: 'POST', contentType: 'application/json',
+        data: JSON.stringify({ row_ids: ids, groups: EDIT_RECORD_GROUPS.split(',') }),
+        success: function(data) {
+            data.records.forEach(function(d) { recordPrefetch.set(d._row_id, d); });
+        }
     });
 }
 
+function editRecord(rowId) {
+    var held = recordPrefetch.get(rowId);
+    if (held) {
+        showEditRecord(held);
+    } else {
+        $.get('/api/record/' + rowId, { groups: EDIT_RECORD_GROUPS }, showEditRecord);
+    }
+    prefetchRecords(rowId);
+}
+
+function showEditRecord(d) {
+    $('#editRowId').val(d._row_id);
+    $('#editCanvasName').val(d.canvas_name || '');
+    $('#editCanvasAddress').val(d.canvas_address || '');
+    $('#editCanvasCity').val(d.canvas_city || '');
+    $('#editCanvasState').val(d.canvas_state || '');
+    $('#editCanvasZip').val(d.canvas_zip || '');
+    $('#editCanvasId').text(d.canvas_addrseq ? (d.canvas_id + '-' + d.canvas_addrseq) : (d.canvas_id || ''));
+    $('#editCanvasSSN').text(d.canvas_ssn || '');
+    $('#editDecName').text(d.dec_name || '');
+    $('#editDecAddress').text(d.dec_address || '');
+    $('#editDecCity').text(d.dec_city || '');
+    $('#editDecState').text(d.dec_state || '');
+    $('#editDecZip').text(d.dec_zip || '');
+    $('#editDecContact').text(d.dec_contact || '');
+    $('#editDecHdrcode').text(d.dec_hdrcode || '');
+    setScoreBadgeEl('#editSsnMatch', d.ssn_match);
+    setScoreBadgeEl('#editNameScore', d.name_score);
+    setScoreBadgeEl('#editAddressScore', d.address_score);
+    $('#editRecommendation').val(d.recommendation || '');
+    $('#editAddressReason').val(d.address_reason || '');
+    $('#editMemo').val(d.memo || '');
+    editModal.show();
+}
+
 function setScoreBadgeEl(sel, val) {
     var el = $(sel);
     el.text(val != null ? val : '-');
@@ -1062,30 +1487,82 @@ function bulkApprove() {
     });
 }
 
-// ── Export (client-side CSV via AG Grid) ──
-function exportSelected() {
+// ── Export (streamed by the server from /api/export) ──
+// Grid columns that show several table columns (or none)
+var EXPORT_COLUMN_FIELDS = {
+    canvas_csz: ['canvas_city', 'canvas_state', 'canvas_zip'],
+    dec_csz: ['dec_city', 'dec_state', 'dec_zip'],
+    canvas_id: ['canvas_id', 'canvas_addrseq'],
+    dec_hdrcode: ['dec_hdrcode', 'dec_addrsubcode'],
+    actions: []
+};
+
+// Table columns behind the displayed grid columns, in display order
+function exportColumns() {
+    var cols = [];
+    gridApi.getAllDisplayedColumns().forEach(function(col) {
+        var def = col.getColDef();
+        var fields = EXPORT_COLUMN_FIELDS[col.getColId()] || (def.field ? [def.field] : []);
+        fields.forEach(function(f) { if (cols.indexOf(f) === -1) cols.push(f); });
+    });
+    return cols;
+}
+
+// POST through a hidden form so the browser streams the file straight to disk
+function submitExport(fields) {
+    var form = $('<form method="POST" action="/api/export" style="display:none"></form>');
+    Object.keys(fields).forEach(function(name) {
+        $('<input type="hidden">').attr('name', name).val(fields[name]).appendTo(form);
+    });
+    form.appendTo(document.body).submit().remove();
+}
+
+// Row ids the client-side grid displays (its own filters and sort applied), in order
+function displayedRowIds(keep) {
+    var ids = [];
+    gridApi.forEachNodeAfterFilterAndSort(function(node) {
+        if (node.data && (!keep || keep(node.data._row_id))) ids.push(node.data._row_id);
+    });
+    return ids;
+}
+
+function exportSelected(format) {
     if (selectedRows.size === 0) {
         showToast('No records selected', 'warning');
         return;
     }
-    var rowNodes = [];
-    selectedRows.forEach(function(rid) {
-        var node = gridApi.getRowNode(String(rid));
-        if (node) rowNodes.push(node);
-    });
-    gridApi.exportDataAsCsv({
-        onlySelected: false,
-        shouldRowBeSkipped: function(params) {
-            return !selectedRows.has(params.node.data._row_id);
-        },
-        fileName: 'selected_export_' + new Date().toISOString().slice(0, 10) + '.csv'
+    format = format || 'csv';
+    // Infinite row model: not every selected row is loaded, so export in table order
+    var ids = gridRowModel === 'clientSide'
+        ? displayedRowIds(function(id) { return selectedRows.has(id); })
+        : Array.from(selectedRows).sort(function(a, b) { return a - b; });
+    submitExport({
+        format: format,
+        columns: exportColumns().join(','),
+        row_ids: ids.join(','),
+        filename: 'selected_export_' + new Date().toISOString().slice(0, 10) + '.' + format
     });
 }
 
-function exportData() {
-    gridApi.exportDataAsCsv({
-        fileName: 'matches_export_' + new Date().toISOString().slice(0, 10) + '.csv'
-    });
+// Everything the current filters match, in the grid's sort order. The client-side grid
+// sends the rows it shows, so the file matches the screen exactly; the infinite row
+// model sends its filters and sort for the server to apply
+function exportData(format) {
+    var fields = {};
+    if (gridRowModel === 'clientSide') {
+        var ids = displayedRowIds();
+        if (ids.length === 0) { showToast('No records to export', 'warning'); return; }
+        fields.row_ids = ids.join(',');
+    } else {
+        fields = matchesQueryParams();
+        var sort = gridApi.getColumnState().filter(function(c) { return c.sort; })
+            .sort(function(a, b) { return (a.sortIndex || 0) - (b.sortIndex || 0); })
+            .map(function(c) { return c.colId + ':' + c.sort; });
+        if (sort.length) fields.sort = sort.join(',');
+    }
+    fields.format = format || 'csv';
+    fields.columns = exportColumns().join(',');
+    submitExport(fields);
 }
 
 // ── Save pending changes ──
@@ -1194,24 +1671,46 @@ function openSearchReplace() {
 function getVisibleRowIds() {
     var ids = [];
     if (gridApi) {
-        gridApi.forEachNodeAfterFilterAndSort(function(node) {
+        forEachDisplayedNode(function(node) {
             if (node.data && node.data._row_id !== undefined) ids.push(node.data._row_id);
         });
     }
     return ids;
 }
 
-function srBuildMatches() {
+// Latest Find request; older worker answers are dropped
+var srFindSeq = 0;
+
+// Rebuild srMatches for the visible rows, then call done(); the scan runs in the data
+// worker when it holds the rows, otherwise inline
+function srBuildMatches(done) {
     srMatches = [];
     srMatchIdx = -1;
+    var seq = ++srFindSeq;
     var search = $('#srSearch').val();
-    if (!search || !gridApi) return;
+    if (!search || !gridApi) { if (done) done(); return; }
     var col = $('#srColumn').val();
     var caseSensitive = $('#srCaseSensitive').is(':checked');
     var cols = (col === 'all') ? SR_TEXT_COLS : [col];
-    var searchVal = caseSensitive ? search : search.toLowerCase();
 
-    gridApi.forEachNodeAfterFilterAndSort(function(node) {
+    if (dataWorkerHasRows && gridRowModel !== 'infinite') {
+        var ids = Int32Array.from(getVisibleRowIds());
+        dataWorkerRequest({ type: 'find', search: search, cols: cols, caseSensitive: caseSensitive, rowIds: ids },
+                          [ids.buffer], function(msg) {
+            if (seq !== srFindSeq) return;
+            if (msg.type === 'error') { srBuildMatches(done); return; }
+            var matches = new Array(msg.rowIds.length);
+            for (var i = 0; i < msg.rowIds.length; i++) {
+                matches[i] = { rowId: msg.rowIds[i], nodeId: String(msg.rowIds[i]), col: cols[msg.cols[i]] };
+            }
+            srMatches = matches;
+            if (done) done();
+        });
+        return;
+    }
+
+    var searchVal = caseSensitive ? search : search.toLowerCase();
+    forEachDisplayedNode(function(node) {
         if (!node.data) return;
         cols.forEach(function(c) {
             var val = String(node.data[c] || '');
@@ -1221,6 +1720,7 @@ function srBuildMatches() {
             }
         });
     });
+    if (done) done();
 }
 
 function srHighlightMatch() {
@@ -1250,22 +1750,26 @@ function srUpdateInfo() {
 function srAutoFind() {
     var search = $('#srSearch').val();
     if (!search) { $('#srMatchInfo').text(''); srMatches = []; srMatchIdx = -1; return; }
-    srBuildMatches();
-    if (srMatches.length > 0) {
-        srMatchIdx = 0;
-        srHighlightMatch();
-    }
-    srUpdateInfo();
+    srBuildMatches(function() {
+        if (srMatches.length > 0) {
+            srMatchIdx = 0;
+            srHighlightMatch();
+        }
+        srUpdateInfo();
+    });
 }
 
 function srFindNext() {
     var search = $('#srSearch').val();
     if (!search) { $('#srMatchInfo').text('Enter search text.'); return; }
-    if (srMatches.length === 0) { srBuildMatches(); }
-    if (srMatches.length === 0) { srUpdateInfo(); return; }
-    srMatchIdx = (srMatchIdx + 1) % srMatches.length;
-    srHighlightMatch();
-    srUpdateInfo();
+    function step() {
+        if (srMatches.length === 0) { srUpdateInfo(); return; }
+        srMatchIdx = (srMatchIdx + 1) % srMatches.length;
+        srHighlightMatch();
+        srUpdateInfo();
+    }
+    if (srMatches.length === 0) srBuildMatches(step);
+    else step();
 }
 
 function srReplaceCurrent() {
@@ -1292,16 +1796,18 @@ function srReplaceCurrent() {
                 refreshGridData();
                 loadStats();
                 // Rebuild matches and advance
+                var idx = srMatchIdx;
                 setTimeout(function() {
-                    srBuildMatches();
-                    if (srMatches.length === 0) {
-                        srMatchIdx = -1;
-                        srUpdateInfo();
-                    } else {
-                        if (srMatchIdx >= srMatches.length) srMatchIdx = 0;
-                        srHighlightMatch();
-                        srUpdateInfo();
-                    }
+                    srBuildMatches(function() {
+                        if (srMatches.length === 0) {
+                            srMatchIdx = -1;
+                            srUpdateInfo();
+                        } else {
+                            srMatchIdx = idx < srMatches.length ? idx : 0;
+                            srHighlightMatch();
+                            srUpdateInfo();
+                        }
+                    });
                 }, 300);
             } else {
                 $('#srMatchInfo').text('No replacement made.');
@@ -1324,7 +1830,9 @@ function doReplaceAll() {
             column: $('#srColumn').val(),
             case_sensitive: $('#srCaseSensitive').is(':checked'),
             mode: 'replace',
-            row_ids: getVisibleRowIds()
+            // Infinite mode only holds some blocks; let the server apply the same filters
+            row_ids: gridRowModel === 'infinite' ? undefined : getVisibleRowIds(),
+            filters: gridRowModel === 'infinite' ? matchesQueryParams() : undefined
         }),
         success: function(data) {
             if (data.replaced === 0) {
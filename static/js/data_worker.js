@@ -0,0 +1,237 @@
+// ── Data worker ──
+// Off-main-thread work for app.js: fetches and decodes the /api/matches_all payload,
+// builds the numeric score columns (handed back as transferable Float32Array buffers)
+// and keeps a text index of the search/replace columns to answer Find requests.
+// The last table is kept in IndexedDB with its data epoch/version, so a reopened page
+// renders from it at once and then fetches only the rows changed since
+// (/api/matches_delta); refreshes during the session use the same delta path.
+
+var NUMERIC_COLS = ['ssn_match', 'name_score', 'address_score', 'nameaddrscore'];
+var TEXT_COLS = [
+    'canvas_name', 'canvas_address', 'canvas_city', 'canvas_state', 'canvas_zip',
+    'recommendation', 'how_to_process', 'memo', 'address_reason'
+];
+
+var DB_NAME = 'ba-review';
+var DB_STORE = 'dataset';
+var CACHE_KEY = 'matches';
+// Writing the whole table is not free; batch the writes after a burst of refreshes
+var SAVE_DELAY_MS = 3000;
+
+// Text index: {col: [value by _row_id]} plus lazily built lower-cased copies
+var text = {};
+var lower = {};
+// Table the worker holds: {epoch, version, rows, pos: Int32Array _row_id -> index in rows}
+var current = null;
+var persist = true;
+// Loads run one at a time; Find waits for the latest so it never sees old rows
+var loaded = Promise.resolve();
+
+function toNumber(v) {
+    return (v === '' || v === null || v === undefined) ? NaN : Number(v);
+}
+
+function textValue(v) {
+    return (v === null || v === undefined) ? '' : String(v);
+}
+
+function buildIndex(rows) {
+    var size = 0;
+    for (var i = 0; i < rows.length; i++) {
+        if (rows[i]._row_id >= size) size = rows[i]._row_id + 1;
+    }
+    var numeric = {};
+    NUMERIC_COLS.forEach(function(field) {
+        var arr = new Float32Array(size).fill(NaN);
+        for (var i = 0; i < rows.length; i++) arr[rows[i]._row_id] = toNumber(rows[i][field]);
+        numeric[field] = arr;
+    });
+    text = {};
+    lower = {};
+    TEXT_COLS.forEach(function(col) {
+        var arr = new Array(size);
+        for (var i = 0; i < rows.length; i++) arr[rows[i]._row_id] = textValue(rows[i][col]);
+        text[col] = arr;
+    });
+    return numeric;
+}
+
+function lowerColumn(col) {
+    if (!lower[col]) lower[col] = text[col].map(function(v) { return v === undefined ? v : v.toLowerCase(); });
+    return lower[col];
+}
+
+function setText(rowId, field, value) {
+    if (!text[field]) return;
+    text[field][rowId] = textValue(value);
+    if (lower[field]) lower[field][rowId] = text[field][rowId].toLowerCase();
+}
+
+// Matches in visible-row order: parallel arrays of row ids and indexes into msg.cols
+function find(msg) {
+    var needle = msg.caseSensitive ? msg.search : msg.search.toLowerCase();
+    var cols = msg.cols.filter(function(c) { return text[c]; });
+    var values = cols.map(function(c) { return msg.caseSensitive ? text[c] : lowerColumn(c); });
+    var colIdx = cols.map(function(c) { return msg.cols.indexOf(c); });
+    var ids = msg.rowIds;
+    var outIds = [], outCols = [];
+    for (var i = 0; i < ids.length; i++) {
+        var rid = ids[i];
+        for (var j = 0; j < values.length; j++) {
+            var v = values[j][rid];
+            if (v !== undefined && v.indexOf(needle) !== -1) {
+                outIds.push(rid);
+                outCols.push(colIdx[j]);
+            }
+        }
+    }
+    return { rowIds: Int32Array.from(outIds), cols: Uint8Array.from(outCols) };
+}
+
+// ── IndexedDB cache ──
+var dbPromise = null;
+
+function openDb() {
+    if (!dbPromise) {
+        dbPromise = new Promise(function(resolve) {
+            if (typeof indexedDB === 'undefined') { resolve(null); return; }
+            var req = indexedDB.open(DB_NAME, 1);
+            req.onupgradeneeded = function() { req.result.createObjectStore(DB_STORE); };
+            req.onsuccess = function() { resolve(req.result); };
+            req.onerror = function() { resolve(null); };
+        });
+    }
+    return dbPromise;
+}
+
+// Cache access never fails a load: any IndexedDB error just means no cache
+function cacheRequest(mode, action) {
+    return openDb().then(function(db) {
+        if (!db) return null;
+        return new Promise(function(resolve) {
+            try {
+                var req = action(db.transaction(DB_STORE, mode).objectStore(DB_STORE));
+                req.onsuccess = function() { resolve(req.result || null); };
+                req.onerror = function() { resolve(null); };
+            } catch (e) {
+                resolve(null);
+            }
+        });
+    });
+}
+
+function readCache() {
+    return cacheRequest('readonly', function(store) { return store.get(CACHE_KEY); });
+}
+
+var saveTimer = null;
+
+function scheduleSave() {
+    clearTimeout(saveTimer);
+    if (!persist) return;
+    saveTimer = setTimeout(function() {
+        var data = current;
+        if (!data) return;
+        cacheRequest('readwrite', function(store) {
+            return store.put({ epoch: data.epoch, version: data.version, rows: data.rows }, CACHE_KEY);
+        });
+    }, SAVE_DELAY_MS);
+}
+
+// ── Loading ──
+function setCurrent(epoch, version, rows) {
+    var size = 0;
+    for (var i = 0; i < rows.length; i++) {
+        if (rows[i]._row_id >= size) size = rows[i]._row_id + 1;
+    }
+    var pos = new Int32Array(size).fill(-1);
+    for (var j = 0; j < rows.length; j++) pos[rows[j]._row_id] = j;
+    current = { epoch: epoch, version: version, rows: rows, pos: pos };
+}
+
+// more: these are the cached rows and a 'delta' or fresh 'loaded' message follows
+function postRows(msg, rows, more) {
+    var numeric = buildIndex(rows);
+    var buffers = NUMERIC_COLS.map(function(f) { return numeric[f].buffer; });
+    self.postMessage({ type: 'loaded', id: msg.id, rows: rows, numeric: numeric, more: more }, buffers);
+}
+
+function loadFull(msg) {
+    return fetch(msg.url)
+        .then(function(r) {
+            if (!r.ok) throw new Error('HTTP ' + r.status);
+            var epoch = r.headers.get('X-Data-Epoch') || '';
+            var version = Number(r.headers.get('X-Data-Version') || 0);
+            return r.text().then(function(body) {
+                var rows = JSON.parse(body);
+                setCurrent(epoch, version, rows);
+                postRows(msg, rows, false);
+                scheduleSave();
+            });
+        });
+}
+
+function applyDelta(delta) {
+    var rows = current.rows;
+    var pos = current.pos;
+    delta.rows.forEach(function(row) {
+        var rid = row._row_id;
+        if (rid < pos.length && pos[rid] >= 0) {
+            rows[pos[rid]] = row;
+        } else {
+            if (rid >= pos.length) {
+                var grown = new Int32Array(rid + 1).fill(-1);
+                grown.set(pos);
+                pos = current.pos = grown;
+            }
+            pos[rid] = rows.length;
+            rows.push(row);
+        }
+        TEXT_COLS.forEach(function(col) { setText(rid, col, row[col]); });
+    });
+    current.version = delta.version;
+}
+
+// From memory (a refresh) or IndexedDB (a new page): show what we have, then catch up
+function load(msg) {
+    var start = current ? Promise.resolve(current) : (persist ? readCache() : Promise.resolve(null));
+    return start.then(function(cached) {
+        if (!cached || !cached.rows) return loadFull(msg);
+        if (cached !== current) {
+            setCurrent(cached.epoch, cached.version, cached.rows);
+            postRows(msg, cached.rows, true);
+        }
+        var url = msg.deltaUrl + '?epoch=' + encodeURIComponent(current.epoch) + '&since=' + current.version;
+        return fetch(url)
+            .then(function(r) { return r.json(); })
+            .then(function(delta) {
+                if (delta.error) throw new Error(delta.error);
+                if (delta.full) return loadFull(msg);
+                applyDelta(delta);
+                self.postMessage({ type: 'delta', id: msg.id, rows: delta.rows });
+                if (delta.rows.length) scheduleSave();
+            });
+    });
+}
+
+self.onmessage = function(e) {
+    var msg = e.data;
+    if (msg.type === 'load') {
+        if (msg.persist === false && persist) {
+            persist = false;
+            cacheRequest('readwrite', function(store) { return store.delete(CACHE_KEY); });
+        }
+        loaded = loaded.then(function() { return load(msg); }).catch(function(err) {
+            self.postMessage({ type: 'error', id: msg.id, error: String(err) });
+        });
+    } else if (msg.type === 'find') {
+        loaded.then(function() {
+            var result = find(msg);
+            self.postMessage({ type: 'found', id: msg.id, rowIds: result.rowIds, cols: result.cols },
+                             [result.rowIds.buffer, result.cols.buffer]);
+        });
+    } else if (msg.type === 'update') {
+        // Keep the text index in step with in-place edits
+        msg.changes.forEach(function(ch) { setText(ch.rowId, ch.field, ch.value); });
+    }
+};
@@ -26,16 +26,18 @@ def app_server():
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
     )
-    for _ in range(30):
+    # The server binds immediately and loads data in the background (503 until ready)
+    for _ in range(120):
         try:
-            r = requests.get(f"{BASE_URL}/api/stats", timeout=1)
-            if r.status_code == 200:
+            r = requests.get(f"{BASE_URL}/api/load_status", timeout=1)
+            if r.status_code == 200 and r.json().get("ready"):
                 break
         except requests.ConnectionError:
-            time.sleep(1)
+            pass
+        time.sleep(1)
     else:
         proc.terminate()
-        raise RuntimeError("Flask server did not start within 30 seconds")
+        raise RuntimeError("Flask server did not load data within 120 seconds")
 
     yield proc
     proc.terminate()
@@ -52,3 +52,25 @@ def api_search_replace(search, replace="", column="all",
     r = requests.post(f"{BASE_URL}/api/search_replace", json=payload)
     r.raise_for_status()
     return r.json()
+
+
+def api_import_rows(rows) -> dict:
+    r = requests.post(f"{BASE_URL}/api/import_ids", json={"rows": rows})
+    return r.json() | {"status_code": r.status_code}
+
+
+def api_get_grouped_stats(**params) -> dict:
+    r = requests.get(f"{BASE_URL}/api/stats/grouped", params=params)
+    r.raise_for_status()
+    return r.json()
+
+
+def api_bucket_whatif(thresholds=None, **options):
+    payload = {"thresholds": thresholds or {}, **options}
+    return requests.post(f"{BASE_URL}/api/ba_config/whatif", json=payload)
+
+
+def api_get_load_status() -> dict:
+    r = requests.get(f"{BASE_URL}/api/load_status")
+    r.raise_for_status()
+    return r.json()
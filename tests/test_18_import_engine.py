@@ -0,0 +1,90 @@
+"""Tests for the multi-field import engine (/api/import_ids)."""
+import pytest
+from playwright.sync_api import Page
+from helpers.selectors import *
+from helpers.wait_helpers import wait_for_toast
+from helpers.api_helpers import api_get_record, api_update_field, api_import_rows
+
+
+class TestImportValidation:
+
+    def test_missing_canvas_id_column_rejected(self, app_server):
+        result = api_import_rows([{"jib": 1}])
+        assert result["status_code"] == 400
+        assert "canvas_id" in result["error"]
+
+    def test_no_allowed_fields_rejected(self, app_server):
+        result = api_import_rows([{"canvas_id": "1", "dec_name": "X"}])
+        assert result["status_code"] == 400
+
+    def test_unknown_ids_reported_unmatched(self, app_server):
+        result = api_import_rows([{"canvas_id": "NO-SUCH-ID", "memo": "x"}])
+        assert result["status_code"] == 400
+        assert "not found" in result["error"]
+        assert result["updated"] == 0
+        assert result["unmatched_ids"] == 1
+
+    def test_blank_ids_not_counted(self, app_server):
+        result = api_import_rows([{"canvas_id": None, "memo": "x"},
+                                  {"canvas_id": " ", "memo": "x"},
+                                  {"canvas_id": "NO-SUCH-ID", "memo": "x"}])
+        assert result["status_code"] == 400
+        assert result["unmatched_ids"] == 1
+        assert result["total_in_file"] == 1
+
+    def test_only_blank_ids_rejected(self, app_server):
+        result = api_import_rows([{"canvas_id": None, "memo": "x"}])
+        assert result["status_code"] == 400
+        assert result["error"] == "No Canvas IDs provided"
+
+    def test_all_invalid_values_reported(self, app_server):
+        result = api_import_rows([{"canvas_id": "NO-SUCH-ID", "jib": "maybe"}])
+        assert result["status_code"] == 400
+        assert result["invalid_values"] == 1
+        assert "invalid" in result["error"]
+
+
+class TestMultiFieldImport:
+
+    @pytest.mark.destructive
+    def test_applies_several_fields_in_one_call(self, app_page: Page):
+        row_id = int(app_page.evaluate(
+            "() => gridApi.getDisplayedRowAtIndex(0).data._row_id"
+        ))
+        original = api_get_record(row_id)
+        canvas_id = str(original["canvas_id"])
+
+        result = api_import_rows([{
+            "canvas_id": canvas_id, "memo": "IMPORT_TEST", "how_to_process": "Merge BA and address"
+        }])
+        assert result["success"]
+        assert set(result["fields"]) == {"memo", "how_to_process"}
+
+        updated = api_get_record(row_id)
+        assert updated["memo"] == "IMPORT_TEST"
+        assert updated["how_to_process"] == "Merge BA and address"
+
+        # Restore
+        api_update_field(row_id, "memo", original.get("memo") or "")
+        api_update_field(row_id, "how_to_process", original.get("how_to_process") or "")
+
+    @pytest.mark.destructive
+    def test_blank_cells_leave_value_unchanged(self, app_page: Page):
+        row_id = int(app_page.evaluate(
+            "() => gridApi.getDisplayedRowAtIndex(0).data._row_id"
+        ))
+        original = api_get_record(row_id)
+
+        api_import_rows([{"canvas_id": str(original["canvas_id"]), "memo": "", "jib": 1}])
+        updated = api_get_record(row_id)
+        assert updated["memo"] == original["memo"]
+        assert updated["jib"] == 1
+
+        # Restore
+        api_update_field(row_id, "jib", original.get("jib", 0))
+
+    @pytest.mark.destructive
+    def test_multi_field_file_upload(self, app_page: Page):
+        app_page.select_option(IMPORT_TYPE_SELECT, "multi")
+        app_page.locator(IMPORT_FILE_INPUT).set_input_files("tests/fixtures/test_import_multi.csv")
+        wait_for_toast(app_page, timeout=10000)
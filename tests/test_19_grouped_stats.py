@@ -0,0 +1,47 @@
+"""Tests for the filtered/grouped statistics endpoint (/api/stats/grouped)."""
+import pytest
+import requests
+from helpers.api_helpers import (
+    BASE_URL, api_get_stats, api_get_grouped_stats, api_update_field, api_get_record
+)
+
+
+class TestGroupedStats:
+
+    def test_unfiltered_totals_match_stats(self, app_server):
+        stats = api_get_stats()
+        grouped = api_get_grouped_stats()
+        assert grouped['records_filtered'] == stats['total_records']
+        assert sum(g['count'] for g in grouped['by_recommendation_ssn']) == stats['total_records']
+
+    def test_ssn_filter_limits_buckets(self, app_server):
+        grouped = api_get_grouped_stats(ssn_match='yes')
+        assert grouped['records_filtered'] == api_get_stats()['ssn_perfect_matches']
+        assert {g['ssn_bucket'] for g in grouped['by_recommendation_ssn']} <= {'yes'}
+
+    def test_histogram_uses_explicit_edges(self, app_server):
+        grouped = api_get_grouped_stats(bins='0,50,75,100')
+        hist = grouped['histograms']['name_score']
+        assert hist['edges'] == [0, 50, 75, 100]
+        assert len(hist['counts']) == 3
+        assert sum(hist['counts']) + hist['missing'] == grouped['records_filtered']
+
+    def test_invalid_bins_rejected(self, app_server):
+        r = requests.get(f"{BASE_URL}/api/stats/grouped", params={'bins': '0'})
+        assert r.status_code == 400
+
+    @pytest.mark.parametrize('bins', ['abc', '0,x', 'nan,50', '0,inf'])
+    def test_malformed_bins_rejected(self, app_server, bins):
+        r = requests.get(f"{BASE_URL}/api/stats/grouped", params={'bins': bins})
+        assert r.status_code == 400
+        assert 'bins' in r.json()['error']
+
+    @pytest.mark.destructive
+    def test_pending_counts_follow_edits(self, app_server):
+        original = api_get_record(0)
+        api_update_field(0, 'memo', 'GROUPED_STATS_TEST')
+        grouped = api_get_grouped_stats()
+        assert grouped['pending']['fields'].get('memo', 0) >= 1
+
+        # Restore
+        api_update_field(0, 'memo', original.get('memo') or '')
@@ -0,0 +1,42 @@
+"""Tests for the BA_CONFIG what-if re-bucketing endpoint."""
+import pytest
+from helpers.api_helpers import api_get_stats, api_bucket_whatif
+
+
+class TestBucketWhatIf:
+
+    def test_distribution_covers_all_rows(self, app_server):
+        result = api_bucket_whatif().json()
+        assert sum(result['distribution'].values()) == api_get_stats()['total_records']
+
+    def test_transition_counts_add_up(self, app_server):
+        result = api_bucket_whatif({
+            'NEW BA AND NEW ADDRESS': {'min_name': 0, 'max_name': 40}
+        }).json()
+        assert result['changed'] == sum(t['count'] for t in result['transitions'])
+        assert all(t['from'] != t['to'] for t in result['transitions'])
+
+    def test_row_ids_respect_limit(self, app_server):
+        result = api_bucket_whatif({
+            'EXISTING BA AND EXISTING ADDRESS': {'min_name': 0, 'max_name': 100,
+                                                 'min_addr': 0, 'max_addr': 100}
+        }, include_rows=True, row_limit=5).json()
+        assert len(result['row_ids']) <= 5
+        assert len(result['row_ids']) == min(5, result['changed'])
+
+    def test_non_numeric_threshold_rejected(self, app_server):
+        r = api_bucket_whatif({'NEW BA AND NEW ADDRESS': {'min_name': 'abc'}})
+        assert r.status_code == 400
+
+    def test_bad_row_limit_rejected(self, app_server):
+        r = api_bucket_whatif(include_rows=True, row_limit='ten')
+        assert r.status_code == 400
+
+    def test_non_object_bucket_rejected(self, app_server):
+        r = api_bucket_whatif({'NEW BA AND NEW ADDRESS': 50})
+        assert r.status_code == 400
+
+    def test_whatif_does_not_modify_data(self, app_server):
+        before = api_get_stats()['recommendations']
+        api_bucket_whatif({'NEW BA AND NEW ADDRESS': {'min_name': 0, 'max_name': 100}})
+        assert api_get_stats()['recommendations'] == before
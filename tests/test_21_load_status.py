@@ -0,0 +1,20 @@
+"""Tests for the background data load status endpoint."""
+import pytest
+from helpers.api_helpers import api_get_load_status, api_get_stats
+
+
+class TestLoadStatus:
+
+    def test_ready_after_startup(self, app_server):
+        status = api_get_load_status()
+        assert status['ready'] is True
+        assert status['state'] == 'ready'
+
+    def test_rows_loaded_matches_total_records(self, app_server):
+        status = api_get_load_status()
+        assert status['rows_loaded'] == api_get_stats()['total_records']
+
+    def test_status_has_timestamps(self, app_server):
+        status = api_get_load_status()
+        assert status['started_at'] and status['finished_at']
+        assert status['error'] is None
@@ -0,0 +1,42 @@
+"""Tests for cheap, side-effect-free app startup (no server needed)."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _run(code):
+    env = dict(os.environ)
+    env.pop("SNOWFLAKE_ACCOUNT", None)
+    env.pop("DATA_SOURCE_TYPE", None)
+    return subprocess.run([sys.executable, "-c", code], cwd=APP_ROOT, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+
+class TestStartup:
+
+    def test_import_app_is_lightweight(self):
+        r = _run("import sys, app; print(sorted(m for m in ('pandas', 'flask', 'snowflake') if m in sys.modules))")
+        assert r.returncode == 0, r.stderr
+        assert r.stdout.strip() == "[]"
+
+    def test_create_app_without_snowflake_settings(self):
+        r = _run("import app; a = app.create_app(); print(len(list(a.url_map.iter_rules())))")
+        assert r.returncode == 0, r.stderr
+        assert int(r.stdout.strip()) > 10
+
+    def test_failed_snowflake_load_is_reported(self):
+        r = _run("import routes\n"
+                 "try:\n    routes.store.ensure_loaded()\nexcept Exception:\n    pass\n"
+                 "s = routes.store.load_status(); print(s['state'], bool(s['error']), s['ready'])")
+        assert r.returncode == 0, r.stderr
+        assert r.stdout.strip().splitlines()[-1] == "error True False"
+
+    def test_startup_benchmark_within_budget(self):
+        r = subprocess.run([sys.executable, "benchmarks/bench_startup.py", "--runs", "3"],
+                           cwd=APP_ROOT, capture_output=True, text=True, timeout=120)
+        assert r.returncode == 0, r.stdout + r.stderr
@@ -0,0 +1,80 @@
+"""Tests for the local SQLite data backend (no server needed)."""
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+
+from data_loader import DataBackend  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+
+@pytest.fixture
+def backend(tmp_path):
+    path = tmp_path / "matches.db"
+    rows = pd.DataFrame({
+        "canvas_id": ["100", "100", "200"],
+        "canvas_ssn": ["111111111", "222222222", "333333333"],
+        "canvas_name": ["ACME LLC", "ACME INC", "BETA CO"],
+        "canvas_city": ["HOUSTON", "DALLAS", "AUSTIN"],
+        "recommendation": ["NEEDS REVIEW"] * 3,
+    })
+    with sqlite3.connect(path) as conn:
+        rows.to_sql("import_merge_matches", conn, index=False)
+    b = SQLiteBackend({"source_type": "sqlite", "path": str(path), "table": "import_merge_matches"})
+    b.ensure_schema()
+    return b
+
+
+class TestSQLiteBackend:
+
+    def test_ensure_schema_adds_flag_columns(self, backend):
+        df = backend.load()
+        assert len(df) == 3
+        for col in ("jib", "rev", "vendor", "memo", "how_to_process"):
+            assert col in df.columns
+
+    def test_merge_updates_only_edited_fields(self, backend):
+        df = backend.load()
+        changes = {0: {"memo": ("", "checked")}, 1: {"canvas_city": ("DALLAS", "PLANO")}}
+        with backend.transaction() as tx:
+            affected = backend.merge_changes(changes, df, tx=tx)
+        assert affected == 2
+
+        after = backend.load().set_index("canvas_ssn")
+        assert after.loc["111111111", "memo"] == "checked"
+        assert after.loc["111111111", "canvas_city"] == "HOUSTON"
+        assert after.loc["222222222", "canvas_city"] == "PLANO"
+        assert after.loc["222222222", "memo"] == ""
+
+    def test_failed_transaction_rolls_back(self, backend):
+        df = backend.load()
+        with pytest.raises(RuntimeError):
+            with backend.transaction() as tx:
+                backend.merge_changes({2: {"canvas_name": ("BETA CO", "GAMMA")}}, df, tx=tx)
+                raise RuntimeError("boom")
+        assert backend.load().loc[2, "canvas_name"] == "BETA CO"
+
+    def test_audit_log_round_trip(self, backend):
+        backend.write_audit_log([("100", "111111111", "memo", "", "checked", "2026-01-01 10:00:00")])
+        log = backend.read_audit_log(limit=10)
+        assert len(log) == 1
+        assert log[0]["field_name"] == "memo"
+        assert log[0]["new_value"] == "checked"
+
+    def test_read_config(self, backend):
+        with backend.transaction() as tx:
+            tx.execute("INSERT INTO BA_CONFIG VALUES ('BUCKETS', 'HIGH_MIN', '90')")
+        assert backend.read_config("BUCKETS") == {"HIGH_MIN": "90"}
+
+    def test_incomplete_backend_fails_at_construction(self):
+        class LoadOnly(DataBackend):
+            def load(self, progress=None):
+                return pd.DataFrame()
+
+        with pytest.raises(TypeError):
+            LoadOnly({})
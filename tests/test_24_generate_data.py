@@ -0,0 +1,56 @@
+"""Tests for the synthetic dataset generator (no server needed)."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+from bucket_engine import BUCKET_ORDER  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+
+class TestGenerateData:
+
+    def test_same_seed_same_data(self):
+        a = generate_data.generate_matches(3000, seed=7, chunk_rows=1000)
+        b = generate_data.generate_matches(3000, seed=7, chunk_rows=1000)
+        c = generate_data.generate_matches(3000, seed=8, chunk_rows=1000)
+        assert a.equals(b)
+        assert not a.equals(c)
+
+    def test_shape_and_columns(self):
+        df = generate_data.generate_matches(2500, chunk_rows=1000)
+        assert len(df) == 2500
+        assert df["id"].is_unique
+        for col in ("canvas_id", "canvas_ssn", "canvas_name", "dec_hdrcode", "dec_name",
+                    "ssn_match", "name_score", "address_score", "nameaddrscore", "recommendation",
+                    "name_normal_detail", "addr_match_detail"):
+            assert col in df.columns
+        assert df["canvas_ssn"].str.len().eq(9).all()
+        assert df["name_score"].dropna().between(0, 100).all()
+
+    def test_recommendations_follow_bucket_ranges(self):
+        df = generate_data.generate_matches(5000)
+        recs = set(df["recommendation"].unique())
+        assert set(BUCKET_ORDER) <= recs
+        exact = df[df["recommendation"] == "EXISTING BA AND EXISTING ADDRESS"]
+        assert (exact["name_score"] >= 90).all() and (exact["address_score"] >= 90).all()
+        new_ba = df[df["recommendation"] == "NEW BA AND NEW ADDRESS"]
+        assert (new_ba["name_score"] < 70).all()
+        processed = df[df["recommendation"] == "PROCESSED"]
+        assert (processed["how_to_process"] != "").all()
+
+    def test_write_sqlite_seeds_ba_config(self, tmp_path):
+        path = tmp_path / "matches.db"
+        generate_data.write_sqlite(str(path), 1500, chunk_rows=500)
+        backend = SQLiteBackend({"source_type": "sqlite", "path": str(path)})
+        df = backend.load()
+        assert len(df) == 1500
+        assert np.issubdtype(df["name_score"].dtype, np.floating)
+        config = backend.read_config("BUCKETS")
+        assert config["EXISTING_BA_EXISTING_ADDR_MIN_NAME_SCORE"] == "90"
+        assert len(config) == 12
@@ -0,0 +1,34 @@
+"""Smoke test for the API benchmark harness (no server needed)."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import bench_api  # noqa: E402
+
+
+class TestBenchApi:
+
+    def test_small_run_writes_results_and_compares_to_baseline(self, tmp_path):
+        out, baseline = tmp_path / "results.json", tmp_path / "baseline.json"
+        cmd = [sys.executable, "benchmarks/bench_api.py", "--sizes", "2000", "--iterations", "3",
+               "--warmup", "1", "--workdir", str(tmp_path), "--out", str(out), "--baseline", str(baseline)]
+        r = subprocess.run(cmd + ["--save-baseline"], cwd=APP_ROOT, capture_output=True, text=True, timeout=300)
+        assert r.returncode == 0, r.stdout + r.stderr
+        results = json.loads(out.read_text())["results"]["2000"]
+        for name in ("matches", "matches_all", "stats", "update", "bulk_update",
+                     "search_find", "search_replace", "save_changes"):
+            assert results[name]["p50_ms"] <= results[name]["p99_ms"]
+
+        r = subprocess.run(cmd + ["--tolerance", "100"], cwd=APP_ROOT, capture_output=True, text=True, timeout=300)
+        assert r.returncode == 0, r.stdout + r.stderr
+        assert "OK" in r.stdout
+
+    def test_compare_flags_slowdowns_over_tolerance(self):
+        baseline = {"results": {"1000": {"matches": {"p50_ms": 10.0, "p95_ms": 20.0}}}}
+        slower = {"results": {"1000": {"matches": {"p50_ms": 14.0, "p95_ms": 21.0}}}}
+        assert bench_api.compare(slower, baseline, 0.25, 2.0) == [("1000", "matches", "p50_ms", 10.0, 14.0)]
+        assert bench_api.compare(slower, baseline, 0.5, 2.0) == []
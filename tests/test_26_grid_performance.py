@@ -0,0 +1,212 @@
+"""Grid performance measurements at several generated dataset sizes.
+
+Each size gets its own server (serve.py on the local SQLite backend) fed by
+benchmarks/generate_data.py. Timings come from the browser Performance API and
+are written to benchmarks/results/grid-<timestamp>.json next to the API
+benchmark results. Sizes: GRID_PERF_SIZES (default "10000,100000").
+"""
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import requests
+from playwright.sync_api import Page
+from helpers.selectors import *
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+
+SIZES = [int(s) for s in os.environ.get("GRID_PERF_SIZES", "10000,100000").split(",") if s.strip()]
+RUNS = 5
+# Interaction ceilings: only catch pathological slowdowns, the trend lives in the results file
+INTERACTION_BUDGET_MS = 5000
+
+pytestmark = [pytest.mark.perf, pytest.mark.slow, pytest.mark.timeout(900)]
+
+_results = {}
+
+# Runs `action` (awaiting it when it returns a promise), waits for the next frame (so
+# rendering is included), then `reset`; per-run ms
+_MEASURE_JS = """
+async ([action, reset, runs]) => {
+    const nextFrame = () => new Promise(r => requestAnimationFrame(() => r()));
+    const times = [];
+    for (let i = 0; i < runs; i++) {
+        await nextFrame();
+        const t0 = performance.now();
+        await new Function(action)();
+        await nextFrame();
+        times.push(performance.now() - t0);
+        new Function(reset)();
+        await nextFrame();
+    }
+    return times;
+}
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def _record(rows, metric, value):
+    _results.setdefault(str(rows), {})[metric] = round(value, 1)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def perf_report():
+    """Write everything measured in this module as one results file."""
+    yield
+    if not _results:
+        return
+    out_dir = APP_ROOT / "benchmarks" / "results"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / f"grid-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.write_text(json.dumps({
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": RUNS,
+        },
+        "results": _results,
+    }, indent=2))
+    print(f"\nGrid performance results: {out}")
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n}rows")
+def sized_server(request, tmp_path_factory):
+    """(base_url, rows) for a server loaded with `rows` generated records."""
+    rows = request.param
+    db = tmp_path_factory.mktemp("grid_perf") / f"matches_{rows}.db"
+    generate_data.write_sqlite(str(db), rows)
+
+    port = _free_port()
+    env = dict(os.environ, DATA_SOURCE_TYPE="sqlite", SQLITE_PATH=str(db))
+    proc = subprocess.Popen(
+        [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=APP_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            r = requests.get(f"{base_url}/api/load_status", timeout=1)
+            if r.status_code == 200 and r.json().get("ready"):
+                break
+        except requests.ConnectionError:
+            pass
+        time.sleep(1)
+    else:
+        proc.terminate()
+        raise RuntimeError(f"Server with {rows} rows did not load within 300 seconds")
+
+    yield base_url, rows
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+def _open(page: Page, base_url: str):
+    page.goto(base_url)
+    page.wait_for_selector(GRID_ROW, timeout=300000)
+    page.wait_for_selector(REC_CARD, timeout=60000)
+    page.wait_for_function("() => performance.getEntriesByName('grid:first-row').length > 0")
+
+
+def _measure(page: Page, action: str, reset: str):
+    return page.evaluate(_MEASURE_JS, [action, reset, RUNS])
+
+
+class TestGridPerformance:
+
+    def test_initial_load(self, page: Page, sized_server):
+        base_url, rows = sized_server
+        _open(page, base_url)
+        marks = page.evaluate("""() => {
+            const t = name => { const e = performance.getEntriesByName(name); return e.length ? e[0].startTime : null; };
+            return {
+                fetch_start: t('grid:fetch-start'), parsed: t('grid:data-parsed'),
+                data_set: t('grid:data-set'), first_row: t('grid:first-row'), stats: t('stats:loaded'),
+                row_count: gridApi.getDisplayedRowCount(),
+            };
+        }""")
+        assert marks["row_count"] == rows
+
+        _record(rows, "time_to_first_row_ms", marks["first_row"])
+        _record(rows, "full_load_ms", max(marks["first_row"], marks["stats"]))
+        _record(rows, "matches_all_fetch_parse_ms", marks["parsed"] - marks["fetch_start"])
+        _record(rows, "set_row_data_ms", marks["data_set"] - marks["parsed"])
+
+    def test_filter_apply_latency(self, page: Page, sized_server):
+        base_url, rows = sized_server
+        _open(page, base_url)
+        times = _measure(page,
+                         "$('#ssnFilter').val('yes'); $('#minNameScore').val('90'); onExternalFilterChanged();",
+                         "$('#ssnFilter').val(''); $('#minNameScore').val(''); onExternalFilterChanged();")
+        _record(rows, "filter_apply_ms", _median(times))
+        assert _median(times) < INTERACTION_BUDGET_MS
+
+    def test_sort_latency(self, page: Page, sized_server):
+        base_url, rows = sized_server
+        _open(page, base_url)
+        times = _measure(page,
+                         "gridApi.applyColumnState({state: [{colId: 'name_score', sort: 'desc'}], defaultState: {sort: null}});",
+                         "gridApi.applyColumnState({defaultState: {sort: null}});")
+        _record(rows, "sort_ms", _median(times))
+        assert _median(times) < INTERACTION_BUDGET_MS
+
+    def test_search_find_latency(self, page: Page, sized_server):
+        base_url, rows = sized_server
+        _open(page, base_url)
+        times = _measure(page,
+                         "$('#srSearch').val('RANCH'); $('#srColumn').val('all');"
+                         "return new Promise(function(done) { srBuildMatches(done); })"
+                         ".then(function() { window._perfMatches = srMatches.length; });",
+                         "$('#srSearch').val(''); srMatches = [];")
+        assert page.evaluate("() => window._perfMatches") > 0
+        _record(rows, "search_find_ms", _median(times))
+        assert _median(times) < INTERACTION_BUDGET_MS
+
+    @pytest.mark.destructive
+    def test_undo_bulk_approve_1000(self, page: Page, sized_server):
+        base_url, rows = sized_server
+        _open(page, base_url)
+        n = page.evaluate("""() => {
+            let ids = [];
+            gridApi.forEachNodeAfterFilterAndSort(function(node) {
+                if (ids.length < 1000 && node.data.recommendation !== 'APPROVED') ids.push(node.data._row_id);
+            });
+            ids.forEach(function(id) { selectedRows.add(id); });
+            bulkApprove();
+            return ids.length;
+        }""")
+        page.locator(CONFIRM_OK_BTN).click()
+        page.wait_for_function(f"() => undoStack.length > 0 && undoStack[undoStack.length - 1].changes.length === {n}")
+        page.wait_for_selector(TOAST, state="visible", timeout=60000)
+
+        elapsed = page.evaluate("""() => new Promise(function(resolve) {
+            const before = redoStack.length;
+            const t0 = performance.now();
+            performUndo();
+            (function poll() {
+                if (redoStack.length > before) resolve(performance.now() - t0);
+                else setTimeout(poll, 5);
+            })();
+        })""")
+        _record(rows, "undo_bulk_approve_1000_ms", elapsed)
+        assert page.evaluate("() => redoStack.length") == 1
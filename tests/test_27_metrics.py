@@ -0,0 +1,68 @@
+"""Tests for the opt-in request timing / Prometheus metrics (no server needed)."""
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+
+import metrics  # noqa: E402
+
+
+@pytest.fixture
+def enabled():
+    previous = metrics.ENABLED
+    metrics.enable(True)
+    yield
+    metrics.enable(previous)
+
+
+class TestMetrics:
+
+    def test_histogram_buckets_are_cumulative(self):
+        h = metrics.Histogram('t_seconds', 'test', ('stage',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            h.observe(value, stage='a')
+        lines = h.render()
+        assert 't_seconds_bucket{stage="a",le="0.1"} 1' in lines
+        assert 't_seconds_bucket{stage="a",le="1"} 3' in lines
+        assert 't_seconds_bucket{stage="a",le="+Inf"} 4' in lines
+        assert 't_seconds_count{stage="a"} 4' in lines
+        assert 't_seconds_sum{stage="a"} 6.050000' in lines
+
+    def test_counter_and_gauge_render(self):
+        registry = metrics.Registry()
+        c = registry.counter('t_total', 'test', ('endpoint',))
+        c.inc(endpoint='get_stats')
+        c.inc(2, endpoint='get_stats')
+        registry.gauge('t_rows', 'test', lambda: 42)
+        text = registry.render()
+        assert '# TYPE t_total counter' in text
+        assert 't_total{endpoint="get_stats"} 3' in text
+        assert 't_rows 42' in text
+
+    def test_request_spans_become_server_timing(self, enabled):
+        metrics.start_request()
+        with metrics.span('t.filter'):
+            pass
+        with metrics.span('t.encode'):
+            pass
+        timing = metrics.finish_request('get_matches', 'GET', 200)
+        stages = [entry.split(';')[0] for entry in timing.split(', ')]
+        assert stages == ['t.filter', 't.encode', 'total']
+        text = metrics.render()
+        assert 'ba_review_requests_total{endpoint="get_matches",method="GET",status="200"}' in text
+        assert 'ba_review_stage_duration_seconds_count{stage="t.filter"}' in text
+
+    def test_disabled_is_a_no_op(self):
+        previous = metrics.ENABLED
+        metrics.enable(False)
+        try:
+            metrics.start_request()
+            with metrics.span('t.disabled'):
+                pass
+            assert metrics.finish_request('get_stats', 'GET', 200) is None
+            assert 't.disabled' not in metrics.render()
+        finally:
+            metrics.enable(previous)
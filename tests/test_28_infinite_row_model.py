@@ -0,0 +1,90 @@
+"""Tests for the block-fetching /api/matches behind the grid's infinite row model
+(Flask test client on generated data, no server needed)."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+
+ROWS = 3000
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    path = tmp_path_factory.mktemp("infinite") / "matches.db"
+    generate_data.write_sqlite(str(path), ROWS)
+    os.environ["DATA_SOURCE_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(path)
+    from app import create_app
+    import routes
+    app = create_app()
+    routes.DATA_CONFIG["path"] = str(path)
+    routes.store.ensure_loaded(force=True)
+    return app.test_client()
+
+
+def _block(client, start, end, **params):
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    return client.get(f"/api/matches?startRow={start}&endRow={end}&{query}").get_json()
+
+
+class TestInfiniteRowModel:
+
+    def test_blocks_cover_filtered_rows_in_order(self, client):
+        params = {"sort": "name_score:desc,canvas_csz:asc", "ssn_match": "yes"}
+        first = _block(client, 0, 200, **params)
+        assert first["recordsTotal"] == ROWS
+        total = first["recordsFiltered"]
+        rows = first["data"]
+        for start in range(200, total, 200):
+            rows += _block(client, start, start + 200, **params)["data"]
+        assert len(rows) == total
+        assert len({r["_row_id"] for r in rows}) == total
+        assert all(r["ssn_match"] == 100 for r in rows)
+        scores = [r["name_score"] for r in rows if r["name_score"] != ""]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_block_matches_datatables_page(self, client):
+        block = _block(client, 50, 75, min_name_score=80)
+        page = client.get("/api/matches?start=50&length=25&min_name_score=80").get_json()
+        assert [r["_row_id"] for r in block["data"]] == [r["_row_id"] for r in page["data"]]
+
+    def test_edits_show_in_the_next_block(self, client):
+        row = _block(client, 0, 1, sort="id:asc")["data"][0]
+        client.post("/api/update", json={"row_id": row["_row_id"], "field": "memo", "value": "infinite"})
+        assert _block(client, 0, 1, sort="id:asc")["data"][0]["memo"] == "infinite"
+
+    def test_row_model_follows_table_size(self, client, monkeypatch):
+        import routes
+        monkeypatch.setattr(routes, "GRID_INFINITE_ROWS", ROWS - 1)
+        assert client.get("/api/load_status").get_json()["row_model"] == "infinite"
+        monkeypatch.setattr(routes, "GRID_INFINITE_ROWS", ROWS)
+        assert client.get("/api/load_status").get_json()["row_model"] == "clientSide"
+
+    def test_search_replace_find_accepts_filters(self, client):
+        everywhere = client.post("/api/search_replace", json={
+            "search": "RANCH", "column": "all", "mode": "find"}).get_json()
+        filtered = client.post("/api/search_replace", json={
+            "search": "RANCH", "column": "all", "mode": "find", "filters": {"ssn_match": "yes"}}).get_json()
+        assert 0 < filtered["rows"] < everywhere["rows"]
+
+    def test_quick_filter_matches_terms_literally_in_any_order(self, client):
+        def count(text):
+            return client.get("/api/matches", query_string={
+                "startRow": 0, "endRow": 1, "search[value]": text}).get_json()["recordsFiltered"]
+
+        # Regex metacharacters are plain text
+        assert count(".*") == 0
+        row = _block(client, 0, 1, sort="id:asc")["data"][0]
+        name, city = row["canvas_name"].split()[0], row["canvas_city"]
+        # Terms are ANDed, each may sit in any grid column, in any order
+        assert count(f"{name} {city}") == count(f"{city.lower()} {name}") > 0
+        assert count(f"{name} {city}") <= count(name)
+        # Columns outside the grid (e.g. the match-detail JSON) aren't searched
+        assert count("token_sort") == 0
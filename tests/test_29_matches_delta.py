@@ -0,0 +1,100 @@
+"""Tests for the data version change log and /api/matches_delta behind the browser's
+IndexedDB cache (Flask test client on generated data, no server needed)."""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+from data_store import DataStore  # noqa: E402
+
+ROWS = 2000
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    path = tmp_path_factory.mktemp("delta") / "matches.db"
+    generate_data.write_sqlite(str(path), ROWS)
+    os.environ["DATA_SOURCE_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(path)
+    from app import create_app
+    import routes
+    app = create_app()
+    routes.DATA_CONFIG["path"] = str(path)
+    routes.store.ensure_loaded(force=True)
+    return app.test_client()
+
+
+def _held_version(client):
+    r = client.get("/api/matches_all")
+    return r.headers["X-Data-Epoch"], int(r.headers["X-Data-Version"]), r.get_json()
+
+
+class TestChangeLog:
+
+    def test_changed_since_tracks_edits_within_a_load(self):
+        store = DataStore(lambda: pd.DataFrame({"memo": ["", "", ""]}), change_log_size=3)
+        store.ensure_loaded()
+        start = store.version
+        with store.write():
+            store.record_pending(2, "memo", "", "a")
+            store.record_pending(0, "memo", "", "b")
+        assert store.changed_since(start) == [0, 2]
+        assert store.changed_since(start + 1) == [0]
+        assert store.changed_since(store.version) == []
+        assert store.changed_since(start - 1) is None
+
+        # Older versions fall out of a full log
+        with store.write():
+            store.record_pending(1, "memo", "", "c")
+            store.record_pending(1, "memo", "c", "d")
+        assert store.changed_since(start) is None
+        assert store.changed_since(start + 1) == [0, 1]
+
+
+class TestSnapshots:
+
+    def test_edits_copy_only_the_edited_column(self):
+        store = DataStore(lambda: pd.DataFrame({"memo": ["", "", ""], "jib": [0, 0, 0]}))
+        store.ensure_loaded()
+        snap = store.snapshot()
+        with store.write(columns=["memo"]) as df:
+            df.at[1, "memo"] = "edited"
+            store.record_pending(1, "memo", "", "edited")
+        assert snap.df.at[1, "memo"] == ""
+        assert store.snapshot().df.at[1, "memo"] == "edited"
+        # Untouched columns stay shared between the snapshot and the live frame
+        assert np.shares_memory(snap.df["jib"].to_numpy(), store.df["jib"].to_numpy())
+        assert not np.shares_memory(snap.df["memo"].to_numpy(), store.df["memo"].to_numpy())
+
+
+class TestMatchesDelta:
+
+    def test_delta_returns_only_edited_rows(self, client):
+        epoch, version, rows = _held_version(client)
+        assert len(rows) == ROWS
+        client.post("/api/update", json={"row_id": 5, "field": "memo", "value": "delta"})
+        client.post("/api/bulk_update", json={"row_ids": [7, 9], "recommendation": "APPROVED"})
+
+        delta = client.get(f"/api/matches_delta?epoch={epoch}&since={version}").get_json()
+        assert delta["full"] is False
+        assert [r["_row_id"] for r in delta["rows"]] == [5, 7, 9]
+        assert delta["rows"][0]["memo"] == "delta"
+        assert delta["rows"][1]["recommendation"] == "APPROVED"
+        assert set(delta["rows"][0]) == set(rows[0])
+
+        caught_up = client.get(f"/api/matches_delta?epoch={epoch}&since={delta['version']}").get_json()
+        assert caught_up["rows"] == []
+
+    def test_other_load_needs_full_refetch(self, client):
+        epoch, version, _ = _held_version(client)
+        assert client.get(f"/api/matches_delta?epoch=other&since={version}").get_json()["full"] is True
+        client.post("/api/reload")
+        assert client.get(f"/api/matches_delta?epoch={epoch}&since={version}").get_json()["full"] is True
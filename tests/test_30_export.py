@@ -0,0 +1,139 @@
+"""Tests for the streamed server-side export at /api/export (Flask test client on
+generated data, no server needed)."""
+import gzip
+import io
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+import exporter  # noqa: E402
+
+ROWS = 2000
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    path = tmp_path_factory.mktemp("export") / "matches.db"
+    generate_data.write_sqlite(str(path), ROWS)
+    os.environ["DATA_SOURCE_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(path)
+    from app import create_app
+    import routes
+    app = create_app()
+    routes.DATA_CONFIG["path"] = str(path)
+    routes.store.ensure_loaded(force=True)
+    return app.test_client()
+
+
+class TestExportCsv:
+
+    def test_filtered_sorted_columns(self, client):
+        r = client.get("/api/export?ssn_match=yes&sort=name_score:desc&columns=id,name_score,canvas_name&gzip=0")
+        assert r.status_code == 200
+        assert r.mimetype == "text/csv"
+        assert "attachment" in r.headers["Content-Disposition"]
+        df = pd.read_csv(io.BytesIO(r.get_data()))
+        expected = client.get("/api/matches?ssn_match=yes&startRow=0&endRow=0").get_json()["recordsFiltered"]
+        assert list(df.columns) == ["id", "name_score", "canvas_name"]
+        assert len(df) == expected == int(r.headers["X-Export-Rows"])
+        assert df["name_score"].is_monotonic_decreasing
+
+    def test_selected_rows(self, client):
+        import routes
+        r = client.post("/api/export", data={"row_ids": "7,3,11", "columns": "id,canvas_id", "gzip": "0"})
+        df = pd.read_csv(io.BytesIO(r.get_data()))
+        assert sorted(df["id"]) == sorted(routes.store.snapshot().df.loc[[3, 7, 11], "id"])
+
+    def test_row_ids_keep_the_given_order(self, client):
+        import routes
+        r = client.post("/api/export", data={"row_ids": "11,3,7,3", "columns": "id", "gzip": "0"})
+        df = pd.read_csv(io.BytesIO(r.get_data()))
+        assert df["id"].tolist() == routes.store.snapshot().df.loc[[11, 3, 7], "id"].tolist()
+
+    def test_gzip_when_accepted(self, client):
+        r = client.get("/api/export", headers={"Accept-Encoding": "gzip, deflate"})
+        assert r.headers["Content-Encoding"] == "gzip"
+        df = pd.read_csv(io.BytesIO(gzip.decompress(r.get_data())))
+        assert len(df) == ROWS
+
+    def test_chunks_join_to_one_csv(self):
+        df = pd.DataFrame({"a": range(10), "b": [f"x{i}" for i in range(10)]})
+        rows = df.index[::-1]
+        chunks = list(exporter.iter_chunks(df, ["b"], rows, chunk_rows=3))
+        assert [len(c) for c in chunks] == [3, 3, 3, 1]
+        out = b"".join(exporter.iter_csv(df, ["a", "b"], rows))
+        assert pd.read_csv(io.BytesIO(out))["a"].tolist() == list(range(9, -1, -1))
+
+
+class TestExportErrors:
+
+    @pytest.mark.parametrize("query", ["format=pdf", "columns=no_such_column", "row_ids=1,x"])
+    def test_bad_request(self, client, query):
+        r = client.get(f"/api/export?{query}")
+        assert r.status_code == 400
+        assert "error" in r.get_json()
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class TestExportTyped:
+
+    def test_parquet_row_groups_and_dirty_flag(self, client, monkeypatch):
+        pq = pytest.importorskip("pyarrow.parquet")
+        import routes
+        routes.store.ensure_loaded(force=True)
+        client.post("/api/update", json={"row_id": 5, "field": "memo", "value": "typed export"})
+        monkeypatch.setattr(exporter, "EXPORT_CHUNK_ROWS", 500)
+        r = client.get("/api/export?format=parquet&columns=id,name_score,memo,jib")
+        assert r.status_code == 200
+        f = pq.ParquetFile(io.BytesIO(r.get_data()))
+        assert f.metadata.num_row_groups == ROWS // 500
+        df = f.read().to_pandas()
+        assert str(df["name_score"].dtype) == "float64"
+        assert str(df["jib"].dtype) == "int64"
+        assert df.loc[df["dirty"], "memo"].tolist() == ["typed export"]
+
+    def test_arrow_ipc(self, client):
+        pytest.importorskip("pyarrow")
+        r = client.get("/api/export?format=arrow&ssn_match=yes&sort=name_score:desc")
+        df = pd.read_feather(io.BytesIO(r.get_data()))
+        assert len(df) == int(r.headers["X-Export-Rows"])
+        assert df["name_score"].is_monotonic_decreasing
+        assert "dirty" in df.columns
+
+    @pytest.mark.skipif(_has_pyarrow(), reason="pyarrow installed")
+    def test_without_pyarrow(self, client):
+        r = client.get("/api/export?format=parquet")
+        assert r.status_code == 400
+        assert "pyarrow" in r.get_json()["error"]
+
+
+def test_xlsx_without_openpyxl_fails_before_streaming(client, monkeypatch):
+    monkeypatch.setitem(sys.modules, "openpyxl", None)
+    r = client.get("/api/export?format=xlsx")
+    assert r.status_code == 400
+    assert "openpyxl" in r.get_json()["error"]
+
+
+def test_xlsx(client):
+    pytest.importorskip("openpyxl")
+    r = client.get("/api/export?format=xlsx&recommendation=APPROVED&columns=id,recommendation")
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+    df = pd.read_excel(io.BytesIO(r.get_data()))
+    assert len(df) == int(r.headers["X-Export-Rows"])
+    assert set(df["recommendation"]) <= {"APPROVED"}
@@ -0,0 +1,89 @@
+"""Tests for the label-based record endpoints (/api/record, /api/records) and the
+serialized record cache behind them (Flask test client on generated data)."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+
+ROWS = 500
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    path = tmp_path_factory.mktemp("records") / "matches.db"
+    generate_data.write_sqlite(str(path), ROWS)
+    os.environ["DATA_SOURCE_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(path)
+    from app import create_app
+    import routes
+    app = create_app()
+    routes.DATA_CONFIG["path"] = str(path)
+    routes.store.ensure_loaded(force=True)
+    return app.test_client()
+
+
+class TestRecord:
+
+    def test_all_fields_by_default(self, client):
+        import routes
+        d = client.get("/api/record/7").get_json()
+        assert d["_row_id"] == 7
+        assert set(routes.store.snapshot().df.columns) <= set(d)
+        assert isinstance(d["name_match_detail"], dict)
+
+    def test_field_groups(self, client):
+        d = client.get("/api/record/7?groups=scores,canvas").get_json()
+        assert set(d) == {"ssn_match", "name_score", "address_score", "nameaddrscore", "_row_id",
+                          "canvas_id", "canvas_addrseq", "canvas_ssn", "canvas_name",
+                          "canvas_address", "canvas_city", "canvas_state", "canvas_zip"}
+
+    def test_resolves_by_label(self, client):
+        import routes
+        # A frame whose labels are not positions (e.g. after filtering on load)
+        with routes.store.write() as df:
+            shifted = df.iloc[::-1]
+        routes.store.replace(shifted)
+        try:
+            d = client.get("/api/record/0?groups=review").get_json()
+            assert d["id"] == shifted.at[0, "id"]
+        finally:
+            routes.store.ensure_loaded(force=True)
+
+    def test_errors(self, client):
+        assert client.get(f"/api/record/{ROWS + 10}").status_code == 404
+        assert client.get("/api/record/1?groups=nope").status_code == 400
+
+    def test_edit_invalidates_cached_record(self, client):
+        assert client.get("/api/record/9?groups=review").get_json()["memo"] != "edited"
+        client.post("/api/update", json={"row_id": 9, "field": "memo", "value": "edited"})
+        assert client.get("/api/record/9?groups=review").get_json()["memo"] == "edited"
+
+
+class TestRecordsBatch:
+
+    def test_order_and_missing(self, client):
+        d = client.post("/api/records", json={"row_ids": [4, 2, ROWS + 1, 3], "groups": ["scores"]}).get_json()
+        assert [r["_row_id"] for r in d["records"]] == [4, 2, 3]
+        assert d["missing"] == [ROWS + 1]
+        assert "canvas_name" not in d["records"][0]
+
+    def test_query_string(self, client):
+        d = client.get("/api/records?row_ids=1,2&groups=canvas").get_json()
+        assert [r["_row_id"] for r in d["records"]] == [1, 2]
+
+    def test_cache_hits(self, client):
+        before = client.get("/api/cache_stats").get_json()["records"]["hits"]
+        client.post("/api/records", json={"row_ids": [20, 21], "groups": ["dec"]})
+        client.post("/api/records", json={"row_ids": [20, 21], "groups": ["dec"]})
+        assert client.get("/api/cache_stats").get_json()["records"]["hits"] == before + 2
+
+    def test_batch_limit(self, client):
+        r = client.post("/api/records", json={"row_ids": list(range(501))})
+        assert r.status_code == 400
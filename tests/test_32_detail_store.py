@@ -0,0 +1,103 @@
+"""Tests for the parsed match-detail side store and its removal from the bulk grid
+payloads (Flask test client on generated data, no server needed)."""
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+from detail_store import DETAIL_COLUMNS, DetailStore  # noqa: E402
+
+ROWS = 500
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    path = tmp_path_factory.mktemp("details") / "matches.db"
+    generate_data.write_sqlite(str(path), ROWS)
+    os.environ["DATA_SOURCE_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(path)
+    from app import create_app
+    import routes
+    app = create_app()
+    routes.DATA_CONFIG["path"] = str(path)
+    routes.store.ensure_loaded(force=True)
+    return app.test_client()
+
+
+class TestDetailStore:
+
+    def test_typed_components(self):
+        df = pd.DataFrame({
+            "name_match_detail": ['{"token_sort": 25.6, "jaro_winkler": 0.256}', None,
+                                  '{"token_sort": 100, "jaro_winkler": 1.0}'],
+            "name_normal_detail": ['{"canvas": "A CO", "dec": "B"}', '{"canvas": "A CO", "dec": "C"}', ""],
+        }, index=[10, 11, 12])
+        store = DetailStore(df)
+        assert store.fields["name_match_detail"]["token_sort"].dtype == np.float32
+        assert list(store.fields["name_normal_detail"]["canvas"].categories) == ["A CO"]
+        assert store.row(0)["name_match_detail"] == {"token_sort": 25.6, "jaro_winkler": 0.256}
+        assert store.row(1)["name_match_detail"] is None
+        assert store.row(2) == {"name_match_detail": {"token_sort": 100, "jaro_winkler": 1},
+                                "name_normal_detail": None}
+        assert list(store.positions([12, 99])) == [2, -1]
+
+    def test_values_that_are_not_json_objects(self):
+        df = pd.DataFrame({"addr_match_detail": ['{"zip": 100}', "not json", "[1, 2]"]})
+        store = DetailStore(df)
+        assert store.row(0)["addr_match_detail"] == {"zip": 100}
+        assert store.row(1)["addr_match_detail"] == "not json"
+        assert store.row(2)["addr_match_detail"] == [1, 2]
+
+    def test_malformed_values_do_not_shift_rows(self):
+        df = pd.DataFrame({"addr_match_detail": ["1,2", '{"a": 1}', "[3", "4]", '{"a": 2}']})
+        store = DetailStore(df)
+        assert store.row(0)["addr_match_detail"] == "1,2"
+        assert store.row(1)["addr_match_detail"] == {"a": 1}
+        assert store.row(2)["addr_match_detail"] == "[3"
+        assert store.row(3)["addr_match_detail"] == "4]"
+        assert store.row(4)["addr_match_detail"] == {"a": 2}
+
+    def test_matches_generated_json(self, client):
+        import routes
+        df = routes.store.snapshot().df
+        store = DetailStore(df)
+        for pos in (0, 7, ROWS - 1):
+            for col in DETAIL_COLUMNS:
+                assert store.row(pos)[col] == pytest.approx(json.loads(df[col].iloc[pos]))
+        assert store.nbytes() < df[list(DETAIL_COLUMNS)].memory_usage(deep=True).sum()
+
+
+class TestDetailPayloads:
+
+    def test_not_in_bulk_payloads(self, client):
+        row = client.get("/api/matches_all").get_json()[0]
+        assert not set(DETAIL_COLUMNS) & set(row)
+        block = client.get("/api/matches?startRow=0&endRow=5").get_json()["data"][0]
+        assert not set(DETAIL_COLUMNS) & set(block)
+
+    def test_served_on_demand(self, client):
+        d = client.post("/api/records", json={"row_ids": [3, 4], "groups": ["detail"]}).get_json()
+        assert [r["_row_id"] for r in d["records"]] == [3, 4]
+        assert set(d["records"][0]) == set(DETAIL_COLUMNS) | {"_row_id"}
+        assert "token_sort" in d["records"][0]["name_match_detail"]
+
+    def test_export_keeps_raw_details(self, client):
+        r = client.get("/api/export?gzip=0&row_ids=1")
+        header = r.get_data(as_text=True).splitlines()[0].split(",")
+        assert set(DETAIL_COLUMNS) <= set(header)
+
+    def test_reparsed_after_reload(self, client):
+        import routes
+        first = routes._get_detail_store()
+        assert routes._get_detail_store() is first
+        routes.store.ensure_loaded(force=True)
+        assert routes._get_detail_store() is not first
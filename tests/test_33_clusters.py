@@ -0,0 +1,107 @@
+"""Tests for the duplicate-cluster engine and /api/clusters (Flask test client on
+generated data, no server needed)."""
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+sys.path.insert(0, str(APP_ROOT / "benchmarks"))
+
+import generate_data  # noqa: E402
+from cluster_engine import ClusterEngine, normalize_address, normalize_name  # noqa: E402
+
+ROWS = 1000
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    path = tmp_path_factory.mktemp("clusters") / "matches.db"
+    generate_data.write_sqlite(str(path), ROWS)
+    os.environ["DATA_SOURCE_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(path)
+    from app import create_app
+    import routes
+    app = create_app()
+    routes.DATA_CONFIG["path"] = str(path)
+    routes.store.ensure_loaded(force=True)
+    return app.test_client()
+
+
+class TestNormalize:
+
+    def test_names(self):
+        assert normalize_name("Cottonwood Holdings, L.P.") == normalize_name("COTTONWOOD HOLDINGS LP") \
+            == "COTTONWOOD HOLDINGS"
+        assert normalize_name("O'Brien & Sons Co.") == "OBRIEN SONS"
+        assert normalize_name("  ") is None
+
+    def test_addresses(self):
+        assert normalize_address("1490 Pine Road, Suite 5") == "1490 PINE RD STE 5"
+        assert normalize_address("P.O. Box 12") == "PO BOX 12"
+
+
+class TestClusterEngine:
+
+    @pytest.fixture
+    def engine(self):
+        df = pd.DataFrame({
+            "canvas_id": ["A", "A", "B", "A", None],
+            "dec_hdrcode": ["1", "2", "2", "3", "3"],
+            "canvas_name": ["X LLC", "X, L.L.C.", "Y", "X", "Z"],
+            "canvas_address": ["1 Main Street", "1 MAIN ST", "2 Oak", "1 Main St", "1 Main St"],
+            "canvas_zip": ["75001", "75001-1234", "75002", "75001", "99999"],
+            "name_score": [90.0, 80.0, 70.0, None, 50.0],
+            "address_score": [100.0, 100.0, 0.0, 50.0, 10.0],
+            "ssn_match": [100, 0, 0, 100, 0],
+        }, index=[10, 11, 12, 13, 14])
+        return ClusterEngine(df)
+
+    def test_groups_and_summaries(self, engine):
+        result = engine.clusters("canvas_id")
+        assert result["total_clusters"] == 1
+        a = result["clusters"][0]
+        assert (a["key"], a["size"]) == ("A", 3)
+        assert a["name_score"] == {"min": 80.0, "mean": 85.0, "max": 90.0}
+
+    def test_normalized_keys(self, engine):
+        assert engine.cluster("name", key="x inc")["row_ids"] == [10, 11, 13]
+        assert engine.cluster("address", row_id=13)["row_ids"] == [10, 11, 13]
+
+    def test_sort_and_page(self, engine):
+        keys = [c["key"] for c in engine.clusters("dec_hdrcode", sort="name_score", ascending=True)["clusters"]]
+        assert keys == ["3", "2"]
+        assert engine.clusters("dec_hdrcode", start=1, length=1)["clusters"][0]["key"] == "3"
+        assert engine.clusters("dec_hdrcode", min_size=1)["total_clusters"] == 3
+
+    def test_missing(self, engine):
+        assert engine.cluster("canvas_id", key="nope") is None
+        assert engine.cluster("canvas_id", row_id=14) is None
+
+
+class TestClustersEndpoint:
+
+    def test_list(self, client):
+        d = client.get("/api/clusters?by=dec_hdrcode&length=5").get_json()
+        assert len(d["clusters"]) <= 5
+        sizes = [c["size"] for c in d["clusters"]]
+        assert sizes == sorted(sizes, reverse=True) and min(sizes) >= 2
+
+    def test_cluster_rows(self, client):
+        import routes
+        df = routes.store.snapshot().df
+        d = client.get("/api/clusters?by=canvas_id&row_id=4&rows=1").get_json()
+        assert d["row_ids"] == df.index[df["canvas_id"] == df.at[4, "canvas_id"]].tolist()
+        assert [r["_row_id"] for r in d["rows"]] == d["row_ids"]
+
+    def test_name_cluster_follows_edits(self, client):
+        name = client.get("/api/clusters?by=name&row_id=0").get_json()["key"]
+        client.post("/api/update", json={"row_id": 5, "field": "canvas_name", "value": name.lower() + ", Inc."})
+        assert 5 in client.get("/api/clusters", query_string={"by": "name", "key": name}).get_json()["row_ids"]
+
+    @pytest.mark.parametrize("query", ["by=nope", "sort=nope"])
+    def test_bad_request(self, client, query):
+        assert client.get(f"/api/clusters?{query}").status_code == 400
@@ -0,0 +1,104 @@
+"""Tests for the shared memory-mapped frame behind serve.py --workers (no server needed)."""
+import mmap
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+
+from shared_frame import FrameReplica, attach_frame, publish_frame, publish_overlay  # noqa: E402
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "name_score": [90.5, 80.0, 70.25, 60.0],
+        "canvas_name": ["BETA CO", "ACME LLC", None, "ACME LLC"],
+        "memo": ["", "", "x", ""],
+    })
+
+
+def _mapped(values) -> bool:
+    base = values
+    while base is not None and not isinstance(base, mmap.mmap):
+        base = getattr(base, "base", None)
+    return base is not None
+
+
+class TestAttach:
+
+    def test_string_columns_stay_mapped(self, frame, tmp_path):
+        publish_frame(frame, str(tmp_path))
+        df, manifest = attach_frame(str(tmp_path))
+        assert manifest["generation"] == 1
+        assert isinstance(df["canvas_name"].dtype, pd.CategoricalDtype)
+        assert _mapped(df["canvas_name"].array.codes)
+        assert _mapped(df["name_score"].to_numpy())
+        assert df["canvas_name"].tolist()[:2] == ["BETA CO", "ACME LLC"]
+        assert pd.isna(df.at[2, "canvas_name"])
+        # Categories are sorted, so sorting the column sorts the strings
+        assert df.sort_values("canvas_name").index.tolist() == [1, 3, 0, 2]
+
+
+class TestReplica:
+
+    def test_overlay_changes_are_incremental(self, frame, tmp_path):
+        directory = str(tmp_path)
+        generation, _epoch = publish_frame(frame, directory)
+        replica = FrameReplica(directory)
+        first, _pending, changes = replica.refresh()
+        assert changes is None
+        assert replica.refresh() is None
+
+        publish_overlay(directory, generation, 1, {}, {1: {"canvas_name": ("ACME LLC", "GAMMA INC")}})
+        df, pending, changes = replica.refresh()
+        assert changes == [(1, "canvas_name", "ACME LLC", "GAMMA INC")]
+        assert pending == {1: {"canvas_name": ("ACME LLC", "GAMMA INC")}}
+        assert df.at[1, "canvas_name"] == "GAMMA INC"
+        assert first.at[1, "canvas_name"] == "ACME LLC"
+        # Only the edited column is copied
+        assert np.shares_memory(df["memo"].array.codes, first["memo"].array.codes)
+
+        # A cell that leaves the overlay goes back to the published value
+        publish_overlay(directory, generation, 2, {0: {"memo": "checked"}}, {})
+        df, _pending, changes = replica.refresh()
+        assert sorted(changes) == [(0, "memo", "", "checked"), (1, "canvas_name", "GAMMA INC", "ACME LLC")]
+        assert df.at[1, "canvas_name"] == "ACME LLC"
+
+    def test_concurrent_refreshes_see_each_update_once(self, frame, tmp_path):
+        directory = str(tmp_path)
+        generation, _epoch = publish_frame(frame, directory)
+        replica = FrameReplica(directory)
+        replica.refresh()
+        publish_overlay(directory, generation, 1, {}, {2: {"memo": ("x", "y")}})
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(replica.refresh())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        updates = [r for r in results if r is not None]
+        assert len(updates) == 1
+        assert updates[0][2] == [(2, "memo", "x", "y")]
+
+    def test_epoch_and_version_follow_the_writer(self, frame, tmp_path):
+        directory = str(tmp_path)
+        generation, epoch = publish_frame(frame, directory, version=7)
+        replica = FrameReplica(directory)
+        replica.refresh()
+        assert (replica.epoch, replica.version) == (epoch, 7)
+
+        publish_overlay(directory, generation, 9, {}, {0: {"memo": ("", "a")}})
+        replica.refresh()
+        assert (replica.epoch, replica.version) == (epoch, 9)
+
+        # A new publication is a new epoch, even if a restarted server reuses the generation
+        _generation, republished = publish_frame(frame, directory, version=9)
+        replica.refresh()
+        assert replica.epoch == republished != epoch
@@ -0,0 +1,8 @@
+"""
+WSGI Entry Point
+For production servers, e.g. `waitress-serve wsgi:app` or `gunicorn wsgi:app`.
+See serve.py for the supported launch modes.
+"""
+from app import create_app
+
+app = application = create_app()